@@ -0,0 +1,193 @@
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Optional, Union
+
+import numpy as np
+
+from .config import JSON_CODEC
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# ---- JSON 백엔드 (orjson 이 있으면 사용, 없으면 표준 json) ----
+class StdlibCodec:
+    name = "json"
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
+class OrjsonCodec:
+    """orjson: UTF-8 그대로 출력(ensure_ascii=False 와 같음), NumPy 스칼라/배열도 직렬화"""
+    name = "orjson"
+    _options = orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    @classmethod
+    def dumps(cls, obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=cls._options).decode("utf-8")  # 송신 큐는 str = 텍스트 프레임
+        except TypeError:
+            return StdlibCodec.dumps(obj)  # 비문자열 키, 64비트 넘는 정수 등
+
+
+def _pick(name: str):
+    if name in ("auto", "orjson") and orjson is not None:
+        return OrjsonCodec
+    if name == "orjson":
+        logger.warning("JSON_CODEC=orjson but orjson is not installed → stdlib json")
+    return StdlibCodec
+
+
+codec = _pick(JSON_CODEC)
+loads = codec.loads
+dumps = codec.dumps
+
+
+# ---- 메시지 스키마 (랜드마크는 파싱하면서 바로 float32 배열로) ----
+@dataclass(frozen=True)
+class Coords:
+    hands: int
+    count: int
+    corr_id: Optional[str] = None
+    room_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class HandLandmarks:
+    frame: np.ndarray              # (21,2) 대표 손
+    corr_id: Optional[str] = None
+    room_id: Optional[str] = None
+    capture_ts: Optional[float] = None  # 클라이언트 촬영 시각 (epoch ms)
+
+
+@dataclass(frozen=True)
+class HandLandmarksSequence:
+    frames: np.ndarray             # (T,21,2) 원본 길이 그대로 (10 프레임 보정은 받는 쪽에서)
+    corr_id: Optional[str] = None
+    room_id: Optional[str] = None
+    capture_ts: Optional[float] = None  # 마지막 프레임 촬영 시각 (epoch ms)
+
+
+@dataclass(frozen=True)
+class Caption:
+    text: str
+    confidence: Optional[float] = None
+    corr_id: Optional[str] = None
+    candidates: Optional[List[dict]] = None
+    trace: Optional[dict] = None   # {"capture_ts", "recv_ts", "infer_start_ts", "infer_end_ts", "send_ts"} epoch ms
+
+    def to_dict(self) -> dict:
+        out = {"type": "caption", "text": self.text}
+        if self.confidence is not None:
+            out["confidence"] = float(self.confidence)
+        if self.candidates is not None:
+            out["candidates"] = self.candidates
+        if self.corr_id is not None:
+            out["corr_id"] = self.corr_id
+        if self.trace is not None:
+            out["trace"] = self.trace
+        return out
+
+    def encode(self) -> str:
+        return dumps(self.to_dict())
+
+
+_EMPTY_HAND = np.zeros((21, 2), dtype=np.float32)
+
+
+def _is_point(p) -> bool:
+    if isinstance(p, dict):
+        return "x" in p and "y" in p
+    if isinstance(p, (list, tuple)) and len(p) >= 2:
+        return isinstance(p[0], (int, float))
+    return False
+
+
+def hand_xy21(hand) -> np.ndarray:
+    """
+    손 하나: 21개의 dict{x,y(,z)} 또는 [x,y(,z)] → (21,2) float32 (모자라면 0 채움, 넘치면 자름)
+    두 형식이 섞여 있으면 ValueError
+    """
+    if not hand:
+        return _EMPTY_HAND.copy()
+    dicts = sum(isinstance(p, dict) for p in hand[:21])
+    if dicts and dicts != len(hand[:21]):
+        raise ValueError("hand points mix {x,y} objects with other values")
+    if dicts:
+        xy = np.array([(p.get("x", 0.0), p.get("y", 0.0)) for p in hand[:21]], dtype=np.float32)
+    else:
+        try:
+            xy = np.asarray(hand[:21], dtype=np.float32)[:, :2]  # [[x,y,z], ...] 는 한 번에 변환
+        except ValueError:  # 점마다 길이가 다름
+            xy = np.array([(p[0], p[1]) for p in hand[:21]], dtype=np.float32)
+    if xy.shape[0] < 21:
+        xy = np.concatenate([xy, np.zeros((21 - xy.shape[0], 2), dtype=np.float32)], axis=0)
+    return xy
+
+
+def primary_hand(hands) -> np.ndarray:
+    """여러 손 → '화면 왼쪽(평균 x 가 가장 작은)' 손 (21,2)"""
+    if not hands:
+        return _EMPTY_HAND.copy()
+    stacked = np.stack([hand_xy21(h) for h in hands], axis=0)
+    return stacked[int(np.argmin(stacked[:, :, 0].mean(axis=1)))]
+
+
+def landmarks_xy21(lm) -> np.ndarray:
+    """hand_landmarks.landmarks: 손 하나([점]*21) 또는 여러 손([[점]*21, ...]) → (21,2)"""
+    if not isinstance(lm, list) or not lm:
+        return _EMPTY_HAND.copy()
+    return hand_xy21(lm) if _is_point(lm[0]) else primary_hand(lm)
+
+
+def sequence_xy21(frames) -> np.ndarray:
+    """hand_landmarks_sequence.frame_sequence: [[점]*21, ...] → (T,21,2)  (비어 있으면 0 프레임 하나)"""
+    if not isinstance(frames, list) or not frames:
+        return _EMPTY_HAND[None].copy()
+    return np.stack([hand_xy21(f) for f in frames], axis=0)
+
+
+def _capture_ts(data: dict) -> Optional[float]:
+    ts = data.get("capture_ts")
+    return float(ts) if isinstance(ts, (int, float)) and not isinstance(ts, bool) else None
+
+
+Message = Union[Coords, HandLandmarks, HandLandmarksSequence]
+
+
+def parse_message(data: dict) -> Optional[Message]:
+    """
+    디코딩된 JSON 객체 → 스키마가 있는 메시지 (그 외 type 은 None → 호출 쪽에서 dict 로 처리)
+    랜드마크 형식이 잘못됐으면 ValueError/TypeError/IndexError
+    """
+    mtype = data.get("type")
+    corr_id, room_id = data.get("corr_id"), data.get("room_id")
+    if mtype == "hand_landmarks":
+        return HandLandmarks(landmarks_xy21(data.get("landmarks")), corr_id, room_id, _capture_ts(data))
+    if mtype == "hand_landmarks_sequence":
+        return HandLandmarksSequence(sequence_xy21(data.get("frame_sequence")), corr_id, room_id, _capture_ts(data))
+    if mtype == "coords":
+        hands = data.get("hands", [])
+        if not isinstance(hands, list):
+            return Coords(0, 0, corr_id, room_id)
+        try:
+            count = sum(len(h) for h in hands)
+        except TypeError:
+            count = 0
+        return Coords(len(hands), count, corr_id, room_id)
+    return None
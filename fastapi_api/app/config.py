@@ -6,4 +6,98 @@ DB_USER = os.getenv("DB_USER", "user")
 DB_PASS = os.getenv("DB_PASS", "password")
 
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
-REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
\ No newline at end of file
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS 등
+        return os.cpu_count() or 1
+
+
+# TFLite Interpreter 풀 (0 이면 코어 수 / num_threads 로 자동)
+INTERPRETER_NUM_THREADS = max(1, int(os.getenv("INTERPRETER_NUM_THREADS", "1")))
+INTERPRETER_POOL_SIZE = (int(os.getenv("INTERPRETER_POOL_SIZE", "0"))
+                         or max(1, _available_cpus() // INTERPRETER_NUM_THREADS))
+
+# TFLite 실행 모드
+TFLITE_XNNPACK = os.getenv("TFLITE_XNNPACK", "1") == "1"       # XNNPACK delegate (CPU 가속) 사용
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "float32")       # float32 | float16 | int8 (tools/quantize_model.py 산출물)
+
+# 추론 백엔드: thread(Interpreter 풀, 기본) | process(워커 프로세스 + 공유 메모리, GIL 우회)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "thread")
+INFER_PROCESS_WORKERS = int(os.getenv("INFER_PROCESS_WORKERS", "0")) or INTERPRETER_POOL_SIZE
+
+# 추론 마이크로배치 스케줄러
+INFER_MAX_BATCH = int(os.getenv("INFER_MAX_BATCH", "16"))          # 배치당 최대 요청 수
+INFER_MAX_WAIT_MS = float(os.getenv("INFER_MAX_WAIT_MS", "5"))     # 첫 요청 이후 최대 대기 (ms)
+INFER_WORKERS = (int(os.getenv("INFER_WORKERS", "0"))  # 동시에 실행할 배치 수
+                 or (INFER_PROCESS_WORKERS if INFERENCE_BACKEND == "process" else INTERPRETER_POOL_SIZE))
+
+# 모델 A/B: candidate 모델을 방 단위로 일부 트래픽에만 적용 (/ai/models 로 교체/승격)
+CANDIDATE_TFLITE_PATH = os.getenv("CANDIDATE_TFLITE_PATH", "")
+CANDIDATE_PERCENT = float(os.getenv("CANDIDATE_PERCENT", "0"))        # candidate 로 보낼 방 비율 (%)
+MODEL_RETIRE_GRACE_S = float(os.getenv("MODEL_RETIRE_GRACE_S", "10"))  # 교체된 모델을 정리하기 전 대기
+MODEL_ADMIN_TOKEN = os.getenv("MODEL_ADMIN_TOKEN", "")                # /ai/models 변경에 X-Admin-Token 으로 필요 (비우면 변경 API 403)
+
+# 시작 시 워밍업: 배치 크기별 합성 입력 추론 횟수 (끝나야 /ai/ready 가 200)
+WARMUP_RUNS = max(0, int(os.getenv("WARMUP_RUNS", "3")))  # 0 이면 워밍업 없이 바로 ready
+WARMUP_BATCH_SIZES = [int(b) for b in os.getenv("WARMUP_BATCH_SIZES", "").split(",") if b.strip()] or [
+    1, 2 * INFER_MAX_BATCH]  # (1,10,55) 단일 + 원본/미러링을 묶은 최대 배치
+
+# hand_landmarks 단일 프레임을 연결별 슬라이딩 윈도우(10프레임)에 쌓아서 추론
+SEQUENCE_WINDOW = os.getenv("SEQUENCE_WINDOW", "1") == "1"  # 0 이면 기존처럼 한 프레임을 10번 타일링
+WINDOW_STRIDE = max(1, int(os.getenv("WINDOW_STRIDE", "1")))  # 몇 프레임마다 추론할지
+
+# 모션 게이트: 손이 없거나 거의 움직이지 않으면 추론 생략 (정지 시 마지막 자막 재사용)
+MOTION_GATE = os.getenv("MOTION_GATE", "1") == "1"
+MOTION_THRESHOLD = float(os.getenv("MOTION_THRESHOLD", "0.004"))      # 관절 평균 이동량 (정규화 좌표)
+MOTION_MIN_PRESENCE = float(os.getenv("MOTION_MIN_PRESENCE", "0.5"))  # 손이 있어야 하는 프레임 비율
+
+# 방별 자막 스무딩: 확률 EMA + 히스테리시스, 안정 라벨이 바뀔 때만 자막 전송
+CAPTION_SMOOTHING = os.getenv("CAPTION_SMOOTHING", "1") == "1"
+SMOOTHING_ALPHA = float(os.getenv("SMOOTHING_ALPHA", "0.3"))     # EMA 가중치 (클수록 최신 결과 반영)
+SMOOTHING_MARGIN = float(os.getenv("SMOOTHING_MARGIN", "0.1"))   # 라벨 전환에 필요한 EMA 차이
+SMOOTHING_HOLD = int(os.getenv("SMOOTHING_HOLD", "3"))           # 전환 전 연속 1위 횟수
+SMOOTHING_RESET_S = float(os.getenv("SMOOTHING_RESET_S", "2"))   # 이 시간 동안 결과가 없으면 상태 초기화
+SMOOTHING_MAX_ROOMS = int(os.getenv("SMOOTHING_MAX_ROOMS", "4096"))
+
+# caption 에 상위 k개 후보 {"text","confidence"} 를 함께 실어 보냄 (0 이면 생략)
+CAPTION_TOPK = max(0, int(os.getenv("CAPTION_TOPK", "0")))
+
+# caption 에 trace(수신/추론 시작·끝/송신 시각) 포함: 메시지에 capture_ts/corr_id 가 있으면 항상,
+# CAPTION_TRACE=1 이면 없어도 포함
+CAPTION_TRACE = os.getenv("CAPTION_TRACE", "0") == "1"
+
+# 추론 결과 캐시: 양자화한 윈도우 → 원본/미러링 확률 (정지한 손모양은 전처리/invoke 생략)
+RESULT_CACHE_SIZE = max(0, int(os.getenv("RESULT_CACHE_SIZE", "1024")))  # 0 이면 끔
+RESULT_CACHE_GRID = float(os.getenv("RESULT_CACHE_GRID", "0.02"))       # 손 크기 대비 양자화 간격
+RESULT_CACHE_TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", "30"))
+
+# WebSocket JSON 코덱: auto(orjson 이 설치돼 있으면 사용) | orjson | json(표준 라이브러리)
+JSON_CODEC = os.getenv("JSON_CODEC", "auto")
+
+# 로깅: 루트 로거 → 큐 → 별도 스레드에서 출력 (큐가 가득 차면 버림)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = max(1, int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+# 수신 원문 DEBUG 로그: LOG_LEVEL=DEBUG 일 때만, 샘플 비율 + 초당 상한 + 최대 글자 수
+LOG_PAYLOAD_SAMPLE = float(os.getenv("LOG_PAYLOAD_SAMPLE", "0.01"))
+LOG_PAYLOAD_PER_S = float(os.getenv("LOG_PAYLOAD_PER_S", "5"))
+LOG_PAYLOAD_CHARS = int(os.getenv("LOG_PAYLOAD_CHARS", "200"))
+# 방별 메시지/프레임 카운터를 모아서 내보내는 주기 (초, 0 이면 종료 시에만)
+LOG_STATS_INTERVAL_S = float(os.getenv("LOG_STATS_INTERVAL_S", "30"))
+
+# 클라이언트별 송신 큐 (느린 클라이언트가 방 전체 자막을 지연시키지 않도록)
+OUTBOUND_QUEUE_SIZE = max(1, int(os.getenv("OUTBOUND_QUEUE_SIZE", "64")))
+OUTBOUND_OVERFLOW = os.getenv("OUTBOUND_OVERFLOW", "drop_oldest")  # drop_oldest | disconnect
+
+# AI 워커 하나가 동시에 맡을 방 수 기본값 (워커가 ?capacity= 또는 worker_status 로 광고하면 그 값)
+AI_WORKER_MAX_ROOMS = max(1, int(os.getenv("AI_WORKER_MAX_ROOMS", "1")))
+
+# 허브 백엔드: memory(프로세스 내, 기본) | redis(방 = pub/sub 채널, 여러 워커/노드 공유)
+HUB_BACKEND = os.getenv("HUB_BACKEND", "memory")
+
+# Redis 커넥션 풀 (lifespan 에서 한 번 만들고 종료 시 닫음)
+REDIS_URL = os.getenv("REDIS_URL", f"redis://{REDIS_HOST}:{REDIS_PORT}/0")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))  # 초, 유휴 연결 PING
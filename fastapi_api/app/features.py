@@ -0,0 +1,32 @@
+import numpy as np
+
+# ---- Vector_Normalization 벡터화 구현 ---------------------------------------
+# 학습 코드(AI_Language modules.utils.Vector_Normalization)와 같은 관절 인덱스.
+# 프레임마다 파이썬 루프를 돌지 않고 (...,21,2) 블록 전체를 한 번에 계산한다.
+_PARENT = np.array([0, 1, 2, 3, 0, 5, 6, 7, 0, 9, 10, 11, 0, 13, 14, 15, 0, 17, 18, 19])
+_CHILD = np.arange(1, 21)
+_ANGLE_A = np.array([0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13, 14, 16, 17, 18])
+_ANGLE_B = np.array([1, 2, 3, 5, 6, 7, 9, 10, 11, 13, 14, 15, 17, 18, 19])
+
+FEATURE_DIM = 2 * len(_CHILD) + len(_ANGLE_A)  # 40 + 15 = 55
+
+
+def frames_to_feats_55(frames: np.ndarray) -> np.ndarray:
+    """
+    (...,21,2) 좌표 → (...,55) 특징 [정규화 뼈 벡터 20x2, 관절 각도 15]
+    예: (N,10,21,2) → (N,10,55)
+    float32 연산 순서를 학습 경로와 맞춰 결과가 동일하게 나오도록 함
+    (손이 없는 0 프레임은 학습 경로와 마찬가지로 NaN이 됨)
+    """
+    joint = np.asarray(frames, dtype=np.float32)[..., :2]
+    if joint.shape[-2] != 21:
+        raise ValueError(f"지원하지 않는 입력 형태: {joint.shape}")
+
+    v = joint[..., _CHILD, :] - joint[..., _PARENT, :]  # (...,20,2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = v / np.linalg.norm(v, axis=-1)[..., np.newaxis]
+        dot = np.einsum("...nt,...nt->...n", v[..., _ANGLE_A, :], v[..., _ANGLE_B, :])
+        angle = np.degrees(np.arccos(dot))  # (...,15)
+
+    vector = v.reshape(*v.shape[:-2], 2 * len(_CHILD))
+    return np.concatenate([vector, angle.astype(np.float32)], axis=-1).astype(np.float32, copy=False)
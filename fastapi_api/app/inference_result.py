@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class InferenceResult:
+    """
+    시퀀스 하나의 추론 결과
+    - probs 는 채택한 쪽(원본/미러링)의 (C,) 확률 벡터를 NumPy 그대로 보관 (스무딩/캐시/앙상블용)
+    - label 은 MIN_CONF 를 적용한 최종 라벨 ("" = 표시 안 함)
+    """
+    probs: Optional[np.ndarray]
+    index: int
+    score: float
+    label: str
+    mirrored: bool = False
+    variant: str = "stable"  # 추론한 모델 슬롯 (stable | candidate)
+    label_of: Callable[[int], str] = field(default=str, repr=False, compare=False)
+    # 이 결과를 낸 배치 추론의 시작/끝 (epoch 초, 스케줄러가 기록 — 0 이면 모름)
+    infer_start: float = field(default=0.0, compare=False)
+    infer_end: float = field(default=0.0, compare=False)
+
+    @classmethod
+    def failed(cls) -> "InferenceResult":
+        """추론 실패 (기존 ("", 0.0) 과 같은 의미)"""
+        return cls(probs=None, index=-1, score=0.0, label="")
+
+    def topk(self, k: int) -> List[Tuple[int, float]]:
+        """확률 상위 k개 [(class index, score), ...] (argpartition 으로 O(C) 선택 후 k개만 정렬)"""
+        if self.probs is None or k <= 0:
+            return []
+        k = min(int(k), self.probs.shape[-1])
+        part = np.argpartition(self.probs, -k)[-k:]
+        part = part[np.argsort(self.probs[part])[::-1]]
+        return [(int(i), float(self.probs[i])) for i in part]
+
+    def top_labels(self, k: int) -> List[Tuple[str, float]]:
+        """상위 k개 [(label, score), ...] (임계값과 무관하게 모델 라벨 그대로)"""
+        return [(self.label_of(i), s) for i, s in self.topk(k)]
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any, Callable, Deque, List, Optional, Sequence, Set, Tuple
+
+from .config import INFER_MAX_BATCH, INFER_MAX_WAIT_MS, INFER_WORKERS
+from .inference_result import InferenceResult
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceScheduler:
+    """
+    모든 방의 추론 요청을 모아 마이크로배치로 실행하는 스케줄러
+
+    - submit() 은 요청을 큐에 넣고 결과 future 를 기다림 (이벤트 루프를 막지 않음)
+    - 첫 요청 이후 max_wait_ms 또는 max_batch 개가 모이면 배치 하나로 묶어
+      워커 스레드에서 predict_batch(frames_list) 를 실행하고 요청별 future 를 채움
+    - 결과는 InferenceResult (확률 벡터 포함 — 방별 스무딩 단계에서 사용)
+    - 한 배치에는 같은 모델(variant) 요청만 묶음 → predict_batch(frames_list, variant)
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[Any], Optional[str]], Sequence[InferenceResult]],
+        *,
+        max_batch: int = INFER_MAX_BATCH,
+        max_wait_ms: float = INFER_MAX_WAIT_MS,
+        workers: int = INFER_WORKERS,
+    ) -> None:
+        self._predict_batch = predict_batch
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.workers = max(1, int(workers))
+
+        self._pending: Deque[Tuple[Any, Optional[str], asyncio.Future]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="infer")
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="inference-scheduler")
+        logger.info("inference scheduler started: max_batch=%d max_wait=%.1fms workers=%d",
+                    self.max_batch, self.max_wait * 1000, self.workers)
+
+    async def submit(self, frames: Any, *, variant: Optional[str] = None) -> InferenceResult:
+        """
+        (10,21,2) 시퀀스(또는 (21,2) 단일 프레임) 하나를 제출하고 InferenceResult 를 기다림
+        variant: 추론할 모델 슬롯 (None = stable)
+        """
+        self._ensure_started()
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((frames, variant, fut))
+        self._wakeup.set()
+        return await fut
+
+    async def _collect(self) -> Tuple[Optional[str], List[Tuple[Any, asyncio.Future]]]:
+        """
+        첫 요청이 들어온 뒤 max_wait 동안(또는 max_batch 개까지) 모아서 반환
+        첫 요청과 같은 variant 만 꺼내고 나머지는 순서대로 남겨 둠 → (variant, batch)
+        """
+        while not self._pending:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(self._pending) < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+
+        batch, rest, variant = [], deque(), None
+        while self._pending:
+            frames, var, fut = self._pending.popleft()
+            if fut.done():  # 연결 종료 등으로 취소된 요청은 제외
+                continue
+            if not batch:
+                variant = var
+            if var == variant and len(batch) < self.max_batch:
+                batch.append((frames, fut))
+            else:
+                rest.append((frames, var, fut))
+        self._pending = rest
+        return variant, batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            try:
+                variant, batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.get_running_loop().create_task(self._dispatch(variant, batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, variant: Optional[str], batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, self._run_batch, [frames for frames, _ in batch], variant
+            )
+        except Exception as e:
+            logger.exception("batch inference failed (n=%d)", len(batch))
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        else:
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+        finally:
+            self._slots.release()
+
+    def _run_batch(self, frames_list: List[Any], variant: Optional[str]) -> List[InferenceResult]:
+        """워커 스레드: 배치 추론 + 실제 시작/끝 시각을 결과에 기록 (자막 trace 용)"""
+        start = time.time()
+        results = self._predict_batch(frames_list, variant)
+        end = time.time()
+        return [replace(r, infer_start=start, infer_end=end) if isinstance(r, InferenceResult) else r
+                for r in results]
+
+    async def close(self) -> None:
+        """배치 루프/워커 스레드 정리 (아직 배치에 안 들어간 요청은 취소, 실행 중인 배치는 결과를 채울 때까지 대기)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            _, _, fut = self._pending.popleft()
+            if not fut.done():
+                fut.cancel()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _predict_batch(frames_list, variant=None):
+    from . import main  # main 이 websocketServer 를 import 하므로 지연 import
+    return main.predict_batch_results(frames_list, variant)
+
+
+scheduler = InferenceScheduler(_predict_batch)
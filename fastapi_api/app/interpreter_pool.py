@@ -0,0 +1,220 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from prometheus_client import Counter, Gauge, Histogram
+
+from .config import INTERPRETER_NUM_THREADS, INTERPRETER_POOL_SIZE, TFLITE_XNNPACK
+
+# ---- TFLite Interpreter -------------------------------------------------
+try:
+    from tflite_runtime.interpreter import Interpreter, OpResolverType
+    RUNTIME = "tflite_runtime"
+except ImportError:
+    from tensorflow.lite.python.interpreter import Interpreter, OpResolverType  # fallback
+    RUNTIME = "tensorflow.lite"
+
+logger = logging.getLogger(__name__)
+
+# Prometheus 지표 (풀 포화도, pool = 모델 슬롯 stable | candidate, process 백엔드의 특징 입력용은 <슬롯>_fallback)
+# 같은 이름의 풀이 잠시 겹칠 수 있으므로(교체 후 MODEL_RETIRE_GRACE_S 동안) set 대신 inc/dec 로 합산
+pool_size = Gauge("ai_interpreter_pool_size", "Number of TFLite interpreters in the pool", ["pool"])
+pool_in_use = Gauge("ai_interpreter_pool_in_use", "Number of TFLite interpreters currently checked out", ["pool"])
+pool_wait = Histogram(
+    "ai_interpreter_pool_wait_seconds",
+    "Time spent waiting to check out a TFLite interpreter (seconds)",
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1],
+)
+pool_exhausted = Counter(
+    "ai_interpreter_pool_exhausted_total",
+    "Checkouts that found no idle interpreter and had to wait",
+)
+
+
+def _op_resolver(xnnpack: bool):
+    """XNNPACK 은 기본 delegate 로 붙음 → 끌 때는 기본 delegate 없는 resolver 사용"""
+    return OpResolverType.AUTO if xnnpack else OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+
+
+class PooledInterpreter:
+    """Interpreter 하나 + 현재 배치 크기 상태 (한 번에 한 스레드만 사용)"""
+
+    def __init__(self, model_content: bytes, num_threads: int, *, xnnpack: bool = TFLITE_XNNPACK) -> None:
+        self.interpreter = Interpreter(model_content=model_content, num_threads=num_threads,
+                                       experimental_op_resolver_type=_op_resolver(xnnpack))
+        self.interpreter.allocate_tensors()
+        self.in_det = self.interpreter.get_input_details()
+        self.out_det = self.interpreter.get_output_details()
+        self.batch_size = int(self.in_det[0]["shape"][0])
+        self.batch_supported = True  # 배치 resize 불가 모델이면 False → 행 단위 추론
+
+    def _ensure_batch(self, n: int) -> None:
+        """입력 배치 크기를 n으로 맞춤 (크기가 바뀔 때만 resize + allocate)"""
+        if n == self.batch_size:
+            return
+        shape = [int(s) for s in self.in_det[0]["shape"]]
+        shape[0] = n
+        self.interpreter.resize_tensor_input(self.in_det[0]["index"], shape)
+        self.interpreter.allocate_tensors()
+        self.in_det = self.interpreter.get_input_details()
+        self.out_det = self.interpreter.get_output_details()
+        self.batch_size = n
+
+    def _set_input(self, x: np.ndarray) -> None:
+        det = self.in_det[0]
+        if np.issubdtype(det["dtype"], np.integer):  # 정수 입력 양자화 모델: scale/zero_point 로 양자화
+            scale, zero = det["quantization"]
+            info = np.iinfo(det["dtype"])
+            x = np.clip(np.round(x / scale) + zero, info.min, info.max)
+        self.interpreter.set_tensor(det["index"], x.astype(det["dtype"], copy=False))
+
+    def _get_output(self) -> np.ndarray:
+        det = self.out_det[0]
+        y = self.interpreter.get_tensor(det["index"])  # get_tensor는 복사본 반환
+        if np.issubdtype(det["dtype"], np.integer):
+            scale, zero = det["quantization"]
+            y = (y.astype(np.float32) - zero) * scale
+        return y
+
+    def infer_batch(self, x_Nx10x55: np.ndarray) -> np.ndarray:
+        """
+        (N,10,55) 입력을 한 번의 invoke로 추론 → (N,num_classes) 확률
+        배치 resize를 지원하지 않는 모델이면 행 단위로 나눠서 추론
+        """
+        n = int(x_Nx10x55.shape[0])
+        if self.batch_supported:
+            try:
+                self._ensure_batch(n)
+            except Exception:
+                logger.warning("batch resize not supported (n=%d) → per-row inference", n, exc_info=True)
+                self.batch_supported = False
+        if not self.batch_supported:
+            self._ensure_batch(1)
+            rows = []
+            for i in range(n):
+                self._set_input(x_Nx10x55[i:i + 1])
+                self.interpreter.invoke()
+                rows.append(self._get_output()[0])
+            return np.stack(rows, axis=0)
+
+        self._set_input(x_Nx10x55)
+        self.interpreter.invoke()
+        return self._get_output()
+
+
+class InterpreterPool:
+    """
+    모델 파일을 한 번만 읽고 Interpreter 를 size 개 만들어 두는 풀
+    워커 스레드는 acquire() 로 하나를 빌려 쓰고 반납 (Interpreter 는 스레드 안전하지 않음)
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        *,
+        size: int = INTERPRETER_POOL_SIZE,
+        num_threads: int = INTERPRETER_NUM_THREADS,
+        xnnpack: bool = TFLITE_XNNPACK,
+        name: str = "stable",
+    ) -> None:
+        self.model_path = model_path
+        self.name = name
+        self.size = max(1, int(size))
+        self.num_threads = max(1, int(num_threads))
+        self.xnnpack = bool(xnnpack)
+
+        with open(model_path, "rb") as f:
+            model_content = f.read()
+        self._all: List[PooledInterpreter] = [
+            PooledInterpreter(model_content, self.num_threads, xnnpack=self.xnnpack) for _ in range(self.size)
+        ]
+        self._idle: "queue.LifoQueue[PooledInterpreter]" = queue.LifoQueue()  # 최근에 쓴(캐시가 따뜻한) 것부터
+        for item in self._all:
+            self._idle.put(item)
+
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self.closed = False
+        pool_size.labels(self.name).inc(self.size)
+
+    @property
+    def input_details(self):
+        return self._all[0].in_det
+
+    @property
+    def output_details(self):
+        return self._all[0].out_det
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[PooledInterpreter]:
+        """idle Interpreter 하나를 빌림 (없으면 반납될 때까지 대기, timeout 초과 시 queue.Empty)"""
+        t0 = time.perf_counter()
+        try:
+            item = self._idle.get_nowait()
+        except queue.Empty:
+            pool_exhausted.inc()
+            item = self._idle.get(timeout=timeout)
+        pool_wait.observe(time.perf_counter() - t0)
+        with self._lock:
+            self._in_use += 1
+            pool_in_use.labels(self.name).inc()
+        try:
+            yield item
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                pool_in_use.labels(self.name).dec()
+            self._idle.put(item)
+
+    def rename(self, name: str) -> None:
+        """지표의 pool 라벨 변경 (candidate 승격 등으로 모델 슬롯이 바뀔 때)"""
+        with self._lock:
+            if name == self.name or self.closed:
+                return
+            pool_size.labels(self.name).dec(self.size)
+            pool_in_use.labels(self.name).dec(self._in_use)
+            self.name = name
+            pool_size.labels(name).inc(self.size)
+            pool_in_use.labels(name).inc(self._in_use)
+
+    def close(self) -> None:
+        """지표에서 이 풀의 몫을 뺌 (Interpreter 는 GC 로 정리)"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            pool_size.labels(self.name).dec(self.size)
+
+    def infer_batch(self, x_Nx10x55: np.ndarray) -> np.ndarray:
+        with self.acquire() as item:
+            return item.infer_batch(x_Nx10x55)
+
+    def warm_up(self, batch_sizes: Sequence[int], runs: int) -> List[Dict[str, float]]:
+        """
+        모든 Interpreter 를 빌려서 배치 크기별로 runs 번씩 합성 입력 추론 (첫 invoke 의 지연 초기화 비용을 미리 지불)
+        → [{"batch", "runs", "first_ms", "mean_ms"}, ...]
+        """
+        shape = [int(s) for s in self.input_details[0]["shape"]][1:]
+        rng = np.random.default_rng(0)
+        timings = []
+        with ExitStack() as stack:
+            items = [stack.enter_context(self.acquire()) for _ in range(self.size)]
+            for n in batch_sizes:
+                x = rng.standard_normal((int(n), *shape)).astype(np.float32)
+                times = []
+                for _ in range(max(1, int(runs))):
+                    t0 = time.perf_counter()
+                    for item in items:
+                        item.infer_batch(x)
+                    times.append((time.perf_counter() - t0) * 1000 / len(items))
+                timings.append({"batch": int(n), "runs": len(times),
+                                "first_ms": round(times[0], 3), "mean_ms": round(sum(times) / len(times), 3)})
+        return timings
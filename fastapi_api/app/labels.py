@@ -0,0 +1,46 @@
+import json
+import logging
+import os
+from typing import Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+# 자모 모델 라벨 (num_classes == len(ACTIONS) 이면 자모 모델)
+ACTIONS = [
+    'ㄱ','ㄴ','ㄷ','ㄹ','ㅁ','ㅂ','ㅅ','ㅇ','ㅈ','ㅊ','ㅋ','ㅌ','ㅍ','ㅎ',
+    'ㅏ','ㅑ','ㅓ','ㅕ','ㅗ','ㅛ','ㅜ','ㅠ','ㅡ','ㅣ',
+    'ㅐ','ㅒ','ㅔ','ㅖ','ㅢ','ㅚ','ㅟ'
+]
+
+# 문장 모델 라벨
+SENTENCE_MAP = {
+    0: "안녕하세요",
+    1: "감사합니다",
+    2: "죄송합니다",
+    3: "좋아요",
+    4: "싫어요",
+}
+
+LabelMap = Union[List[str], Dict[int, str]]
+
+
+def load_labels(model_path: str, num_classes: int) -> LabelMap:
+    """
+    모델별 라벨 맵
+    - 모델 옆에 <이름>.labels.json (문자열 리스트) 이 있으면 그것을 사용
+    - 없으면 num_classes 로 자모(ACTIONS) / 문장(SENTENCE_MAP) 모델을 판단
+    """
+    path = os.path.splitext(model_path)[0] + ".labels.json"
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            labels = json.load(f)
+        if len(labels) != num_classes:
+            logger.warning("label file %s has %d labels, model has %d classes", path, len(labels), num_classes)
+        return [str(x) for x in labels]
+    return ACTIONS if num_classes == len(ACTIONS) else SENTENCE_MAP
+
+
+def label_of(labels: LabelMap, idx: int) -> str:
+    if isinstance(labels, list):
+        return labels[idx] if 0 <= idx < len(labels) else ""
+    return labels.get(idx, f"수어_{idx}")
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import queue
+import random
+import threading
+import time
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from prometheus_client import Counter
+
+from .config import (
+    LOG_LEVEL,
+    LOG_PAYLOAD_CHARS,
+    LOG_PAYLOAD_PER_S,
+    LOG_PAYLOAD_SAMPLE,
+    LOG_QUEUE_SIZE,
+    LOG_STATS_INTERVAL_S,
+)
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
+stats_logger = logging.getLogger("app.stats")
+
+# Prometheus 지표
+log_dropped = Counter("ai_log_dropped_total", "Log records dropped because the log queue was full")
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+# ---- 논블로킹 로깅 파이프라인 (QueueHandler → 별도 스레드의 QueueListener) ----
+class _DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버림 (이벤트 루프가 로그 I/O 를 기다리지 않도록)"""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_dropped.inc()
+
+
+def setup_logging(level: str = LOG_LEVEL) -> None:
+    """
+    루트 로거 → 큐 → 리스너 스레드의 StreamHandler (여러 번 불러도 한 번만 설정)
+    포맷/레벨은 기존 basicConfig 와 같음 (LOG_LEVEL 로 조정)
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    q: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = QueueListener(q, stream, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    _queue_handler = _DroppingQueueHandler(q)
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+
+
+def shutdown_logging() -> None:
+    """남은 로그를 모두 내보내고 리스너 스레드 종료 (이후 로그는 StreamHandler 로 바로 출력)"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _listener.stop()
+    for h in _listener.handlers:
+        root.addHandler(h)
+    _listener = _queue_handler = None
+
+
+# ---- 페이로드 디버그 로그 (샘플링 + 초당 상한) ----
+class PayloadSampler:
+    """
+    수신 원문을 DEBUG 로 남길지 결정
+    - DEBUG 가 꺼져 있으면 바로 반환 (문자열 자르기/포맷 비용 없음)
+    - sample 비율로 뽑고, 그중에서도 초당 per_s 개까지만 (토큰 버킷)
+    """
+
+    def __init__(self, *, sample: float = LOG_PAYLOAD_SAMPLE, per_s: float = LOG_PAYLOAD_PER_S,
+                 chars: int = LOG_PAYLOAD_CHARS) -> None:
+        self.sample = min(1.0, max(0.0, float(sample)))
+        self.per_s = max(0.0, float(per_s))
+        self.chars = max(0, int(chars))
+        self._tokens = self.per_s
+        self._last = time.monotonic()
+        self.suppressed = 0  # 상한 때문에 버린 수 (다음 로그에 함께 표시)
+
+    def _take(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.per_s, self._tokens + (now - self._last) * self.per_s)
+        self._last = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        self.suppressed += 1
+        return False
+
+    def log(self, log: logging.Logger, role: str, room: str, payload) -> bool:
+        if not log.isEnabledFor(logging.DEBUG) or self.sample <= 0.0:
+            return False
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return False
+        if not self._take():
+            return False
+        suppressed, self.suppressed = self.suppressed, 0
+        log.debug("payload role=%s room=%s (+%d suppressed): %r",
+                  role, room or "-", suppressed, payload[:self.chars])
+        return True
+
+
+# ---- 방별 카운터 (메시지마다 로그 대신 주기적으로 한 줄씩) ----
+class RoomStats:
+    """
+    방별 메시지/프레임 수를 모아 두었다가 LOG_STATS_INTERVAL_S 마다 방당 한 줄로 INFO 로그
+    이벤트 루프와 추론 스레드에서 함께 쓰므로 lock 으로 보호
+    """
+
+    def __init__(self, *, interval_s: float = LOG_STATS_INTERVAL_S) -> None:
+        self.interval_s = float(interval_s)
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def count(self, room: Optional[str], kind: str, n: int = 1) -> None:
+        """room/kind 는 클라이언트가 보낸 값일 수 있으므로 문자열로 바꿔서 키로 사용 (리스트 등도 안전)"""
+        with self._lock:
+            self._counts[str(room or "-")][str(kind)] += n
+
+    def flush(self) -> Dict[str, Dict[str, int]]:
+        """지금까지 모인 카운터를 로그로 내보내고 비움 → 내보낸 값 반환"""
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(lambda: defaultdict(int))
+        for room, kinds in counts.items():
+            stats_logger.info("room=%s %s", room, " ".join(f"{k}={v}" for k, v in sorted(kinds.items())))
+        return {room: dict(kinds) for room, kinds in counts.items()}
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            self.flush()
+
+    def start(self) -> None:
+        if self.interval_s > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="room-stats")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+
+payload_sampler = PayloadSampler()
+room_stats = RoomStats()
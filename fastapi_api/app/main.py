@@ -1,12 +1,21 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pydantic import BaseModel
 from .websocketServer import router  # @router.websocket("/ai")
-import logging, os, sys, numpy as np
-
-# ---- TFLite Interpreter -------------------------------------------------
-try:
-    from tflite_runtime.interpreter import Interpreter
-except ImportError:
-    from tensorflow.lite.python.interpreter import Interpreter  # fallback
+from .features import frames_to_feats_55
+from .inference_scheduler import scheduler
+from .state import hub
+from .redis_pool import open_pool as open_redis_pool, close_pool as close_redis_pool
+from .inference_result import InferenceResult
+from .result_cache import window_keys
+from .model_registry import CANDIDATE, STABLE, ModelVariant, model_confidence, model_latency, registry
+from .config import CANDIDATE_TFLITE_PATH, MODEL_ADMIN_TOKEN
+from .logging_setup import room_stats, setup_logging, shutdown_logging
+from .stage_metrics import batch_stage
+import asyncio, hmac, logging, os, sys, numpy as np
 
 # ---- AI_Language 경로 추가 (Vector_Normalization 사용) -------------------
 AI_LANGUAGE_DIR = os.getenv("AI_LANGUAGE_DIR", "/fastapp/AI_Language")
@@ -34,60 +43,107 @@ except Exception as e1:
         HAVE_VECTOR = False
 # ------------------------------------------------------------------------
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(name)s - %(message)s"
-)
+setup_logging()  # 로그 출력은 별도 스레드 (QueueHandler → QueueListener)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    시작: 모델 로딩 → Redis 커넥션 풀 → 허브 → 방별 카운터 → (백그라운드) 워밍업 / 종료: 역순 정리
+    워밍업이 끝나기 전까지 /ai/ready 는 503 (/ai/health 는 프로세스 생존 확인용으로 그대로)
+    """
+    setup_logging()  # 이전 lifespan 종료 때 내렸으면 다시 큐로
+    load_model()
+    await open_redis_pool()
+    await hub.start()
+    room_stats.start()
+    warmup = asyncio.get_running_loop().create_task(asyncio.to_thread(warm_up)) if _load_error is None else None
+    try:
+        yield
+    finally:
+        if warmup is not None:
+            await warmup  # 워밍업 중인 Interpreter/워커를 닫지 않도록
+        await scheduler.close()
+        await hub.close()
+        await close_redis_pool()
+        registry.close()
+        await room_stats.close()
+        shutdown_logging()
+
+
+app = FastAPI(lifespan=lifespan)
 
 MODEL_PATH = os.getenv(
     "TFLITE_PATH",
     "/fastapp/AI_Language/models/multi_hand_gesture_classifier.tflite"
 )
+# /ai/models 로 로딩할 수 있는 모델 파일의 위치 (이 디렉터리 밖의 경로는 거부)
+MODEL_DIR = os.path.realpath(os.getenv("MODEL_DIR") or os.path.dirname(MODEL_PATH))
+
+# 로딩된 모델(Interpreter 풀/프로세스 백엔드 + 라벨 맵)은 registry 의 stable/candidate 슬롯에 있음
 
-_interpreter = None
-_in_det = None
-_out_det = None
-
-# ---- 라벨/임계값 ---------------------------------------------------------
-ACTIONS = [
-    'ㄱ','ㄴ','ㄷ','ㄹ','ㅁ','ㅂ','ㅅ','ㅇ','ㅈ','ㅊ','ㅋ','ㅌ','ㅍ','ㅎ',
-    'ㅏ','ㅑ','ㅓ','ㅕ','ㅗ','ㅛ','ㅜ','ㅠ','ㅡ','ㅣ',
-    'ㅐ','ㅒ','ㅔ','ㅖ','ㅢ','ㅚ','ㅟ'
-]
-USE_JAMO = False  # num_classes == len(ACTIONS) 이면 자모 모델
+# ---- 준비 상태 (/ai/ready) -----------------------------------------------
+_ready = False          # 모델 로딩 + 워밍업 완료
+_load_error = None      # 로딩/워밍업 실패 사유
+_warmup_report = None   # {"total_ms": float, "steps": [{"batch", "runs", "first_ms", "mean_ms"}, ...]}
+
+# ---- 라벨/임계값 (라벨 맵은 모델별: labels.py) ------------------------------
 MIN_CONF = float(os.getenv("MIN_CONFIDENCE", "0.8"))
 
 # (추가) 낮은 점수여도 강제로 자막을 보이게 하는 디버깅 스위치
 ALWAYS_EMIT = os.getenv("ALWAYS_EMIT_CAPTION", "") == "1"
+
+# 특징 추출 구현: native(벡터화 NumPy, 기본) | vector(학습 코드 Vector_Normalization 루프)
+FEATURE_IMPL = os.getenv("FEATURE_IMPL", "native")
 # ------------------------------------------------------------------------
 
 
-@app.on_event("startup")
+def _log_variant(v: ModelVariant) -> None:
+    logger.info("TFLite loaded [%s]: in=%s out=%s path=%s precision=%s xnnpack=%s",
+                v.name, v.in_shape, v.out_shape, v.path, v.precision, v.xnnpack)
+    if v.backend is not None:
+        logger.info("process backend: workers=%d num_threads=%d", v.backend.size, v.backend.num_threads)
+    else:
+        logger.info("interpreter pool: size=%d num_threads=%d", v.pool.size, v.pool.num_threads)
+    logger.info("feature_dim=%s num_classes=%s", v.feature_dim, v.num_classes)
+    logger.info("MODEL TYPE = %s", "JAMO" if v.use_jamo else "SENTENCE")
+
+
 def load_model():
-    """TFLite 로딩 및 모델 타입 자동판단"""
-    global _interpreter, _in_det, _out_det, USE_JAMO
+    """TFLite 로딩 및 모델 타입 자동판단 (stable + CANDIDATE_TFLITE_PATH 가 있으면 candidate)"""
+    global _load_error
     try:
-        _interpreter = Interpreter(model_path=MODEL_PATH)
-        _interpreter.allocate_tensors()
-        _in_det = _interpreter.get_input_details()
-        _out_det = _interpreter.get_output_details()
-
-        in_shape  = tuple(int(s) for s in _in_det[0]['shape'])
-        out_shape = tuple(int(s) for s in _out_det[0]['shape'])
-        feature_dim = int(in_shape[-1]) if len(in_shape) >= 3 else None
-        num_classes = int(out_shape[-1]) if len(out_shape) >= 1 else None
-        USE_JAMO = (num_classes == len(ACTIONS))
-
-        logger.info("TFLite loaded: in=%s out=%s path=%s", in_shape, out_shape, MODEL_PATH)
-        logger.info("feature_dim=%s num_classes=%s", feature_dim, num_classes)
-        logger.info("MODEL TYPE = %s", "JAMO" if USE_JAMO else "SENTENCE")
+        registry.install(registry.load(MODEL_PATH, STABLE, warm=False), STABLE)
+        _log_variant(registry.stable)
+        if CANDIDATE_TFLITE_PATH:
+            registry.install(registry.load(CANDIDATE_TFLITE_PATH, CANDIDATE, warm=False), CANDIDATE)
+            _log_variant(registry.candidate)
+            logger.info("candidate rooms = %.1f%%", registry.candidate_percent)
         logger.info("Vector_Normalization available = %s (from %s)", HAVE_VECTOR, AI_LANGUAGE_DIR)
+        logger.info("FEATURE_IMPL = %s", FEATURE_IMPL)
         logger.info("ALWAYS_EMIT_CAPTION = %s", ALWAYS_EMIT)
-    except Exception:
+    except Exception as e:
         logger.exception("Failed to load TFLite model")
+        _load_error = f"model load failed: {e!r}"  # /ai/ready 에서 503 + 사유로 노출
+
+
+def warm_up():
+    """
+    배치 크기별(WARMUP_BATCH_SIZES) 합성 입력으로 WARMUP_RUNS 번씩 추론해
+    첫 invoke 의 지연 초기화(텐서 할당/커널 준비) 비용을 트래픽 전에 지불
+    """
+    global _ready, _load_error, _warmup_report
+    try:
+        for v in (registry.stable, registry.candidate):
+            if v is not None:
+                v.warm_up()
+    except Exception as e:
+        logger.exception("model warm-up failed")
+        _load_error = f"warm-up failed: {e!r}"
+        return
+    _warmup_report = registry.stable.warmup_report
+    _ready = True
+    logger.info("model warm-up done: %s", _warmup_report)
 
 
 # -------------------------- 전처리 유틸 -----------------------------------
@@ -113,6 +169,31 @@ def _fallback_preprocess_to_55(frames_10x21x2: np.ndarray) -> np.ndarray:
     return feats[None, :, :]                      # (1,10,55)
 
 
+def _feats_55(frames_Nx10x21x2: np.ndarray) -> np.ndarray:
+    """(N,10,21,2) -> (N,10,55)  FEATURE_IMPL 에 따라 벡터화/학습 루프 경로 선택"""
+    if FEATURE_IMPL != "vector":
+        return frames_to_feats_55(frames_Nx10x21x2)
+    if HAVE_VECTOR:
+        return np.concatenate([_frames_to_feats_55(f) for f in frames_Nx10x21x2], axis=0)
+    logging.warning("Using FALLBACK preprocessing (accuracy may degrade)")
+    return np.concatenate([_fallback_preprocess_to_55(f) for f in frames_Nx10x21x2], axis=0)
+
+
+def _as_frames_10x21x2(arr: np.ndarray):
+    """좌표 입력이면 (10,21,2)로 정리, 이미 특징(…,55)이면 None"""
+    arr = np.asarray(arr, dtype=np.float32)
+    if arr.ndim == 3 and arr.shape[0] == 1:
+        arr = arr[0]
+
+    if arr.shape == (21, 2):
+        return np.tile(arr[None, :, :], (10, 1, 1))  # (10,21,2)
+    if arr.shape == (10, 21, 2):
+        return arr
+    if arr.shape == (10, 42):
+        return arr.reshape(10, 21, 2)
+    return None
+
+
 def _coerce_to_1x10x55(arr: np.ndarray) -> np.ndarray:
     """
     허용 케이스:
@@ -121,25 +202,11 @@ def _coerce_to_1x10x55(arr: np.ndarray) -> np.ndarray:
       - (10,42)/(1,10,42) : 좌표로 간주, reshape 후 전처리
       - (10,55)/(1,10,55) : 이미 특징이면 그대로
     """
-    arr = np.asarray(arr, dtype=np.float32)
-    if arr.ndim == 3 and arr.shape[0] == 1:
-        arr = arr[0]
-
-    if arr.shape == (21, 2):
-        arr = np.tile(arr[None, :, :], (10, 1, 1))  # (10,21,2)
-
-    if arr.shape == (10, 21, 2):
-        if HAVE_VECTOR:
-            return _frames_to_feats_55(arr)
-        else:
-            logging.warning("Using FALLBACK preprocessing (accuracy may degrade)")
-            return _fallback_preprocess_to_55(arr)
-
-    if arr.shape == (10, 42):
-        return _coerce_to_1x10x55(arr.reshape(10, 21, 2))
-    if arr.shape == (1, 10, 42):
-        return _coerce_to_1x10x55(arr.reshape(10, 21, 2))
+    frames = _as_frames_10x21x2(arr)
+    if frames is not None:
+        return _feats_55(frames[None, :, :, :])
 
+    arr = np.asarray(arr, dtype=np.float32)
     if arr.shape == (10, 55):
         return arr[None, :, :]
     if arr.shape == (1, 10, 55):
@@ -148,32 +215,42 @@ def _coerce_to_1x10x55(arr: np.ndarray) -> np.ndarray:
     raise ValueError(f"지원하지 않는 입력 형태: {arr.shape}")
 
 
-# -------------------------- 공통 라벨링 -----------------------------------
-_SENTENCE_MAP = {
-    0: "안녕하세요",
-    1: "감사합니다",
-    2: "죄송합니다",
-    3: "좋아요",
-    4: "싫어요",
-}
+def _coerce_pairs(frames_list) -> np.ndarray:
+    """
+    N개 시퀀스 → (2N,10,55)  [원본0, 미러링0, 원본1, 미러링1, ...]
+    좌표 입력이면 (2N,10,21,2) 블록으로 쌓아 특징 추출을 한 번에 수행
+    """
+    frames = [_as_frames_10x21x2(f) for f in frames_list]
+    if all(f is not None for f in frames):
+        block = np.stack(frames, axis=0)                             # (N,10,21,2)
+        pairs = np.stack([block, _mirror_frames(block)], axis=1)     # (N,2,10,21,2)
+        return _feats_55(pairs.reshape(-1, 10, 21, 2))
+    # 이미 특징 입력이 섞여 있으면 기존 방식대로 각각 변환
+    return np.concatenate(
+        [x for f in frames_list for x in (_coerce_to_1x10x55(f), _coerce_to_1x10x55(_mirror_frames(f)))],
+        axis=0,
+    )
+
 
+# -------------------------- 공통 라벨링 -----------------------------------
 def _label_from_idx(idx: int) -> str:
-    if USE_JAMO:
-        return ACTIONS[idx] if 0 <= idx < len(ACTIONS) else ""
-    return _SENTENCE_MAP.get(idx, f"수어_{idx}")
+    """stable 모델의 라벨 맵 기준"""
+    return registry.stable.label_of(idx)
 
 
 # -------------------------- 추론 공통/보조 --------------------------------
-def infer_any(x_1x10x55: np.ndarray):
-    """(1,10,55) 입력으로 직접 추론"""
-    x = x_1x10x55.astype(_in_det[0]["dtype"], copy=False)
-    _interpreter.set_tensor(_in_det[0]["index"], x)
-    _interpreter.invoke()
-    y = _interpreter.get_tensor(_out_det[0]["index"])
-    probs = y[0].tolist()
-    idx = int(np.argmax(y[0]))
-    score = float(max(probs))
-    return idx, score
+def infer_any(x_1x10x55: np.ndarray) -> InferenceResult:
+    """(1,10,55) 입력으로 직접 추론 → InferenceResult (확률 벡터는 NumPy 그대로)"""
+    variant = registry.stable
+    probs = infer_batch(x_1x10x55, variant)[0]
+    idx = int(np.argmax(probs))
+    return _result(variant, probs, idx, float(probs[idx]))
+
+
+def infer_batch(x_Nx10x55: np.ndarray, variant: Optional[ModelVariant] = None) -> np.ndarray:
+    """(N,10,55) 입력을 풀에서 빌린 Interpreter 로 한 번에 추론 → (N,num_classes) 확률"""
+    return (variant or registry.stable).infer_batch(x_Nx10x55)
+
 
 def _mirror_frames(frames_10x21x2: np.ndarray) -> np.ndarray:
     """x 좌표 미러링(좌/우 손 보정)"""
@@ -197,59 +274,235 @@ def predict_from_single_frame(points_21x2):
         return "", 0.0
 
 
+def _finalize(idx: int, score: float, label_of=None):
+    """MIN_CONF 적용 (ALWAYS_EMIT_CAPTION=1 이면 임계값 미만이라도 레이블 표시)"""
+    label = (label_of or _label_from_idx)(idx)
+    if score < MIN_CONF and not ALWAYS_EMIT:
+        return "", score
+    return label, score
+
+
+def _result(variant: ModelVariant, probs: np.ndarray, idx: int, score: float,
+            mirrored: bool = False) -> InferenceResult:
+    label, score = _finalize(idx, score, variant.label_of)
+    return InferenceResult(probs=probs, index=idx, score=score, label=label,
+                           mirrored=mirrored, label_of=variant.label_of, variant=variant.name)
+
+
+def _pair_probs(frames_list, variant: ModelVariant) -> np.ndarray:
+    """
+    N개 시퀀스 → (N,2,C) 원본/미러링 확률
+    양자화한 윈도우가 모델의 캐시에 있으면 그대로 쓰고, 없는 것만 모아서 추론 후 캐시에 저장
+    """
+    cache = variant.cache
+    with batch_stage.labels("cache", variant.name).time():
+        frames = [_as_frames_10x21x2(f) for f in frames_list]
+        keys = window_keys(frames) if cache.enabled else [None] * len(frames)
+        probs = [cache.get(k) for k in keys]
+    miss = [i for i, p in enumerate(probs) if p is None]
+    if miss:
+        computed = _compute_pair_probs([frames_list[i] for i in miss], [frames[i] for i in miss], variant)
+        for i, row in zip(miss, computed):
+            probs[i] = row
+            cache.put(keys[i], row)
+    return np.stack(probs, axis=0)
+
+
+def _compute_pair_probs(frames_list, frames, variant: ModelVariant) -> np.ndarray:
+    """
+    N개 시퀀스의 원본/미러링을 (2N,10,55) 배치 하나로 묶어 invoke 한 번으로 추론 → (N,2,C)
+    process 백엔드면 좌표 블록을 워커로 넘겨 특징 추출부터 워커에서 수행
+    """
+    n = len(frames_list)
+    if variant.backend is not None:
+        if all(f is not None for f in frames):
+            with batch_stage.labels("worker", variant.name).time():
+                return variant.backend.infer_pairs(np.stack(frames, axis=0))
+        # 이미 특징 입력은 워커로 보낼 수 없으므로 아래 경로로 처리
+
+    with batch_stage.labels("features", variant.name).time():
+        x = _coerce_pairs(frames_list)
+    # (디버깅용) 특징 차원 확인
+    expected = variant.feature_dim
+    got = int(x.shape[2])
+    if expected is not None and got != expected:
+        logger.warning("feature dim mismatch: got=%d expected=%d", got, expected)
+    # 원본/미러링 행이 한 배치에 섞여 있어 invoke 는 하나로 측정 (나눠서 돌리면 invoke 가 두 배)
+    with batch_stage.labels("invoke", variant.name).time():
+        return variant.infer_batch(x).reshape(n, 2, -1)
+
+
+def _predict_pairs(frames_list, variant: ModelVariant):
+    """각 시퀀스마다 원본/미러링 중 확신도가 높은 쪽을 채택 → [InferenceResult, ...]"""
+    probs = _pair_probs(frames_list, variant)                          # (N,2,C)
+    with batch_stage.labels("postprocess", variant.name).time():
+        return _select_pairs(probs, variant)
+
+
+def _select_pairs(probs: np.ndarray, variant: ModelVariant):
+    """(N,2,C) 원본/미러링 확률 → [InferenceResult, ...]"""
+    n = probs.shape[0]
+    idxs = np.argmax(probs, axis=2)                                    # (N,2)
+    scores = np.take_along_axis(probs, idxs[..., None], axis=2)[..., 0]
+
+    results = []
+    for k in range(n):
+        # 더 높은 확신도 선택 (동점이면 원본)
+        j = 1 if scores[k, 1] > scores[k, 0] else 0
+        results.append(_result(variant, probs[k, j], int(idxs[k, j]), float(scores[k, j]), mirrored=bool(j)))
+    return results
+
+
+def predict_batch_results(frames_list, variant: Optional[str] = None):
+    """
+    여러 요청의 (10,21,2) 시퀀스 목록 → [InferenceResult, ...]
+    variant: 모델 슬롯 이름 (stable | candidate, 없으면 stable) — 실행 시점의 모델을 사용
+    배치 전체가 실패하면 요청별로 다시 추론해 한 요청의 오류가 다른 요청에 번지지 않게 함
+    """
+    frames_list = list(frames_list)
+    if not frames_list:
+        return []
+    model = registry.get(variant)
+    try:
+        with model_latency.labels(model.name).time():
+            results = _predict_pairs(frames_list, model)
+    except Exception:
+        if len(frames_list) == 1:
+            logger.exception("시퀀스 추론 실패")
+            return [InferenceResult.failed()]
+        logger.exception("배치 추론 실패 (n=%d) → 요청별 재시도", len(frames_list))
+        return [predict_batch_results([f], variant)[0] for f in frames_list]
+    conf = model_confidence.labels(model.name)
+    for r in results:
+        conf.observe(r.score)
+    return results
+
+
+def predict_batch(frames_list):
+    """여러 요청의 (10,21,2) 시퀀스 목록 → [(label, score), ...]"""
+    return [(r.label, r.score) for r in predict_batch_results(frames_list)]
+
+
 def predict_from_sequence(frames_10x21x2):
     """
     (10,21,2) 시퀀스 → 원본/미러링 비교 후 더 높은 확신도를 사용
+    원본/미러링을 (2,10,55) 배치로 묶어 invoke 한 번으로 두 확률 행을 얻음
     ALWAYS_EMIT_CAPTION=1 이면 임계값 미만이라도 레이블을 표시
     """
-    try:
-        a0 = np.asarray(frames_10x21x2, dtype=np.float32)
-
-        # 원본
-        x0 = _coerce_to_1x10x55(a0)
-        # (디버깅용) 특징 차원 확인
-        expected = int(_in_det[0]["shape"][2]) if len(_in_det[0]["shape"]) >= 3 else None
-        got0 = int(x0.shape[2])
-        if expected is not None and got0 != expected:
-            logger.warning("feature dim mismatch (orig): got=%d expected=%d", got0, expected)
-        i0, s0 = infer_any(x0)
-
-        # 미러링
-        a1 = _mirror_frames(a0)
-        x1 = _coerce_to_1x10x55(a1)
-        got1 = int(x1.shape[2])
-        if expected is not None and got1 != expected:
-            logger.warning("feature dim mismatch (mirr): got=%d expected=%d", got1, expected)
-        i1, s1 = infer_any(x1)
-
-        # 더 높은 확신도 선택
-        if s1 > s0:
-            idx, score = i1, s1
-        else:
-            idx, score = i0, s0
-
-        label = _label_from_idx(idx)
-        if score < MIN_CONF and not ALWAYS_EMIT:
-            return "", score
-        return label, score
-    except Exception:
-        logger.exception("시퀀스 추론 실패")
-        return "", 0.0
+    return predict_batch([frames_10x21x2])[0]
 
 
 # -------------------------- 헬스/라우팅 -----------------------------------
 # @app.api_route("/ai/health", methods=["GET", "HEAD"])
 # def health():
-#     return {"status": "ok", "model_loaded": _interpreter is not None}
+#     return {"status": "ok", "model_loaded": registry.stable is not None}
 
 @app.get("/ai/health")
 def health_get():
-    return {"status": "ok", "model_loaded": _interpreter is not None}
+    return {"status": "ok", "model_loaded": registry.stable is not None}
 
 @app.head("/ai/health")
 def health_head():
     return
 
+def _serving_models() -> dict:
+    """지금 서빙 중인 모델 경로 (핫 리로드/승격 반영, 로딩 전이면 설정값)"""
+    stable, candidate = registry.stable, registry.candidate
+    return {
+        "model_path": stable.path if stable is not None else MODEL_PATH,
+        "candidate_path": candidate.path if candidate is not None else None,
+        "candidate_percent": registry.candidate_percent,
+    }
+
+
+@app.get("/ai/ready")
+def ready_get():
+    """모델 로딩 + 워밍업이 끝나야 200 (오토스케일러/로드밸런서 readiness probe 용)"""
+    if _ready:
+        return {"status": "ready", **_serving_models(), "warmup": _warmup_report}
+    body = {"status": "failed" if _load_error else "warming_up", **_serving_models()}
+    if _load_error:
+        body["error"] = _load_error
+    return JSONResponse(status_code=503, content=body)
+
+# -------------------------- 모델 교체/A-B (재시작 없이) --------------------
+class ModelLoadRequest(BaseModel):
+    path: str                        # float 모델 경로, MODEL_DIR 기준 (양자화 모델은 precision 으로 선택)
+    precision: Optional[str] = None  # float32 | float16 | int8 (없으면 MODEL_PRECISION)
+    percent: Optional[float] = None  # candidate 로 보낼 방 비율 (%)
+
+
+class CandidatePercentRequest(BaseModel):
+    percent: float
+
+
+def _check_admin(token: Optional[str]) -> None:
+    """모델 변경 API 는 MODEL_ADMIN_TOKEN 이 설정돼 있고 X-Admin-Token 이 일치할 때만 허용"""
+    if not MODEL_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="model admin API disabled (MODEL_ADMIN_TOKEN not set)")
+    if token is None or not hmac.compare_digest(token.encode("utf-8"), MODEL_ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="invalid admin token")
+
+
+def _model_file(path: str) -> str:
+    """요청한 모델 경로 → MODEL_DIR 안의 실제 경로 (상대 경로는 MODEL_DIR 기준, 밖이면 400)"""
+    real = os.path.realpath(os.path.join(MODEL_DIR, path))
+    if os.path.commonpath([MODEL_DIR, real]) != MODEL_DIR:
+        raise HTTPException(status_code=400, detail=f"model path must be inside {MODEL_DIR}")
+    return real
+
+
+@app.get("/ai/models")
+def models_get():
+    return registry.describe()
+
+@app.post("/ai/models/{slot}")
+async def models_load(slot: str, req: ModelLoadRequest, x_admin_token: Optional[str] = Header(default=None)):
+    """
+    새 .tflite 를 백그라운드 스레드에서 로딩 + 워밍업한 뒤 slot(stable|candidate)을 원자적으로 교체
+    교체 전까지 진행 중인 통화는 기존 모델로 계속 추론
+    """
+    _check_admin(x_admin_token)
+    if slot not in (STABLE, CANDIDATE):
+        raise HTTPException(status_code=404, detail=f"unknown model slot: {slot}")
+    path = _model_file(req.path)
+    try:
+        variant = await asyncio.to_thread(registry.load, path, slot, precision=req.precision)
+    except Exception as e:
+        logger.exception("model load failed: %s", path)
+        raise HTTPException(status_code=400, detail=f"model load failed: {e!r}")
+    registry.install(variant, slot)
+    _log_variant(variant)
+    if req.percent is not None:
+        registry.set_candidate_percent(req.percent)
+    return registry.describe()
+
+@app.put("/ai/models/candidate/percent")
+def models_candidate_percent(req: CandidatePercentRequest, x_admin_token: Optional[str] = Header(default=None)):
+    _check_admin(x_admin_token)
+    registry.set_candidate_percent(req.percent)
+    return registry.describe()
+
+@app.post("/ai/models/candidate/promote")
+def models_promote(x_admin_token: Optional[str] = Header(default=None)):
+    _check_admin(x_admin_token)
+    try:
+        registry.promote()
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return registry.describe()
+
+@app.delete("/ai/models/candidate")
+def models_drop_candidate(x_admin_token: Optional[str] = Header(default=None)):
+    _check_admin(x_admin_token)
+    registry.drop_candidate()
+    return registry.describe()
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus 스크레이프 (prometheus.yml 의 ai:8001/metrics)"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 app.include_router(router)
 logger.info("FastAPI 컨테이너 실행됨 (8001)")
 
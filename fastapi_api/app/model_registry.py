@@ -0,0 +1,244 @@
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+import numpy as np
+from prometheus_client import Gauge, Histogram
+
+from .config import (
+    CANDIDATE_PERCENT,
+    INFER_MAX_BATCH,
+    INFER_PROCESS_WORKERS,
+    INFERENCE_BACKEND,
+    INTERPRETER_NUM_THREADS,
+    MODEL_PRECISION,
+    MODEL_RETIRE_GRACE_S,
+    TFLITE_XNNPACK,
+    WARMUP_BATCH_SIZES,
+    WARMUP_RUNS,
+)
+from .features import frames_to_feats_55
+from .interpreter_pool import InterpreterPool
+from .labels import ACTIONS, label_of, load_labels
+from .process_backend import ProcessInferenceBackend
+from .result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+STABLE, CANDIDATE = "stable", "candidate"
+PRECISIONS = ("float32", "float16", "int8")
+
+# Prometheus 지표 (variant = stable | candidate)
+model_latency = Histogram(
+    "ai_model_inference_seconds",
+    "Batch inference time per model variant (seconds)",
+    ["variant"],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5],
+)
+model_confidence = Histogram(
+    "ai_model_confidence",
+    "Top-class probability of inference results per model variant",
+    ["variant"],
+    buckets=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99, 1.0],
+)
+candidate_percent_gauge = Gauge("ai_model_candidate_percent", "Percentage of rooms routed to the candidate model")
+
+
+def resolve_model_path(path: str, precision: str) -> str:
+    """
+    float 모델 경로 + 정밀도 → 실제로 읽을 파일
+    <이름>.float16.tflite / <이름>.int8.tflite (tools/quantize_model.py 산출물) 이 없으면 float 모델 사용
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"unknown model precision: {precision}")
+    if precision == "float32":
+        return path
+    stem, ext = os.path.splitext(path)
+    quantized = f"{stem}.{precision}{ext}"
+    if os.path.isfile(quantized):
+        return quantized
+    logger.warning("%s model not found (%s) → using float model", precision, quantized)
+    return path
+
+
+class ModelVariant:
+    """로딩된 .tflite 하나: Interpreter 풀(또는 프로세스 백엔드) + 라벨 맵 + 결과 캐시"""
+
+    def __init__(self, name: str, path: str, *, backend: str = INFERENCE_BACKEND,
+                 precision: str = MODEL_PRECISION, xnnpack: bool = TFLITE_XNNPACK) -> None:
+        self.name = name
+        self.source_path = path                          # 라벨 파일 기준이 되는 float 모델 경로
+        self.path = resolve_model_path(path, precision)  # 실제로 로딩한 파일
+        self.precision = precision if self.path != path else "float32"
+        self.xnnpack = bool(xnnpack)
+        self.pool: Optional[InterpreterPool] = None
+        self.backend: Optional[ProcessInferenceBackend] = None
+        if backend == "process":
+            self.backend = ProcessInferenceBackend(
+                self.path, workers=INFER_PROCESS_WORKERS,
+                num_threads=INTERPRETER_NUM_THREADS, max_rows=INFER_MAX_BATCH, xnnpack=self.xnnpack,
+            )
+            self.in_shape, self.out_shape = self.backend.in_shape, self.backend.out_shape
+        else:
+            self.pool = InterpreterPool(self.path, xnnpack=self.xnnpack, name=name)
+            self.in_shape = tuple(int(s) for s in self.pool.input_details[0]["shape"])
+            self.out_shape = tuple(int(s) for s in self.pool.output_details[0]["shape"])
+        self.feature_dim = int(self.in_shape[-1]) if len(self.in_shape) >= 3 else None
+        self.num_classes = int(self.out_shape[-1]) if len(self.out_shape) >= 1 else None
+        self.labels = load_labels(self.source_path, self.num_classes)
+        self.cache = ResultCache(name=name)  # 모델마다 결과가 다르므로 캐시도 따로
+        self.warmup_report: Optional[dict] = None
+        self.loaded_at = time.time()
+        self._fallback_pool: Optional[InterpreterPool] = None
+
+    def rename(self, name: str) -> None:
+        """슬롯 이름 변경 (풀 지표의 pool 라벨, 캐시 지표의 variant 라벨도 함께)"""
+        self.name = name
+        self.cache.rename(name)
+        if self.pool is not None:
+            self.pool.rename(name)
+        if self._fallback_pool is not None:
+            self._fallback_pool.rename(f"{name}_fallback")
+
+    @property
+    def use_jamo(self) -> bool:
+        return self.labels is ACTIONS
+
+    def label_of(self, idx: int) -> str:
+        return label_of(self.labels, idx)
+
+    def infer_batch(self, x_Nx10x55: np.ndarray) -> np.ndarray:
+        """(N,10,55) → (N,C)  (process 백엔드면 특징 입력용 Interpreter 를 필요할 때 하나 만듦)"""
+        pool = self.pool
+        if pool is None:
+            if self._fallback_pool is None:
+                self._fallback_pool = InterpreterPool(self.path, size=1, xnnpack=self.xnnpack,
+                                                      name=f"{self.name}_fallback")
+            pool = self._fallback_pool
+        return pool.infer_batch(x_Nx10x55)
+
+    def warm_up(self, runs: int = WARMUP_RUNS, batch_sizes=WARMUP_BATCH_SIZES) -> dict:
+        """배치 크기별 합성 입력으로 runs 번씩 추론 → {"total_ms", "steps"}"""
+        t0 = time.perf_counter()
+        steps = []
+        if runs:
+            steps = (self.backend or self.pool).warm_up(batch_sizes, runs)
+            if self.backend is None:  # 특징 추출 경로도 한 번 (process 백엔드는 워커 안에서 이미 실행)
+                frames_to_feats_55(np.random.default_rng(0).random((1, 10, 21, 2), dtype=np.float32))
+        self.warmup_report = {"total_ms": round((time.perf_counter() - t0) * 1000, 3), "steps": steps}
+        return self.warmup_report
+
+    def describe(self) -> dict:
+        return {
+            "path": self.path,
+            "precision": self.precision,
+            "xnnpack": self.xnnpack,
+            "in_shape": list(self.in_shape),
+            "out_shape": list(self.out_shape),
+            "model_type": "JAMO" if self.use_jamo else "SENTENCE",
+            "loaded_at": self.loaded_at,
+            "warmup": self.warmup_report,
+        }
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
+        for pool in (self.pool, self._fallback_pool):
+            if pool is not None:
+                pool.close()
+        self.cache.clear()
+
+
+class ModelRegistry:
+    """
+    stable / candidate 두 슬롯의 모델을 관리
+    - load(): 새 .tflite 를 로딩 + 워밍업 (블로킹 → 호출 쪽에서 스레드로 실행)
+    - install(): 슬롯을 원자적으로 교체, 이전 모델은 진행 중 배치가 끝나도록 잠시 뒤에 정리
+    - for_room(): room 이름 해시로 CANDIDATE_PERCENT % 의 방을 candidate 로 고정 라우팅
+    """
+
+    def __init__(self, *, candidate_percent: float = CANDIDATE_PERCENT) -> None:
+        self.slots: Dict[str, Optional[ModelVariant]] = {STABLE: None, CANDIDATE: None}
+        self.candidate_percent = 0.0
+        self.set_candidate_percent(candidate_percent)
+        self._lock = threading.Lock()
+
+    @property
+    def stable(self) -> Optional[ModelVariant]:
+        return self.slots[STABLE]
+
+    @property
+    def candidate(self) -> Optional[ModelVariant]:
+        return self.slots[CANDIDATE]
+
+    def get(self, name: Optional[str] = None) -> Optional[ModelVariant]:
+        """슬롯 이름 → 모델 (candidate 가 없으면 stable)"""
+        return self.slots.get(name or STABLE) or self.slots[STABLE]
+
+    def set_candidate_percent(self, percent: float) -> None:
+        self.candidate_percent = min(100.0, max(0.0, float(percent)))
+        candidate_percent_gauge.set(self.candidate_percent)
+
+    def for_room(self, room: str) -> str:
+        if self.slots[CANDIDATE] is None or self.candidate_percent <= 0:
+            return STABLE
+        bucket = zlib.crc32((room or "").encode("utf-8")) % 10000 / 100.0  # 노드/프로세스와 무관하게 같은 값
+        return CANDIDATE if bucket < self.candidate_percent else STABLE
+
+    def load(self, path: str, name: str, *, warm: bool = True, precision: Optional[str] = None) -> ModelVariant:
+        variant = ModelVariant(name, path, precision=precision or MODEL_PRECISION)
+        if warm:
+            variant.warm_up()
+        return variant
+
+    def install(self, variant: ModelVariant, slot: str) -> None:
+        if slot not in self.slots:
+            raise ValueError(f"unknown model slot: {slot}")
+        variant.rename(slot)
+        with self._lock:
+            old, self.slots[slot] = self.slots[slot], variant
+        logger.info("model %s ← %s", slot, variant.path)
+        self._retire(old)
+
+    def promote(self) -> None:
+        """candidate → stable (candidate 슬롯은 비움)"""
+        with self._lock:
+            variant = self.slots[CANDIDATE]
+            if variant is None:
+                raise ValueError("no candidate model loaded")
+            old, self.slots[STABLE], self.slots[CANDIDATE] = self.slots[STABLE], variant, None
+            variant.rename(STABLE)
+        logger.info("candidate promoted to stable: %s", variant.path)
+        self._retire(old)
+
+    def drop_candidate(self) -> None:
+        with self._lock:
+            old, self.slots[CANDIDATE] = self.slots[CANDIDATE], None
+        self._retire(old)
+
+    def _retire(self, old: Optional[ModelVariant]) -> None:
+        """교체된 모델은 이미 배정된 배치가 끝나도록 MODEL_RETIRE_GRACE_S 뒤에 정리"""
+        if old is None:
+            return
+        timer = threading.Timer(MODEL_RETIRE_GRACE_S, old.close)
+        timer.daemon = True
+        timer.start()
+
+    def describe(self) -> dict:
+        return {
+            "candidate_percent": self.candidate_percent,
+            **{slot: (v.describe() if v is not None else None) for slot, v in self.slots.items()},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            variants = [v for v in self.slots.values() if v is not None]
+            self.slots = {STABLE: None, CANDIDATE: None}
+        for v in variants:
+            v.close()
+
+
+registry = ModelRegistry()
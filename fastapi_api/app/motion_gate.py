@@ -0,0 +1,65 @@
+from typing import Optional
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+from .config import MOTION_MIN_PRESENCE, MOTION_THRESHOLD
+from .inference_result import InferenceResult
+
+# Prometheus 지표
+gate_decisions = Counter(
+    "ai_motion_gate_total",
+    "Motion gate decisions per inference window (run | still = reused caption | absent = no hand)",
+    ["decision"],
+)
+gate_skip_ratio = Gauge("ai_motion_gate_skip_ratio", "Fraction of inference windows skipped by the motion gate")
+
+RUN, STILL, ABSENT = "run", "still", "absent"
+_counts = {RUN: 0, STILL: 0, ABSENT: 0}
+
+
+def _record(decision: str) -> str:
+    gate_decisions.labels(decision).inc()
+    _counts[decision] += 1
+    total = sum(_counts.values())
+    gate_skip_ratio.set((total - _counts[RUN]) / total)
+    return decision
+
+
+class MotionGate:
+    """
+    연결별 추론 게이트: (10,21,2) 윈도우를 추론하기 전에 NumPy 로 싸게 판단
+    - absent: 손이 있는 프레임(0 채움이 아닌 프레임) 비율이 MOTION_MIN_PRESENCE 미만 → 추론 생략
+    - still : 프레임 간 이동량과 마지막으로 추론한 윈도우 대비 이동량이 모두 MOTION_THRESHOLD 미만
+              → 추론 생략, 마지막 자막 재사용
+    - run   : 그 외 (원본/미러링 invoke 두 번)
+    """
+
+    def __init__(self, *, threshold: float = MOTION_THRESHOLD, min_presence: float = MOTION_MIN_PRESENCE) -> None:
+        self.threshold = float(threshold)
+        self.min_presence = float(min_presence)
+        self._last_window: Optional[np.ndarray] = None
+        self.last_result: Optional[InferenceResult] = None
+        self.hand_present = False  # 직전 윈도우에 손이 있었는지
+        self.hand_lost = False     # 이번 check 에서 손이 막 사라졌는지 (present → absent 전환 때만 True)
+
+    def check(self, frames_10x21x2) -> str:
+        w = np.asarray(frames_10x21x2, dtype=np.float32)
+        present = np.any(w != 0.0, axis=(1, 2))                        # (10,) 손이 없는 프레임은 0 채움
+        self.hand_lost = False
+        if present.mean() < self.min_presence:
+            self._last_window = None  # 손이 다시 나타나면 바로 추론
+            self.hand_lost, self.hand_present = self.hand_present, False
+            return _record(ABSENT)
+        self.hand_present = True
+        if self._last_window is None or self.last_result is None:
+            return _record(RUN)
+
+        step = np.linalg.norm(np.diff(w, axis=0), axis=-1).mean(axis=-1).max()   # 프레임 간 관절 평균 이동량 (최대)
+        drift = np.linalg.norm(w - self._last_window, axis=-1).mean()            # 마지막 추론 윈도우 대비
+        return _record(STILL if max(step, drift) < self.threshold else RUN)
+
+    def remember(self, frames_10x21x2, result: InferenceResult) -> None:
+        """추론한 윈도우와 결과를 기억 (다음 still 판정/재사용용)"""
+        self._last_window = np.array(frames_10x21x2, dtype=np.float32, copy=True)
+        self.last_result = result
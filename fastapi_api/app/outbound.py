@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Optional, Tuple, Union
+
+from fastapi import WebSocket
+from prometheus_client import Counter, Gauge, Histogram
+
+from .config import OUTBOUND_OVERFLOW, OUTBOUND_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Prometheus 지표
+ws_outbound_queue_depth = Gauge(
+    "ws_outbound_queue_depth",
+    "Messages waiting in per-client outbound queues (sum over clients)",
+)
+ws_outbound_dropped = Counter(
+    "ws_outbound_dropped_total",
+    "Outbound messages dropped because a client queue was full",
+    ["policy"],
+)
+
+ws_outbound_send_seconds = Histogram(
+    "ws_outbound_send_seconds",
+    "Time to write one queued message to a client socket (seconds)",
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1],
+)
+
+Payload = Union[str, bytes]
+
+# 느린 클라이언트를 끊을 때 사용하는 close code (1013 = Try Again Later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ClientSender:
+    """
+    클라이언트 하나의 송신 전용 큐 + writer task
+    - send_nowait() 는 절대 기다리지 않음 (브로드캐스트가 느린 클라이언트에 막히지 않도록)
+    - 큐가 가득 차면 정책에 따라 가장 오래된 caption 을 버리거나(drop_oldest) 연결을 끊음(disconnect)
+      error/ack/제어 메시지는 버리지 않음 → 큐에 버릴 caption 이 없으면 drop_oldest 여도 끊음
+    """
+
+    def __init__(self, ws: WebSocket, *, maxsize: int = OUTBOUND_QUEUE_SIZE,
+                 policy: str = OUTBOUND_OVERFLOW) -> None:
+        self.ws = ws
+        self.policy = policy if policy in ("drop_oldest", "disconnect") else "drop_oldest"
+        self.maxsize = max(1, int(maxsize))
+        self._items: Deque[Tuple[Payload, bool]] = deque()  # (payload, droppable)
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._writer())
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def _drop_oldest(self) -> bool:
+        """가장 오래된 droppable(caption) 메시지 하나를 버림 (없으면 False)"""
+        for i, (_, droppable) in enumerate(self._items):
+            if droppable:
+                del self._items[i]
+                ws_outbound_queue_depth.dec()
+                return True
+        return False
+
+    def send_nowait(self, payload: Payload, *, droppable: bool = False) -> bool:
+        """
+        큐에 넣기만 하고 바로 반환 (버려졌거나 닫힌 연결이면 False)
+        droppable: 새 caption 이 오면 의미가 없어지는 메시지 (큐가 가득 찼을 때 먼저 버림)
+        """
+        if self.closed:
+            return False
+        if len(self._items) >= self.maxsize:
+            if self.policy == "drop_oldest" and self._drop_oldest():
+                ws_outbound_dropped.labels(policy="drop_oldest").inc()
+            else:
+                ws_outbound_dropped.labels(policy="disconnect").inc()
+                logger.warning("slow consumer → disconnect (queue=%d)", len(self._items))
+                self.close()
+                asyncio.get_running_loop().create_task(self._disconnect())
+                return False
+        self._items.append((payload, droppable))
+        ws_outbound_queue_depth.inc()
+        self._ready.set()
+        return True
+
+    async def _writer(self) -> None:
+        try:
+            while True:
+                while not self._items:
+                    self._ready.clear()
+                    await self._ready.wait()
+                payload, _ = self._items.popleft()
+                ws_outbound_queue_depth.dec()
+                with ws_outbound_send_seconds.time():
+                    if isinstance(payload, bytes):
+                        await self.ws.send_bytes(payload)
+                    else:
+                        await self.ws.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 연결이 이미 닫힌 경우: 이후 메시지는 버림 (정리는 receive 루프의 hub.remove 에서)
+            logger.debug("outbound writer stopped", exc_info=True)
+            self.close()
+
+    async def _disconnect(self) -> None:
+        try:
+            await self.ws.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """writer 중지 + 남은 메시지 버림"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        ws_outbound_queue_depth.dec(len(self._items))
+        self._items.clear()
+
@@ -0,0 +1,230 @@
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_FRAME_SHAPE = (10, 21, 2)
+
+
+# -------------------------- 워커 프로세스 ---------------------------------
+def _worker_main(model_path: str, num_threads: int, xnnpack: bool, shm_name: str, max_rows: int, conn) -> None:
+    """
+    워커 프로세스 진입점: Interpreter 를 하나 소유하고
+    공유 메모리에 써진 (n,10,21,2) 좌표 블록 → (n,2,C) 원본/미러링 확률을 돌려줌
+    시작에 실패하면 ("error", repr(e)) 를 보내고 종료 (부모가 원인을 알 수 있도록)
+    """
+    shm = None
+    frames = None
+    try:
+        from .features import frames_to_feats_55
+        from .interpreter_pool import PooledInterpreter
+
+        shm = shared_memory.SharedMemory(name=shm_name)
+        frames = np.ndarray((max_rows,) + _FRAME_SHAPE, dtype=np.float32, buffer=shm.buf)
+        with open(model_path, "rb") as f:
+            interp = PooledInterpreter(f.read(), num_threads, xnnpack=xnnpack)
+        in_shape = tuple(int(s) for s in interp.in_det[0]["shape"])
+        out_shape = tuple(int(s) for s in interp.out_det[0]["shape"])
+    except Exception as e:
+        conn.send(("error", repr(e)))
+        frames = None  # 공유 메모리 버퍼를 참조하는 배열을 먼저 놓아야 close 가능
+        if shm is not None:
+            shm.close()
+        return
+
+    try:
+        conn.send(("ready", in_shape, out_shape))
+
+        while True:
+            msg = conn.recv()
+            if msg is None:  # 종료 신호
+                break
+            n = int(msg)
+            try:
+                block = frames[:n]
+                mirrored = block.copy()
+                mirrored[..., 0] = 1.0 - mirrored[..., 0]
+                pairs = np.stack([block, mirrored], axis=1).reshape((-1,) + _FRAME_SHAPE)  # (2n,10,21,2)
+                probs = interp.infer_batch(frames_to_feats_55(pairs))
+                conn.send(("ok", probs.reshape(n, 2, -1)))
+            except Exception as e:
+                conn.send(("error", repr(e)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del frames
+        shm.close()
+
+
+# -------------------------- 부모 프로세스 쪽 핸들 --------------------------
+class _Worker:
+    """워커 프로세스 하나 + 입력용 공유 메모리 + 파이프"""
+
+    def __init__(self, ctx, model_path: str, num_threads: int, xnnpack: bool, max_rows: int) -> None:
+        self.max_rows = max_rows
+        nbytes = max_rows * int(np.prod(_FRAME_SHAPE)) * np.dtype(np.float32).itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.conn = self.proc = None
+        try:
+            self.frames = np.ndarray((max_rows,) + _FRAME_SHAPE, dtype=np.float32, buffer=self.shm.buf)
+            self.conn, child_conn = ctx.Pipe()
+            self.proc = ctx.Process(
+                target=_worker_main,
+                args=(model_path, num_threads, xnnpack, self.shm.name, max_rows, child_conn),
+                daemon=True,
+            )
+            self.proc.start()
+            child_conn.close()
+            self._handshake(model_path)
+        except BaseException:
+            self.close()  # 시작 실패 → 프로세스 정리 + 공유 메모리 해제 (unlink 안 하면 /dev/shm 에 남음)
+            raise
+
+    def _handshake(self, model_path: str) -> None:
+        """워커의 ready 응답을 기다림 (실패하면 워커가 보낸 원인을 담아 RuntimeError)"""
+        try:
+            msg = self.conn.recv()
+        except EOFError:
+            self.proc.join(timeout=5)
+            raise RuntimeError(f"inference worker exited during startup "
+                               f"(model={model_path}, exitcode={self.proc.exitcode})") from None
+        if msg[0] != "ready":
+            raise RuntimeError(f"inference worker failed to start (model={model_path}): {msg[1]}")
+        _, self.in_shape, self.out_shape = msg
+
+    def run(self, block: np.ndarray) -> np.ndarray:
+        """(n,10,21,2) → (n,2,C); 좌표는 공유 메모리로, 확률은 파이프로 전달"""
+        n = int(block.shape[0])
+        self.frames[:n] = block
+        self.conn.send(n)
+        status, payload = self.conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"inference worker error: {payload}")
+        return payload
+
+    def close(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        if self.proc is not None and self.proc.pid is not None:
+            self.proc.join(timeout=5)
+            if self.proc.is_alive():
+                self.proc.terminate()
+        if self.conn is not None:
+            self.conn.close()
+        self.frames = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ProcessInferenceBackend:
+    """
+    GIL 을 우회하는 멀티프로세스 추론 백엔드
+    워커마다 Interpreter 를 하나씩 소유하고 좌표 배치는 공유 메모리로 주고받음
+    (특징 추출 + 미러링 + invoke 를 모두 워커에서 수행)
+    """
+
+    def __init__(self, model_path: str, *, workers: int, num_threads: int, max_rows: int,
+                 xnnpack: bool = True) -> None:
+        self.model_path = model_path
+        self.num_threads = max(1, int(num_threads))
+        self.xnnpack = bool(xnnpack)
+        self.max_rows = max(1, int(max_rows))
+        self._ctx = mp.get_context("spawn")  # 부모의 스레드/Interpreter 상태를 물려받지 않도록
+
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()  # None = 남은 워커 없음
+        self._lock = threading.Lock()
+        try:
+            for _ in range(max(1, int(workers))):
+                w = self._spawn()
+                self._workers.append(w)
+                self._idle.put(w)
+        except Exception:
+            self.close()  # 먼저 띄운 워커들도 정리
+            raise
+        self.in_shape: Tuple[int, ...] = self._workers[0].in_shape
+        self.out_shape: Tuple[int, ...] = self._workers[0].out_shape
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.model_path, self.num_threads, self.xnnpack, self.max_rows)
+
+    def _replace(self, dead: _Worker) -> Optional[_Worker]:
+        """죽은 워커를 정리하고 새로 띄움"""
+        with self._lock:
+            try:
+                dead.close()
+            except Exception:
+                pass
+            try:
+                fresh = self._spawn()
+            except Exception:
+                logger.exception("failed to respawn inference worker")
+                self._workers.remove(dead)
+                if not self._workers:
+                    self._idle.put(None)  # 워커를 기다리던 호출을 깨워 바로 실패하도록
+                return None
+            self._workers[self._workers.index(dead)] = fresh
+            return fresh
+
+    def infer_pairs(self, frames_Nx10x21x2: np.ndarray) -> np.ndarray:
+        """(N,10,21,2) → (N,2,C)  (max_rows 보다 크면 나눠서 실행)"""
+        if not self._workers:
+            raise RuntimeError("no inference workers available")
+        block = np.ascontiguousarray(frames_Nx10x21x2, dtype=np.float32)
+        worker = self._idle.get()
+        if worker is None:  # 마지막 워커까지 재시작에 실패함
+            self._idle.put(None)
+            raise RuntimeError("no inference workers available")
+        try:
+            out = [worker.run(block[i:i + self.max_rows]) for i in range(0, block.shape[0], self.max_rows)]
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            logger.error("inference worker pid=%s died → respawning", worker.proc.pid)
+            worker = self._replace(worker)
+            raise RuntimeError("inference worker died")
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+        return np.concatenate(out, axis=0)
+
+    def warm_up(self, batch_sizes: Sequence[int], runs: int) -> List[Dict[str, float]]:
+        """모든 워커를 빌려서 배치 크기별로 runs 번씩 합성 좌표 추론 (InterpreterPool.warm_up 과 같은 형식)"""
+        rng = np.random.default_rng(0)
+        workers = [self._idle.get() for _ in range(len(self._workers))]
+        timings = []
+        try:
+            for n in batch_sizes:
+                block = rng.random((min(int(n), self.max_rows),) + _FRAME_SHAPE).astype(np.float32)
+                times = []
+                for _ in range(max(1, int(runs))):
+                    t0 = time.perf_counter()
+                    for w in workers:
+                        w.run(block)
+                    times.append((time.perf_counter() - t0) * 1000 / len(workers))
+                timings.append({"batch": int(block.shape[0]), "runs": len(times),
+                                "first_ms": round(times[0], 3), "mean_ms": round(sum(times) / len(times), 3)})
+        finally:
+            for w in workers:
+                self._idle.put(w)
+        return timings
+
+    def close(self) -> None:
+        for w in self._workers:
+            try:
+                w.close()
+            except Exception:
+                logger.exception("failed to stop inference worker")
+        self._workers.clear()
@@ -0,0 +1,388 @@
+import asyncio
+import base64
+import functools
+import logging
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi import WebSocket
+from redis.exceptions import RedisError
+
+from . import codec
+from .outbound import Payload
+from .state import Hub
+
+logger = logging.getLogger(__name__)
+
+# ---- Redis 키/채널 ---------------------------------------------------------
+ROOM_CHANNEL = "ai:room:{}"        # 방 브로드캐스트 (노드 간)
+NODE_CHANNEL = "ai:node:{}"        # 노드별 제어 메시지 (AI 워커 bind 등)
+ALIVE_KEY = "ai:node:{}:alive"     # 노드 생존 표시 (TTL)
+WORKERS_KEY = "ai:workers"         # 여유 있는 AI 워커 "node_id:ws_id" → 부하 점수 (sorted set)
+ROOM_WORKER_KEY = "ai:room:{}:worker"    # 방을 맡은 워커 "node_id:ws_id"
+ROOM_CLIENTS_KEY = "ai:room:{}:clients"  # 방의 client 연결 수 (hash: node_id → 그 노드의 연결 수)
+WAITING_KEY = "ai:waiting"         # 워커를 기다리는 방 집합
+ALIVE_TTL = 15                     # 초
+ROOM_CLIENTS_TTL = ALIVE_TTL * 2   # 초, client 가 있는 노드가 heartbeat 마다 연장
+
+
+async def _default_redis():
+    from .redis_pool import get_redis
+    return get_redis()  # lifespan 에서 연 공유 커넥션 풀
+
+
+def _s(v) -> str:
+    return v.decode("utf-8") if isinstance(v, (bytes, bytearray)) else v
+
+
+def _tolerate_redis(fn):
+    """허브 훅의 Redis 오류는 로그만 남김 (연결 add/remove 와 수신 루프로 번지지 않도록)"""
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await fn(self, *args, **kwargs)
+        except RedisError:
+            logger.exception("redis hub %s failed", fn.__name__)
+            return None
+    return wrapper
+
+
+class RedisHub(Hub):
+    """
+    HUB_BACKEND=redis 용 허브
+    - 각 방은 pub/sub 채널(ai:room:<room>) 하나: 이 노드에 그 방 연결이 있을 때만 구독
+    - broadcast 는 로컬 연결에 바로 큐잉하고, 같은 payload 를 채널에 publish → 다른 노드가 자기 연결에 전달
+    - AI 워커 부하는 sorted set(ai:workers)으로 공유 → 가장 한가한 워커에 배정, 다른 노드의 워커는 노드 채널로 bind 지시
+    - 방의 client 수는 노드별로 기록 → 죽은 노드(alive 키 만료)의 몫은 세지 않고, 워커를 둔 노드가 주기적으로 정리
+    Redis 연결 전/실패 시에는 기존 Hub 처럼 프로세스 내에서만 동작 (동작 중 Redis 오류는 로그만 남김)
+    """
+
+    def __init__(self, redis_factory: Callable[[], Awaitable] = _default_redis, *,
+                 node_id: Optional[str] = None) -> None:
+        super().__init__()
+        self.node_id = node_id or uuid.uuid4().hex[:12]
+        self._redis_factory = redis_factory
+        self.redis = None
+        self._pubsub = None
+        self._ops: Optional[asyncio.Queue] = None  # publish/subscribe 순서를 지키는 단일 큐
+        self._tasks: List[asyncio.Task] = []
+        self._ws_ids: Dict[WebSocket, str] = {}
+        self._by_id: Dict[str, WebSocket] = {}
+
+    # ---- 수명 주기 ----------------------------------------------------------
+    async def start(self) -> None:
+        try:
+            self.redis = await self._redis_factory()
+            self._pubsub = self.redis.pubsub()
+            await self._pubsub.subscribe(NODE_CHANNEL.format(self.node_id),
+                                         *(ROOM_CHANNEL.format(r) for r in self.rooms))
+            await self.redis.set(ALIVE_KEY.format(self.node_id), "1", ex=ALIVE_TTL)
+        except Exception:
+            logger.exception("redis hub start failed → in-process only")
+            self.redis = self._pubsub = None
+            return
+
+        self._ops = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._io_loop(), name="redis-hub-io"),
+            loop.create_task(self._listen_loop(), name="redis-hub-listen"),
+            loop.create_task(self._heartbeat_loop(), name="redis-hub-heartbeat"),
+        ]
+        logger.info("redis hub started: node=%s", self.node_id)
+
+    async def close(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        for t in self._tasks:
+            try:
+                await t
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+        self._ops = None
+        if self.redis is None:
+            return
+        try:
+            for ws in list(self.workers.workers):
+                rooms = self.workers.unregister(ws)
+                await self._unregister_ai(ws, rooms)
+                if rooms:
+                    await self.redis.sadd(WAITING_KEY, *rooms)  # 다른 노드의 워커가 이어받도록
+            await self.redis.delete(ALIVE_KEY.format(self.node_id))
+            close = getattr(self._pubsub, "aclose", None) or self._pubsub.close
+            await close()
+        except Exception:
+            logger.exception("redis hub close failed")
+        self.redis = self._pubsub = None
+
+    # ---- 연결 ID (노드 간에 워커를 가리킬 때 사용) ---------------------------
+    def _id_of(self, ws: WebSocket) -> str:
+        wid = self._ws_ids.get(ws)
+        if wid is None:
+            wid = uuid.uuid4().hex[:12]
+            self._ws_ids[ws] = wid
+            self._by_id[wid] = ws
+        return wid
+
+    async def remove(self, ws: WebSocket) -> None:
+        await super().remove(ws)
+        wid = self._ws_ids.pop(ws, None)
+        if wid is not None:
+            self._by_id.pop(wid, None)
+
+    # ---- 방 구독 ------------------------------------------------------------
+    def _op(self, *op) -> None:
+        if self._ops is not None:
+            self._ops.put_nowait(op)
+
+    def _room_opened(self, room: str) -> None:
+        self._op("subscribe", ROOM_CHANNEL.format(room))
+
+    def _room_closed(self, room: str) -> None:
+        super()._room_closed(room)
+        self._op("unsubscribe", ROOM_CHANNEL.format(room))
+
+    # ---- 브로드캐스트 ---------------------------------------------------------
+    def broadcast(self, room: str, payload: Payload, *, role: Optional[str] = None,
+                  exclude: Optional[WebSocket] = None, droppable: bool = False) -> int:
+        sent = super().broadcast(room, payload, role=role, exclude=exclude, droppable=droppable)
+        if room and self._ops is not None:
+            env = {"o": self.node_id, "r": role}
+            if droppable:
+                env["d"] = 1
+            if isinstance(payload, bytes):
+                env["b"] = base64.b64encode(payload).decode("ascii")
+            else:
+                env["p"] = payload
+            self._op("publish", ROOM_CHANNEL.format(room), codec.dumps(env))
+        return sent
+
+    def _deliver(self, room: str, env: dict) -> None:
+        """다른 노드에서 온 브로드캐스트 → 이 노드의 연결에만 전달 (다시 publish 하지 않음)"""
+        if env.get("o") == self.node_id:
+            return
+        payload = base64.b64decode(env["b"]) if "b" in env else env.get("p", "")
+        Hub.broadcast(self, room, payload, role=env.get("r"), droppable=bool(env.get("d")))
+
+    # ---- AI 워커 배정 (Redis sorted set 으로 부하 공유) ------------------------
+    def _member(self, ws: WebSocket) -> str:
+        return f"{self.node_id}:{self._id_of(ws)}"
+
+    async def _alive(self, member: str) -> bool:
+        node, _, wid = member.partition(":")
+        if node == self.node_id:
+            return wid in self._by_id
+        return bool(await self.redis.exists(ALIVE_KEY.format(node)))
+
+    @_tolerate_redis
+    async def _on_load_changed(self, ws: WebSocket) -> None:
+        if self.redis is None:
+            return
+        load = self.workers.workers.get(ws)
+        if load is not None and load.has_capacity:
+            await self.redis.zadd(WORKERS_KEY, {self._member(ws): load.score})
+        else:
+            await self.redis.zrem(WORKERS_KEY, self._member(ws))
+
+    @_tolerate_redis
+    async def _unregister_ai(self, ws: WebSocket, rooms: List[str]) -> None:
+        if self.redis is None:
+            return
+        member = self._member(ws)
+        await self.redis.zrem(WORKERS_KEY, member)
+        for room in rooms:
+            key = ROOM_WORKER_KEY.format(room)
+            if _s(await self.redis.get(key)) == member:
+                await self.redis.delete(key)
+
+    @_tolerate_redis
+    async def _client_joined(self, room: str) -> None:
+        if self.redis is not None:
+            key = ROOM_CLIENTS_KEY.format(room)
+            await self.redis.hincrby(key, self.node_id, 1)
+            await self.redis.expire(key, ROOM_CLIENTS_TTL)
+        await super()._client_joined(room)
+
+    @_tolerate_redis
+    async def _client_left(self, room: str) -> None:
+        if self.redis is None:
+            await super()._client_left(room)
+            return
+        key = ROOM_CLIENTS_KEY.format(room)
+        if await self.redis.hincrby(key, self.node_id, -1) <= 0:
+            await self.redis.hdel(key, self.node_id)
+        if not await self._room_has_clients(room):
+            await self._free_room(room)
+
+    async def _free_room(self, room: str) -> None:
+        """모든 노드에서 room 의 client 가 빠짐 → 공유 상태 정리 + 맡던 워커의 슬롯 반납"""
+        await self.redis.delete(ROOM_CLIENTS_KEY.format(room))
+        await self.redis.srem(WAITING_KEY, room)
+        owner = _s(await self.redis.get(ROOM_WORKER_KEY.format(room)))
+        await self.redis.delete(ROOM_WORKER_KEY.format(room))
+        if owner is None:
+            return
+        node = owner.partition(":")[0]
+        if node == self.node_id:
+            await self._release_room(room)
+        else:
+            await self.redis.publish(NODE_CHANNEL.format(node),
+                                     codec.dumps({"op": "release", "room": room}))
+
+    async def _room_has_clients(self, room: str) -> bool:
+        """살아 있는 노드 중 하나라도 room 에 client 가 있으면 True (죽은 노드의 몫은 지움)"""
+        if self.redis is None:
+            return await super()._room_has_clients(room)
+        key = ROOM_CLIENTS_KEY.format(room)
+        try:
+            counts = await self.redis.hgetall(key)
+            for node, n in counts.items():
+                node = _s(node)
+                if int(n) <= 0:
+                    continue
+                if node == self.node_id or await self.redis.exists(ALIVE_KEY.format(node)):
+                    return True
+                await self.redis.hdel(key, node)
+            return False
+        except RedisError:
+            logger.exception("redis hub _room_has_clients failed")
+            return await super()._room_has_clients(room)
+
+    async def _sweep_rooms(self) -> None:
+        """이 노드의 워커가 맡은 방 중 client 가 죽은 노드에만 있던 방을 반납 (그 노드는 _client_left 를 못 부름)"""
+        for ws in list(self.workers.workers):
+            for room in sorted(self.workers.rooms_of(ws)):
+                if not await self.redis.exists(ROOM_CLIENTS_KEY.format(room)):
+                    continue  # 아직 client 가 없는 방 (워커가 방을 지정하고 먼저 들어온 경우)
+                if not await self._room_has_clients(room):
+                    logger.info("room %s has no live clients → release", room)
+                    await self._free_room(room)
+                    await self._release_room(room)
+
+    @_tolerate_redis
+    async def _claim_room(self, ws: WebSocket, room: str) -> None:
+        if self.redis is None:
+            await super()._claim_room(ws, room)
+        elif await self.redis.set(ROOM_WORKER_KEY.format(room), self._member(ws), nx=True):
+            self.workers.assign(room, ws)
+
+    async def _bind_local(self, wid: str, room: str) -> bool:
+        """이 노드의 워커 wid 에 room 배정 (끊겼거나 꽉 찼으면 False)"""
+        ws = self._by_id.get(wid)
+        load = self.workers.workers.get(ws) if ws is not None else None
+        if load is None or not load.has_capacity:
+            return False
+        self.workers.assign(room, ws)
+        self._bind_ai(ws, room)
+        await self._on_load_changed(ws)
+        return True
+
+    @_tolerate_redis
+    async def _assign_ai(self, room: str) -> None:
+        if self.redis is None:
+            await super()._assign_ai(room)
+            return
+        key = ROOM_WORKER_KEY.format(room)
+        owner = _s(await self.redis.get(key))
+        if owner is not None:
+            if await self._alive(owner):
+                return  # 이미 다른 워커가 맡고 있음
+            await self.redis.delete(key)  # 죽은 노드의 워커
+        while True:
+            best = await self.redis.zrange(WORKERS_KEY, 0, 0)
+            if not best:
+                await self.redis.sadd(WAITING_KEY, room)  # 워커가 생기면 배정
+                return
+            member = _s(best[0])
+            if not await self._alive(member):
+                await self.redis.zrem(WORKERS_KEY, member)
+                continue
+            if not await self.redis.set(key, member, nx=True):
+                return  # 그 사이 다른 노드가 배정함
+            node, _, wid = member.partition(":")
+            if node != self.node_id:
+                await self.redis.publish(NODE_CHANNEL.format(node),
+                                         codec.dumps({"op": "bind", "ws": wid, "room": room}))
+                return
+            if await self._bind_local(wid, room):
+                return
+            await self.redis.delete(key)
+            await self.redis.zrem(WORKERS_KEY, member)
+
+    @_tolerate_redis
+    async def _drain_waiting(self) -> None:
+        if self.redis is None:
+            await super()._drain_waiting()
+            return
+        free = sum(max(0, load.max_rooms - len(load.rooms)) for load in self.workers.workers.values())
+        for _ in range(free):
+            room = _s(await self.redis.spop(WAITING_KEY))
+            if room is None:
+                return
+            await self._assign_ai(room)
+
+    @_tolerate_redis
+    async def _on_control(self, msg: dict) -> None:
+        op, room = msg.get("op"), msg.get("room") or ""
+        if not room:
+            return
+        if op == "release":
+            await self._release_room(room)
+        elif op == "bind":
+            wid = msg.get("ws", "")
+            if await self._bind_local(wid, room):
+                return
+            # 그 사이 워커가 끊겼거나 꽉 찼으면 다른 워커를 찾음
+            await self.redis.delete(ROOM_WORKER_KEY.format(room))
+            ws = self._by_id.get(wid)
+            if ws is not None:
+                await self._on_load_changed(ws)  # 공유 부하를 실제 값으로 갱신
+            else:
+                await self.redis.zrem(WORKERS_KEY, f"{self.node_id}:{wid}")
+            await self._assign_ai(room)
+
+    # ---- 백그라운드 태스크 ----------------------------------------------------
+    async def _io_loop(self) -> None:
+        while True:
+            op, *args = await self._ops.get()
+            try:
+                if op == "publish":
+                    await self.redis.publish(*args)
+                elif op == "subscribe":
+                    await self._pubsub.subscribe(*args)
+                elif op == "unsubscribe":
+                    await self._pubsub.unsubscribe(*args)
+            except Exception:
+                logger.exception("redis hub %s failed", op)
+
+    async def _listen_loop(self) -> None:
+        node_channel = NODE_CHANNEL.format(self.node_id)
+        room_prefix = ROOM_CHANNEL.format("")
+        while True:
+            try:
+                msg = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if msg is None:
+                    continue
+                channel, data = _s(msg["channel"]), codec.loads(_s(msg["data"]))
+                if channel == node_channel:
+                    await self._on_control(data)
+                elif channel.startswith(room_prefix):
+                    self._deliver(channel[len(room_prefix):], data)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("redis hub listener error")
+                await asyncio.sleep(1.0)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(ALIVE_TTL / 3)
+            try:
+                await self.redis.set(ALIVE_KEY.format(self.node_id), "1", ex=ALIVE_TTL)
+                for room, roles in list(self.rooms.items()):
+                    if roles.get("client"):
+                        await self.redis.expire(ROOM_CLIENTS_KEY.format(room), ROOM_CLIENTS_TTL)
+                await self._sweep_rooms()
+            except Exception:
+                logger.exception("redis hub heartbeat failed")
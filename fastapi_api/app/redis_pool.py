@@ -0,0 +1,81 @@
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+from prometheus_client import Gauge
+
+from .config import REDIS_HEALTH_CHECK_INTERVAL, REDIS_MAX_CONNECTIONS, REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[redis.ConnectionPool] = None
+_client: Optional[redis.Redis] = None
+
+# Prometheus 지표 (스크레이프 시점의 풀 상태)
+redis_pool_connections = Gauge(
+    "redis_pool_connections",
+    "Connections in the shared async Redis pool",
+    ["state"],
+)
+redis_pool_max_connections = Gauge(
+    "redis_pool_max_connections",
+    "Configured maximum connections of the shared async Redis pool",
+)
+
+
+def _pool_count(attr: str) -> float:
+    """
+    redis-py ConnectionPool 의 내부 목록 길이 (_in_use_connections / _available_connections, redis==5.0.x 기준)
+    공개 API 가 아니므로 버전이 바뀌어 속성이 없으면 NaN (값 없음) 으로 보고
+    """
+    if _pool is None:
+        return 0
+    conns = getattr(_pool, attr, None)
+    return float("nan") if conns is None else len(conns)
+
+
+redis_pool_connections.labels(state="in_use").set_function(lambda: _pool_count("_in_use_connections"))
+redis_pool_connections.labels(state="idle").set_function(lambda: _pool_count("_available_connections"))
+
+
+def _redacted_target(pool: redis.ConnectionPool) -> str:
+    """로그용 접속 대상 (REDIS_URL 의 사용자/비밀번호는 빼고 host:port/db 또는 unix 경로만)"""
+    kw = pool.connection_kwargs
+    where = kw["path"] if "path" in kw else f"{kw.get('host', 'localhost')}:{kw.get('port', 6379)}"
+    return f"{where}/{kw.get('db', 0)}"
+
+
+async def open_pool() -> redis.Redis:
+    """앱 시작 시 한 번: 커넥션 풀 + 공유 클라이언트 생성 (실제 연결은 처음 사용할 때 맺음)"""
+    global _pool, _client
+    if _client is not None:
+        return _client
+    _pool = redis.ConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        socket_keepalive=True,
+        decode_responses=True,
+    )
+    _client = redis.Redis(connection_pool=_pool)
+    redis_pool_max_connections.set(REDIS_MAX_CONNECTIONS)
+    logger.info("redis pool opened: target=%s max_connections=%d health_check=%ds",
+                _redacted_target(_pool), REDIS_MAX_CONNECTIONS, REDIS_HEALTH_CHECK_INTERVAL)
+    return _client
+
+
+async def close_pool() -> None:
+    """앱 종료 시: 공유 클라이언트와 풀의 모든 연결을 닫음"""
+    global _pool, _client
+    if _client is not None:
+        await _client.aclose()
+    if _pool is not None:
+        await _pool.disconnect()
+    _pool = _client = None
+
+
+def get_redis() -> redis.Redis:
+    """공유 Redis 클라이언트 (요청마다 새로 만들지 않음)"""
+    if _client is None:
+        raise RuntimeError("redis pool is not open (app lifespan not started)")
+    return _client
@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+from .config import RESULT_CACHE_GRID, RESULT_CACHE_SIZE, RESULT_CACHE_TTL_S
+
+# Prometheus 지표
+cache_hits = Counter("ai_result_cache_hits_total", "Inference windows answered from the result cache")
+cache_misses = Counter("ai_result_cache_misses_total", "Inference windows that had to be computed")
+# variant = 모델 슬롯 stable | candidate (교체 후 MODEL_RETIRE_GRACE_S 동안 같은 슬롯의 캐시가 겹칠 수 있으므로 inc/dec 로 합산)
+cache_entries = Gauge("ai_result_cache_entries", "Entries currently held in the result cache", ["variant"])
+
+_WRIST = 0
+
+
+def window_keys(frames: Sequence[Optional[np.ndarray]], grid: float = RESULT_CACHE_GRID) -> List[Optional[bytes]]:
+    """
+    (10,21,2) 좌표 윈도우 목록 → 캐시 키 목록 (좌표 윈도우가 아니면 None)
+    프레임마다 손목 기준으로 옮기고 손 크기(손목에서 가장 먼 관절 거리)로 나눈 뒤 grid 간격으로 양자화
+    → 손 위치/크기만 다른, 거의 같은 손모양은 같은 키 (특징 자체가 이동/크기 불변)
+    """
+    keys: List[Optional[bytes]] = [None] * len(frames)
+    idx = [i for i, f in enumerate(frames) if f is not None]
+    if not idx:
+        return keys
+    block = np.stack([frames[i] for i in idx], axis=0).astype(np.float32, copy=False)  # (N,10,21,2)
+    rel = block - block[:, :, _WRIST:_WRIST + 1, :]
+    scale = np.linalg.norm(rel, axis=-1).max(axis=-1, keepdims=True)[..., None]          # (N,10,1,1)
+    rel = rel / np.where(scale > 1e-6, scale, 1.0)
+    q = np.floor(rel / grid + 0.5).astype(np.int16)
+    for i, row in zip(idx, q):
+        keys[i] = hashlib.blake2b(row.tobytes(), digest_size=16).digest()
+    return keys
+
+
+class ResultCache:
+    """
+    양자화한 랜드마크 윈도우 → 원본/미러링 확률 (2,C) 의 LRU 캐시 (TTL 지나면 만료)
+    추론 스케줄러의 워커 스레드들이 함께 쓰므로 lock 으로 보호
+    """
+
+    def __init__(self, *, maxsize: int = RESULT_CACHE_SIZE, ttl_s: float = RESULT_CACHE_TTL_S,
+                 name: str = "stable") -> None:
+        self.maxsize = max(0, int(maxsize))
+        self.ttl_s = float(ttl_s)
+        self.name = name
+        self._data: "OrderedDict[bytes, tuple]" = OrderedDict()  # key -> (만료 시각, probs)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key: Optional[bytes]) -> Optional[np.ndarray]:
+        if key is None or not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] < now:
+                del self._data[key]
+                cache_entries.labels(self.name).dec()
+                item = None
+            if item is None:
+                cache_misses.inc()
+                return None
+            self._data.move_to_end(key)
+        cache_hits.inc()
+        return item[1]
+
+    def put(self, key: Optional[bytes], probs: np.ndarray) -> None:
+        if key is None or not self.enabled:
+            return
+        value = np.array(probs, copy=True)
+        value.setflags(write=False)  # 캐시된 배열을 호출한 쪽에서 고치지 못하도록
+        with self._lock:
+            before = len(self._data)
+            self._data[key] = (time.monotonic() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            cache_entries.labels(self.name).inc(len(self._data) - before)
+
+    def rename(self, name: str) -> None:
+        """지표의 variant 라벨 변경 (candidate 승격 등으로 모델 슬롯이 바뀔 때)"""
+        with self._lock:
+            if name == self.name:
+                return
+            cache_entries.labels(self.name).dec(len(self._data))
+            self.name = name
+            cache_entries.labels(name).inc(len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            cache_entries.labels(self.name).dec(len(self._data))
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
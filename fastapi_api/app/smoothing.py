@@ -0,0 +1,110 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from prometheus_client import Counter
+
+from .config import (
+    SMOOTHING_ALPHA,
+    SMOOTHING_HOLD,
+    SMOOTHING_MARGIN,
+    SMOOTHING_MAX_ROOMS,
+    SMOOTHING_RESET_S,
+)
+
+# Prometheus 지표
+smoothing_captions = Counter(
+    "ai_caption_smoothing_total",
+    "Inference results after per-room smoothing (emitted = stable label changed)",
+    ["outcome"],
+)
+
+
+def _finalize(idx: int, score: float, label_of=None) -> Tuple[str, float]:
+    from . import main  # main 이 websocketServer 를 import 하므로 지연 import
+    return main._finalize(idx, score, label_of)
+
+
+class CaptionSmoother:
+    """
+    방 하나의 자막 후처리
+    - 클래스 확률에 지수이동평균(EMA)
+    - 히스테리시스: 새 라벨은 EMA 에서 현재 라벨보다 margin 이상 앞서고 hold 번 연속 1위여야 채택
+    - 채택된(안정) 라벨의 자막이 바뀔 때만 내보냄
+    """
+
+    def __init__(self, *, alpha: float = SMOOTHING_ALPHA, margin: float = SMOOTHING_MARGIN,
+                 hold: int = SMOOTHING_HOLD, reset_s: float = SMOOTHING_RESET_S) -> None:
+        self.alpha = float(alpha)
+        self.margin = float(margin)
+        self.hold = max(1, int(hold))
+        self.reset_s = float(reset_s)
+        self.reset()
+
+    def reset(self) -> None:
+        self.ema: Optional[np.ndarray] = None
+        self.stable: Optional[int] = None
+        self.emitted: Optional[str] = None
+        self._pending: Optional[int] = None
+        self._count = 0
+        self._last = 0.0
+
+    def update(self, probs: np.ndarray, label_of=None) -> Optional[Tuple[str, float]]:
+        """
+        확률 벡터 하나 반영 → 안정 라벨의 자막이 바뀌었으면 (label, score), 아니면 None
+        label_of: 결과를 낸 모델의 라벨 함수 (A/B 모델마다 라벨 맵이 다름)
+        """
+        now = time.monotonic()
+        p = np.asarray(probs, dtype=np.float32)
+        if self.ema is None or self.ema.shape != p.shape or now - self._last > self.reset_s:
+            self.reset()  # 한동안 결과가 없었으면(또는 모델 교체) 이전 상태를 버림
+            self.ema = p.copy()
+        else:
+            self.ema += self.alpha * (p - self.ema)
+        self._last = now
+
+        idx = int(np.argmax(self.ema))
+        if self.stable is not None and idx != self.stable and self.ema[idx] < self.ema[self.stable] + self.margin:
+            idx = self.stable  # margin 이상 앞서지 않으면 현재 라벨 유지
+        if idx == self.stable:
+            self._pending, self._count = None, 0
+            return None
+
+        if idx != self._pending:
+            self._pending, self._count = idx, 0
+        self._count += 1
+        if self._count < self.hold:
+            return None
+
+        self.stable, self._pending, self._count = idx, None, 0
+        label, score = _finalize(idx, float(self.ema[idx]), label_of)
+        if label == self.emitted:
+            return None  # 임계값 미만끼리 바뀐 경우 등 자막은 그대로
+        self.emitted = label
+        return label, score
+
+
+class RoomSmoothing:
+    """방별 CaptionSmoother (오래 안 쓴 방부터 정리)"""
+
+    def __init__(self, *, max_rooms: int = SMOOTHING_MAX_ROOMS) -> None:
+        self.max_rooms = max(1, int(max_rooms))
+        self._rooms: "OrderedDict[str, CaptionSmoother]" = OrderedDict()
+
+    def update(self, room: str, probs: np.ndarray, label_of=None) -> Optional[Tuple[str, float]]:
+        smoother = self._rooms.get(room)
+        if smoother is None:
+            smoother = self._rooms[room] = CaptionSmoother()
+            while len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+        self._rooms.move_to_end(room)
+        out = smoother.update(probs, label_of)
+        smoothing_captions.labels("emitted" if out is not None else "suppressed").inc()
+        return out
+
+    def discard(self, room: str) -> None:
+        self._rooms.pop(room, None)
+
+
+room_smoothing = RoomSmoothing()
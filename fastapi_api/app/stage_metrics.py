@@ -0,0 +1,42 @@
+from prometheus_client import Histogram
+
+# 자막 파이프라인 단계별 지연시간 (초)
+#   메시지 단위 (type = 메시지 타입)
+#     parse      : JSON 디코딩 / 바이너리 헤더 해석
+#     normalize  : 랜드마크 → (21,2)/(10,21,2) float32 (대표 손 선택, 10프레임 보정)
+#     inference  : 스케줄러 제출 ~ 결과 (배치 대기 포함)
+#     postprocess: 스무딩 + caption 구성
+#     fanout     : caption 직렬화 + 방 client 들의 송신 큐에 넣기
+#   배치 단위 (variant = stable | candidate)
+#     cache      : 윈도우 키 계산 + 결과 캐시 조회
+#     features   : 원본/미러링 (2N,10,21,2) → (2N,10,55) 특징 추출
+#     invoke     : 원본/미러링을 묶은 (2N,10,55) invoke 한 번
+#     worker     : process 백엔드 왕복 (특징 추출 + invoke 가 워커 프로세스 안에서 실행)
+#     postprocess: 원본/미러링 선택 + 라벨/임계값 적용
+
+# type 라벨로 쓰는 메시지 타입 (클라이언트가 보낸 임의의 type 이 시계열을 늘리지 않도록 나머지는 other)
+MESSAGE_TYPES = frozenset({
+    "hand_landmarks", "hand_landmarks_sequence", "coords", "hello", "worker_status",
+    "connection_test", "subtitle", "binary", "raw",
+})
+
+_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]
+
+message_stage = Histogram(
+    "ai_message_stage_seconds",
+    "Caption pipeline latency per stage for each WebSocket message (seconds)",
+    ["stage", "type"],
+    buckets=_BUCKETS,
+)
+
+batch_stage = Histogram(
+    "ai_batch_stage_seconds",
+    "Inference latency per stage for each micro-batch (seconds)",
+    ["stage", "variant"],
+    buckets=_BUCKETS,
+)
+
+
+def type_label(mtype) -> str:
+    """클라이언트가 보낸 type → 지표 라벨 (문자열이 아니면 리스트/dict 등 해시 불가 값이어도 other)"""
+    return mtype if isinstance(mtype, str) and mtype in MESSAGE_TYPES else "other"
@@ -2,8 +2,12 @@ from typing import Set, Dict, List, Optional
 from fastapi import WebSocket
 import logging
 
-logging.basicConfig(level=logging.INFO,
-                    format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+from . import codec
+from .config import HUB_BACKEND
+from .outbound import ClientSender, Payload
+from .smoothing import room_smoothing
+from .worker_scheduler import WorkerScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,42 +15,196 @@ class Hub: #허브
     def __init__(self) -> None:
         self.clients: Set[WebSocket] = set()
         self.meta: Dict[WebSocket, Dict[str, Optional[str]]] = {}  # {"role": "ai|client", "room": str|None}
-        self.ai_pool: Set[WebSocket] = set()  # room 없이 대기 중인 AI
+        self.workers: WorkerScheduler[WebSocket] = WorkerScheduler()  # AI 워커 ↔ 방 배정 + 부하
+        self.rooms: Dict[str, Dict[str, Set[WebSocket]]] = {}  # room -> role -> {ws} 인덱스
+        self.senders: Dict[WebSocket, ClientSender] = {}  # ws -> 송신 큐 + writer task
+
+    # ---- room/role 인덱스 ---------------------------------------------------
+    def _index(self, ws: WebSocket, role: str, room: Optional[str]) -> None:
+        if room:
+            if room not in self.rooms:
+                self.rooms[room] = {}
+                self._room_opened(room)
+            self.rooms[room].setdefault(role, set()).add(ws)
+
+    def _unindex(self, ws: WebSocket, role: str, room: Optional[str]) -> None:
+        roles = self.rooms.get(room) if room else None
+        if not roles:
+            return
+        members = roles.get(role)
+        if members is not None:
+            members.discard(ws)
+            if not members:
+                del roles[role]
+        if not roles:
+            del self.rooms[room]
+            self._room_closed(room)
+
+    def _room_opened(self, room: str) -> None:
+        """이 노드에 room 의 첫 연결이 생김 (멀티 노드 허브에서 구독용)"""
+
+    def _room_closed(self, room: str) -> None:
+        """이 노드에서 room 의 마지막 연결이 빠짐 → 방별 자막 스무딩 상태도 버림 (같은 방 이름의 새 통화가 물려받지 않도록)"""
+        room_smoothing.discard(room)
+
+    # ------------------------------------------------------------------------
 
     def room_of(self, ws: WebSocket) -> str:
         return self.meta.get(ws, {}).get("room") or ""
 
-    async def add(self, ws: WebSocket, *, role: str, room: str) -> None:
+    async def add(self, ws: WebSocket, *, role: str, room: str, capacity: Optional[int] = None) -> None:
         self.clients.add(ws)
         self.meta[ws] = {"role": role, "room": (room or None)}
+        self._index(ws, role, room)
+        sender = ClientSender(ws)
+        sender.start()
+        self.senders[ws] = sender
 
         if role == "ai":
-            if not room:
-                self.ai_pool.add(ws)  # ★ 워커 대기
+            self.workers.register(ws, max_rooms=capacity)  # ★ 워커 등록 (capacity = 동시에 맡을 방 수)
+            if room:
+                await self._claim_room(ws, room)  # 방을 지정하고 들어온 워커
+            await self._on_load_changed(ws)
+            await self._drain_waiting()
         else:  # client
-            if room and self.ai_pool:
-                ai_ws = self.ai_pool.pop()
-                self.meta[ai_ws]["room"] = room        # ★ 서버가 워커에 room을 ‘지정’
-                try:
-                    await ai_ws.send_json({"type": "bind", "room": room})  # ★ 알림(옵션)
-                except Exception:
-                    pass
+            if room:
+                await self._client_joined(room)
 
     async def remove(self, ws: WebSocket) -> None:
-        self.ai_pool.discard(ws)
         self.clients.discard(ws)
-        self.meta.pop(ws, None)
+        m = self.meta.pop(ws, None)
+        sender = self.senders.pop(ws, None)
+        if sender is not None:
+            sender.close()
+        if m is None:
+            return
+
+        if m["role"] == "ai":
+            orphans = self.workers.unregister(ws)
+            for room in set(orphans) | {m["room"]}:
+                self._unindex(ws, "ai", room)
+            await self._unregister_ai(ws, orphans)
+            for room in orphans:  # ★ 끊긴 워커가 맡던 방을 다른 워커로 재배정
+                if await self._room_has_clients(room):
+                    await self._assign_ai(room)
+        else:
+            self._unindex(ws, m["role"], m["room"])
+            if m["room"]:
+                await self._client_left(m["room"])
+
+    # ---- AI 워커 배정 (부하 기반, 워커 하나가 여러 방 처리) ------------------
+    async def update_worker(self, ws: WebSocket, *, max_rooms: Optional[int] = None,
+                            inflight: Optional[int] = None, p95_ms: Optional[float] = None) -> None:
+        """워커가 보낸 worker_status 반영 (용량이 늘었으면 대기 중인 방 배정)"""
+        if self.workers.update(ws, max_rooms=max_rooms, inflight=inflight, p95_ms=p95_ms) is None:
+            return
+        await self._on_load_changed(ws)
+        await self._drain_waiting()
+
+    async def _client_joined(self, room: str) -> None:
+        await self._assign_ai(room)
+
+    async def _client_left(self, room: str) -> None:
+        if not await self._room_has_clients(room):
+            await self._release_room(room)
+
+    async def _room_has_clients(self, room: str) -> bool:
+        return bool(self.rooms.get(room, {}).get("client"))
+
+    async def _claim_room(self, ws: WebSocket, room: str) -> None:
+        if self.workers.worker_of(room) is None:
+            self.workers.assign(room, ws)
+
+    async def _assign_ai(self, room: str) -> None:
+        if self.workers.worker_of(room) is not None:
+            return
+        ai_ws = self.workers.assign(room)  # 여유 있는 워커 중 가장 한가한 워커 (없으면 대기열)
+        if ai_ws is not None:
+            self._bind_ai(ai_ws, room)
+            await self._on_load_changed(ai_ws)
+
+    async def _release_room(self, room: str) -> None:
+        """room 에 client 가 없음 → 워커의 슬롯 반납"""
+        ai_ws = self.workers.release(room)
+        if ai_ws is not None and ai_ws in self.meta:
+            self._unbind_ai(ai_ws, room)
+            await self._on_load_changed(ai_ws)
+            await self._drain_waiting()
+
+    async def _drain_waiting(self) -> None:
+        for room in self.workers.drain_waiting():
+            await self._assign_ai(room)
+
+    async def _on_load_changed(self, ws: WebSocket) -> None:
+        """워커 부하가 바뀜 (멀티 노드 허브에서 공유 부하 갱신용)"""
+
+    async def _unregister_ai(self, ws: WebSocket, rooms: List[str]) -> None:
+        """워커가 끊김 (멀티 노드 허브에서 공유 상태 정리용)"""
+
+    def _bind_ai(self, ai_ws: WebSocket, room: str) -> None:
+        self._index(ai_ws, "ai", room)         # ★ 서버가 워커에 room을 ‘지정’ (여러 방 동시 가능)
+        m = self.meta[ai_ws]
+        if not m["room"]:
+            m["room"] = room                   # room_id 없는 메시지의 기본 방
+        self.send_json(ai_ws, {"type": "bind", "room": room})  # ★ 알림(옵션)
+
+    def _unbind_ai(self, ai_ws: WebSocket, room: str) -> None:
+        self._unindex(ai_ws, "ai", room)
+        m = self.meta[ai_ws]
+        if m["room"] == room:
+            m["room"] = next(iter(sorted(self.workers.rooms_of(ai_ws))), None)
+        self.send_json(ai_ws, {"type": "unbind", "room": room})
+
+    # ---- 수명 주기 (멀티 노드 허브에서 사용) ---------------------------------
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    # ---- 송신 (논블로킹: 클라이언트별 큐에 넣고 바로 반환) --------------------
+    # droppable=True: caption 처럼 새 메시지가 오면 의미가 없어지는 것 (송신 큐가 가득 차면 먼저 버림)
+    def send(self, ws: WebSocket, payload: Payload, *, droppable: bool = False) -> bool:
+        sender = self.senders.get(ws)
+        return sender.send_nowait(payload, droppable=droppable) if sender is not None else False
+
+    def broadcast(self, room: str, payload: Payload, *, role: Optional[str] = None,
+                  exclude: Optional[WebSocket] = None, droppable: bool = False) -> int:
+        """room(과 role)의 모든 연결에 payload 를 큐잉, 큐잉된 연결 수 반환"""
+        targets = self.by_role_in_room(role, room) if role else self.in_room(room)
+        sent = 0
+        for ws in targets:
+            if ws is not exclude and self.send(ws, payload, droppable=droppable):
+                sent += 1
+        return sent
+
+    # ---- JSON 은 한 번만 직렬화해서 모든 수신자에게 같은 payload 를 보냄 -------
+    def send_json(self, ws: WebSocket, obj) -> bool:
+        return self.send(ws, codec.dumps(obj))
+
+    def broadcast_json(self, room: str, obj, *, role: Optional[str] = None,
+                       exclude: Optional[WebSocket] = None, droppable: bool = False) -> str:
+        """obj 를 한 번만 인코딩 → broadcast, 인코딩된 payload 반환 (재사용용)"""
+        payload = codec.dumps(obj)
+        self.broadcast(room, payload, role=role, exclude=exclude, droppable=droppable)
+        return payload
 
     def in_room(self, room: str) -> List[WebSocket]:
         if not room:
             return []
-        return [ws for ws in self.clients if self.meta.get(ws, {}).get("room") == room]
+        return [ws for members in self.rooms.get(room, {}).values() for ws in members]
 
     def by_role_in_room(self, role: str, room: str) -> List[WebSocket]:
         if not room:
             return []
-        return [ws for ws in self.clients
-                if self.meta.get(ws, {}).get("room") == room
-                and self.meta.get(ws, {}).get("role") == role]
+        return list(self.rooms.get(room, {}).get(role, ()))
+
+def _make_hub() -> Hub:
+    """HUB_BACKEND=redis 이면 노드 간 공유 허브, 아니면 프로세스 메모리 허브"""
+    if HUB_BACKEND == "redis":
+        from .redis_hub import RedisHub
+        return RedisHub()
+    return Hub()
+
 
-hub = Hub()
\ No newline at end of file
+hub = _make_hub()
@@ -0,0 +1,76 @@
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from prometheus_client import Counter, Histogram
+
+from .config import CAPTION_TRACE
+from .inference_result import InferenceResult
+from .stage_metrics import type_label
+
+# Prometheus 지표 (목표: 촬영 → 자막 300ms 미만)
+_BUCKETS = [0.025, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1, 2, 5]
+glass_to_caption = Histogram(
+    "ai_glass_to_caption_seconds",
+    "Client capture timestamp to caption fan-out (seconds, includes client/server clock offset)",
+    ["type"],
+    buckets=_BUCKETS,
+)
+recv_to_caption = Histogram(
+    "ai_recv_to_caption_seconds",
+    "Server receive to caption fan-out (seconds, server clock only)",
+    ["type"],
+    buckets=_BUCKETS,
+)
+clock_skew_rejected = Counter(
+    "ai_trace_clock_skew_total",
+    "Captions whose client capture timestamp was in the future or too old to be plausible",
+)
+
+MAX_GLASS_S = 60.0  # 이보다 크거나 음수면 클라이언트 시계가 어긋난 것으로 보고 버림
+
+
+def now_ms() -> float:
+    return time.time() * 1000.0
+
+
+@dataclass
+class Trace:
+    """
+    랜드마크 메시지 하나의 추적 정보 (수신 시 만들어 자막까지 전달)
+    시각은 모두 epoch ms — 클라이언트 Date.now() 와 같은 기준
+    """
+    recv_ms: float
+    corr_id: Union[str, int, None] = None
+    capture_ms: Optional[float] = None
+
+    @property
+    def requested(self) -> bool:
+        """클라이언트가 추적을 요청했는지 (corr_id 또는 capture_ts 를 보냄)"""
+        return bool(self.corr_id) or self.capture_ms is not None
+
+    def finish(self, mtype: str, result: Optional[InferenceResult]) -> Optional[dict]:
+        """
+        자막을 내보내는 시점에 호출: 지연시간 지표 기록 + caption 에 실을 trace (요청이 없으면 None)
+        result 가 None 이면 추론 없이 이전 결과를 재사용한 자막 → 추론 시각은 생략
+        """
+        send_ms = now_ms()
+        label = type_label(mtype)
+        recv_to_caption.labels(label).observe((send_ms - self.recv_ms) / 1000.0)
+        if self.capture_ms is not None:
+            glass = (send_ms - self.capture_ms) / 1000.0
+            if 0.0 <= glass <= MAX_GLASS_S:
+                glass_to_caption.labels(label).observe(glass)
+            else:
+                clock_skew_rejected.inc()
+
+        if not (self.requested or CAPTION_TRACE):
+            return None
+        out = {"recv_ts": round(self.recv_ms, 1)}
+        if self.capture_ms is not None:
+            out["capture_ts"] = self.capture_ms
+        if result is not None and result.infer_start:
+            out["infer_start_ts"] = round(result.infer_start * 1000.0, 1)
+            out["infer_end_ts"] = round(result.infer_end * 1000.0, 1)
+        out["send_ts"] = round(send_ms, 1)
+        return out
@@ -1,8 +1,18 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from .state import hub
-import asyncio, json, logging
+from .inference_scheduler import scheduler
+from .logging_setup import payload_sampler, room_stats
+from . import codec, wire
+from .codec import Caption, Coords, HandLandmarks, HandLandmarksSequence
+from .config import CAPTION_SMOOTHING, CAPTION_TOPK, MOTION_GATE, SEQUENCE_WINDOW
+from .motion_gate import ABSENT, STILL, MotionGate
+from .model_registry import registry
+from .smoothing import room_smoothing
+from .stage_metrics import message_stage, type_label
+from .tracing import Trace, now_ms
+from .window import FrameWindow
+import asyncio, logging, time
 import numpy as np
-import aioredis
 from prometheus_client import Gauge, Histogram
 
 logger = logging.getLogger(__name__)
@@ -13,215 +23,292 @@ ws_active_connections = Gauge("ws_active_connections", "Number of active WS conn
 ws_message_latency = Histogram(
     "ws_message_latency_seconds",
     "WebSocket message processing latency (seconds)",
-    buckets=[0.01, 0.05, 0.1, 0.2, 0.5, 1, 2, 5],
+    ["type"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.2, 0.5, 1, 2, 5],
 )
 
-REDIS_URL = "redis://redis:6379"
-
-async def get_redis():
-    return await aioredis.from_url(REDIS_URL, decode_responses=True)
-
-# ------------------- 공통 헬퍼: 포인트/프레임 정규화 -----------------------
-def _is_point(p):
-    if isinstance(p, dict):
-        return ("x" in p and "y" in p)
-    if isinstance(p, (list, tuple)) and len(p) >= 2:
-        return isinstance(p[0], (int, float)) or isinstance(p[0], (np.floating, np.integer))
-    return False
-
-def _to_xy21(frame):
-    """frame: 21개의 dict{x,y(,z)} 또는 [x,y] → [[x,y]*21]"""
-    if not frame:
-        return [[0.0, 0.0] for _ in range(21)]
-    first = frame[0]
-    if isinstance(first, dict):
-        xy = [[float(p.get("x", 0.0)), float(p.get("y", 0.0))] for p in frame]
-    else:
-        xy = [[float(p[0]), float(p[1])] for p in frame]
-    if len(xy) < 21:
-        xy += [[0.0, 0.0]] * (21 - len(xy))
-    return xy[:21]
+# ------------------- 랜드마크 배열 정규화 (JSON/바이너리 공통) ---------------
+def _primary_hands_np(arr):
+    """(T,hands,21,dims) → (T,21,2)  프레임마다 '평균 x 가 가장 작은' 손 선택"""
+    t, hands = arr.shape[0], arr.shape[1]
+    if hands == 0:
+        return np.zeros((t, 21, 2), dtype=np.float32)
+    idx = np.argmin(arr[..., 0].mean(axis=2), axis=1)   # (T,)
+    return arr[np.arange(t), idx, :, :2]
+
+
+def _ensure_10_frames_np(frames):
+    """(T,21,2) → (10,21,2)  >10 이면 균등 샘플링, <10 이면 마지막 프레임 반복"""
+    t = frames.shape[0]
+    if t == 10:
+        return frames
+    if t > 10:
+        return frames[np.linspace(0, t - 1, 10).round().astype(int)]
+    return np.concatenate([frames, np.repeat(frames[-1:], 10 - t, axis=0)], axis=0)
+# ------------------------------------------------------------------------
+
 
-def _ensure_10_frames(frames):
+async def _caption_from_frames(websocket, room_id, frames, corr_id=None, error_message="inference_failed",
+                               gate=None, mtype="-", trace=None):
     """
-    frames: List[Frame]; Frame = 21개의 포인트
-    길이 10으로 보정:
-      - >10: 균등 샘플링
-      - <10: 마지막 프레임 반복
+    스케줄러로 추론 후 방의 client 들에게 caption 전송 (실패 시 보낸 쪽에 error)
+    gate 가 있으면 손이 없을 때는 건너뛰고(손이 막 사라졌으면 빈 자막 한 번), 거의 움직이지 않았으면 마지막 결과를 재사용
+    CAPTION_SMOOTHING=1 이면 방별 EMA/히스테리시스를 거쳐 안정 라벨이 바뀔 때만 전송
+    trace 가 있으면 지연시간 지표를 기록하고 요청한 경우 caption 에 수신/추론/송신 시각을 실음
     """
-    if not isinstance(frames, list):
-        return [[0.0, 0.0] for _ in range(21)] * 10
-
-    T = len(frames)
-    if T == 10:
-        return [_to_xy21(f) for f in frames]
-
-    if T > 10:
-        idxs = np.linspace(0, T - 1, 10).round().astype(int).tolist()
-        return [_to_xy21(frames[i]) for i in idxs]
+    try:
+        decision = gate.check(frames) if gate is not None else None
+        if decision == ABSENT:
+            if gate.hand_lost:
+                _clear_caption(room_id, corr_id)
+            return
+        if decision == STILL:
+            res = gate.last_result
+        else:
+            with message_stage.labels("inference", mtype).time():
+                res = await scheduler.submit(frames, variant=registry.for_room(room_id))
+            if gate is not None:
+                gate.remember(frames, res)
+
+        t0 = time.perf_counter()
+        label, score = res.label, res.score
+        if CAPTION_SMOOTHING and res.probs is not None:
+            smoothed = room_smoothing.update(room_id, res.probs, res.label_of)
+            if smoothed is None:
+                return
+            label, score = smoothed
+
+        # 프런트가 구독하는 타입으로 통일: caption
+        caption = Caption(
+            text=str(label),             # 빈 문자열이면 표시 안 함 (프런트 정책)
+            confidence=float(score),
+            corr_id=corr_id or None,
+            candidates=([{"text": t, "confidence": c} for t, c in res.top_labels(CAPTION_TOPK)]
+                        if CAPTION_TOPK else None),
+            # 추론 없이 재사용한 결과면 추론 시각은 빼고 기록
+            trace=trace.finish(mtype, None if decision == STILL else res) if trace is not None else None,
+        )
+        t1 = time.perf_counter()
+        hub.broadcast(room_id, caption.encode(), role="client", droppable=True)
+        message_stage.labels("postprocess", mtype).observe(t1 - t0)
+        message_stage.labels("fanout", mtype).observe(time.perf_counter() - t1)
+    except Exception:
+        logger.exception("infer_error (%s)", error_message)
+        hub.send_json(websocket, {
+            "type": "error",
+            "message": error_message
+        })
+
+
+def _clear_caption(room_id, corr_id=None):
+    """
+    손이 화면에서 사라짐 → 방의 스무딩 상태를 버리고 빈 자막을 한 번 보내 마지막 자막을 지움
+    (버려지면 이전 자막이 계속 남으므로 droppable 아님)
+    """
+    room_smoothing.discard(room_id)
+    caption = Caption(text="", confidence=0.0, corr_id=corr_id or None)
+    hub.broadcast(room_id, caption.encode(), role="client")
 
-    base = [_to_xy21(f) for f in frames]
-    last = base[-1] if base else [[0.0, 0.0] for _ in range(21)]
-    base += [last] * (10 - len(base))
-    return base
 
-def _select_primary_hand(hands):
+async def _push_frames(websocket, room_id, window, frames, corr_id=None, gate=None, trace=None):
     """
-    hands: List[Hand]; Hand = 21 포인트
-    '화면 왼쪽(평균 x 작음)' 손을 대표로 선택
+    단일 프레임(들)을 연결의 슬라이딩 윈도우에 쌓고 stride 마다 윈도우 전체로 추론
+    SEQUENCE_WINDOW=0 이면 기존처럼 마지막 프레임을 10번 타일링해서 추론
     """
-    if not hands:
-        return [[0.0, 0.0] for _ in range(21)]
-    hands_xy = [_to_xy21(h) for h in hands]
-    avg_x = [float(np.mean([p[0] for p in h])) for h in hands_xy]
-    idx = int(np.argmin(avg_x))
-    return hands_xy[idx]
-# ------------------------------------------------------------------------
+    if window is None:
+        tiled = np.repeat(np.asarray(frames[-1], dtype=np.float32)[None], 10, axis=0)
+        await _caption_from_frames(websocket, room_id, tiled, corr_id,
+                                   "single_frame_inference_failed", gate, "hand_landmarks", trace)
+        return
+    due = False
+    for f in frames:
+        due = window.push(f) or due
+    if due:
+        await _caption_from_frames(websocket, room_id, window.snapshot(), corr_id,
+                                   "single_frame_inference_failed", gate, "hand_landmarks", trace)
+
+
+async def _handle_binary(websocket, buf, window, gate=None, recv_ms=None):
+    """바이너리 랜드마크 프레임 → np.frombuffer 로 바로 매핑해서 추론 (메시지 타입 반환, 지표용)"""
+    t0 = time.perf_counter()
+    recv_ms = recv_ms or now_ms()
+    try:
+        frame = wire.decode(buf)
+    except wire.WireError as e:
+        hub.send_json(websocket, {
+            "type": "error",
+            "message": f"bad_binary_frame: {e}"
+        })
+        return "binary"
+    t1 = time.perf_counter()
+
+    room_id = frame.room or hub.room_of(websocket)
+    frames = _primary_hands_np(frame.landmarks)                     # (T,21,2)
+    if frame.type != "hand_landmarks":
+        frames = _ensure_10_frames_np(frames)
+    message_stage.labels("parse", frame.type).observe(t1 - t0)
+    message_stage.labels("normalize", frame.type).observe(time.perf_counter() - t1)
+    room_stats.count(room_id, f"bin_{frame.type}")
+    room_stats.count(room_id, "frames", len(frame.landmarks))
+    trace = Trace(recv_ms, frame.corr_id, frame.capture_ts)
+    if frame.type == "hand_landmarks":
+        await _push_frames(websocket, room_id, window, frames, frame.corr_id, gate, trace)
+    else:
+        await _caption_from_frames(websocket, room_id, frames, frame.corr_id,
+                                   "sequence_inference_failed", gate, frame.type, trace)
+    return frame.type
 
 
 @router.websocket("/ai")
 async def websocket_endpoint(
     websocket: WebSocket,
     role: str = Query(...),
-    room: str = Query(default="")
+    room: str = Query(default=""),
+    wire_format: str = Query(default="json", alias="wire"),
+    capacity: int = Query(default=0),  # AI 워커: 동시에 맡을 방 수 (0 = AI_WORKER_MAX_ROOMS)
 ):
     await websocket.accept()
-    await hub.add(websocket, role=role, room=room)
-    logger.info("연결됨 role=%s room=%s", role, room or "(없음)")
+    ws_active_connections.inc()
+    binary_wire = (wire_format == "binary")  # ?wire=binary 또는 hello 메시지로 협상
+    window = FrameWindow() if SEQUENCE_WINDOW else None  # hand_landmarks 용 연결별 슬라이딩 윈도우
+    gate = MotionGate() if MOTION_GATE else None         # 손 없음/정지 시 추론 생략
 
     try:
+        # add 가 중간에 실패해도 아래 finally 의 remove 가 meta/송신 task 를 정리
+        await hub.add(websocket, role=role, room=room, capacity=capacity or None)
+        logger.info("연결됨 role=%s room=%s", role, room or "(없음)")
         while True:
-            message = await websocket.receive_text()
-            logger.info("프런트에서 수신(raw): %s", message[:200])
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
 
-            # JSON 파싱 실패 → 동일 방 브로드캐스트(기존 유지)
+            started, recv_ms = time.perf_counter(), now_ms()
+            mtype = "binary" if frame.get("bytes") is not None else "raw"  # JSON 이면 파싱 후 메시지 타입
             try:
-                data = json.loads(message)
-                if isinstance(data, list):
-                    data = {"type": "hand_landmarks", "landmarks": data}
-            except Exception:
-                room_id = hub.room_of(websocket)
-                for client in list(hub.in_room(room_id)):
-                    if client is not websocket:
-                        await client.send_text(message)
-                continue
-
-            mtype = data.get("type")
-            room_id = data.get("room_id") or hub.room_of(websocket)
-
-            # --- 좌표 수신 ACK/디버그 캡션 -----------------------------------
-            if mtype == "coords":
-                hands = data.get("hands", [])
-                corr_id = data.get("corr_id")
-                try:
-                    points_count = sum(len(h) for h in hands) if isinstance(hands, list) else 0
-                except Exception:
-                    points_count = 0
-
-                ack = {
-                    "type": "coords_ack",
-                    "corr_id": corr_id,
-                    "hands": len(hands) if isinstance(hands, list) else 0,
-                    "count": points_count,
-                }
-                await websocket.send_text(json.dumps(ack, ensure_ascii=False))
-
-                caption = {
-                    "type": "caption",
-                    "text": f"좌표 수신: hands={ack['hands']}, points={ack['count']}",
-                    "corr_id": corr_id
-                }
-                for client in list(hub.by_role_in_room("client", room_id)):
-                    await client.send_text(json.dumps(caption, ensure_ascii=False))
-                continue
-            # ----------------------------------------------------------------
-
-            # --- 단일 프레임 ------------------------------------------------
-            if mtype == "hand_landmarks":
-                try:
-                    from . import main
-                    lm = data.get("landmarks")
-
-                    # lm이 "하나의 손"인지, "여러 손"인지 판별
-                    primary_21x2 = None
-                    if isinstance(lm, list) and lm:
-                        if _is_point(lm[0]):
-                            # 예: [ {x,y}, ... x21 ] 형태
-                            primary_21x2 = _to_xy21(lm)
-                        else:
-                            # 예: [ [ {x,y}x21 ], [ {x,y}x21 ] , ... ]
-                            primary_21x2 = _select_primary_hand(lm)
+                if frame.get("bytes") is not None:
+                    if binary_wire:
+                        mtype = await _handle_binary(websocket, frame["bytes"], window, gate, recv_ms)
                     else:
-                        primary_21x2 = [[0.0, 0.0] for _ in range(21)]
-
-                    label, score = main.predict_from_single_frame(primary_21x2)
+                        hub.send_json(websocket, {
+                            "type": "error",
+                            "message": "binary_wire_not_negotiated"
+                        })
+                    continue
 
-                    # 프런트가 구독하는 타입으로 통일: caption
-                    result = {
-                        "type": "caption",
-                        "text": str(label),          # 빈 문자열이면 표시 안 함 (프런트 정책)
-                        "confidence": float(score)
-                    }
-                    payload = json.dumps(result, ensure_ascii=False)
-                    for client in list(hub.by_role_in_room("client", room_id)):
-                        await client.send_text(payload)
-
-                except Exception:
-                    logger.exception("infer_error (single frame)")
-                    await websocket.send_text(json.dumps({
-                        "type": "error",
-                        "message": "single_frame_inference_failed"
-                    }, ensure_ascii=False))
-                continue
+                message = frame.get("text") or ""
+                payload_sampler.log(logger, role, room, message)  # DEBUG 일 때만, 샘플링 + 초당 상한
 
-            # --- 시퀀스(길이 보정) -----------------------------------------
-            if mtype == "hand_landmarks_sequence":
+                # JSON 파싱 실패 → 동일 방 브로드캐스트(기존 유지)
                 try:
-                    from . import main
-                    frame_sequence = data.get("frame_sequence")
-                    frames10 = _ensure_10_frames(frame_sequence)
-                    logger.info("sequence frames: raw=%d used=%d",
-                                len(frame_sequence) if frame_sequence else 0, len(frames10))
-
-                    label, score = main.predict_from_sequence(frames10)
-
-                    result = {
-                        "type": "caption",           # <-- subtitle 대신 caption으로 통일
-                        "text": str(label),
-                        "confidence": float(score)
-                    }
-                    payload = json.dumps(result, ensure_ascii=False)
-                    for client in list(hub.by_role_in_room("client", room_id)):
-                        await client.send_text(payload)
-
+                    data = codec.loads(message)
+                    if isinstance(data, list):
+                        data = {"type": "hand_landmarks", "landmarks": data}
+                    elif not isinstance(data, dict):
+                        raise ValueError("not a JSON object")
                 except Exception:
-                    logger.exception("sequence_infer_error")
-                    await websocket.send_text(json.dumps({
+                    room_id = hub.room_of(websocket)
+                    room_stats.count(room_id, "raw")
+                    hub.broadcast(room_id, message, exclude=websocket)
+                    continue
+
+                mtype = data.get("type")
+                room_id = data.get("room_id")
+                if not room_id or not isinstance(room_id, str):  # 문자열이 아니면 연결의 방
+                    room_id = hub.room_of(websocket)
+                room_stats.count(room_id, mtype or "untyped")  # 메시지마다 로그 대신 방별로 모아 주기적으로 한 줄
+                parsed = time.perf_counter()
+                message_stage.labels("parse", type_label(mtype)).observe(parsed - started)
+
+                # 랜드마크/좌표 메시지는 스키마로 파싱 (랜드마크는 바로 float32 배열)
+                try:
+                    msg = codec.parse_message(data)
+                    if isinstance(msg, HandLandmarksSequence):
+                        frames10 = _ensure_10_frames_np(msg.frames)
+                    if msg is not None:
+                        message_stage.labels("normalize", mtype).observe(time.perf_counter() - parsed)
+                except (TypeError, ValueError, IndexError, KeyError, AttributeError):
+                    logger.exception("bad landmark payload (%s)", mtype)
+                    hub.send_json(websocket, {
                         "type": "error",
-                        "message": "sequence_inference_failed"
-                    }, ensure_ascii=False))
-                continue
-
-            # --- 연결 테스트 -----------------------------------------------
-            if mtype == "connection_test":
-                await websocket.send_text(json.dumps({
-                    "type": "connection_test_response",
-                    "message": "백엔드 연결 확인됨"
-                }, ensure_ascii=False))
-                continue
-
-            # --- 그 외는 브로드캐스트 --------------------------------------
-            # (추가) 자막 이벤트 타입을 caption으로 강제 통일
-            if data.get("type") == "subtitle":
-                data["type"] = "caption"
-
-            payload = json.dumps(data, ensure_ascii=False)
-            for client in list(hub.in_room(room_id)):
-                if client is not websocket:
-                    await client.send_text(payload)
+                        "message": ("sequence_inference_failed" if mtype == "hand_landmarks_sequence"
+                                    else "single_frame_inference_failed")
+                    })
+                    continue
+
+                # --- 좌표 수신 ACK/디버그 캡션 -----------------------------------
+                if isinstance(msg, Coords):
+                    hub.send_json(websocket, {
+                        "type": "coords_ack",
+                        "corr_id": msg.corr_id,
+                        "hands": msg.hands,
+                        "count": msg.count,
+                    })
+                    caption = Caption(text=f"좌표 수신: hands={msg.hands}, points={msg.count}", corr_id=msg.corr_id)
+                    hub.broadcast(room_id, caption.encode(), role="client", droppable=True)
+                    continue
+                # ----------------------------------------------------------------
+
+                # --- 바이너리 프레임 협상 --------------------------------------
+                if mtype == "hello":
+                    binary_wire = (data.get("wire") == "binary")
+                    hub.send_json(websocket, {
+                        "type": "hello_ack",
+                        "wire": "binary" if binary_wire else "json",
+                        "version": wire.VERSION
+                    })
+                    continue
+
+                # --- 단일 프레임 ------------------------------------------------
+                if isinstance(msg, HandLandmarks):
+                    # 손 하나 [ {x,y}x21 ] 또는 여러 손 [ [ {x,y}x21 ], ... ] → 대표 손 (21,2)
+                    # 윈도우에 쌓고 stride 마다 다른 방 요청과 함께 배치 추론
+                    room_stats.count(room_id, "frames")
+                    await _push_frames(websocket, room_id, window, msg.frame[None], msg.corr_id, gate,
+                                       Trace(recv_ms, msg.corr_id, msg.capture_ts))
+                    continue
+
+                # --- 시퀀스(길이 보정) -----------------------------------------
+                if isinstance(msg, HandLandmarksSequence):
+                    room_stats.count(room_id, "frames", len(msg.frames))
+
+                    await _caption_from_frames(websocket, room_id, frames10, msg.corr_id,
+                                               error_message="sequence_inference_failed", gate=gate, mtype=mtype,
+                                               trace=Trace(recv_ms, msg.corr_id, msg.capture_ts))
+                    continue
+
+                # --- AI 워커 부하 보고 (방 배정에 사용) ---------------------------
+                if mtype == "worker_status":
+                    if role == "ai":
+                        try:
+                            await hub.update_worker(websocket,
+                                                    max_rooms=data.get("max_rooms"),
+                                                    inflight=data.get("inflight"),
+                                                    p95_ms=data.get("p95_ms"))
+                        except (TypeError, ValueError):
+                            hub.send_json(websocket, {"type": "error", "message": "bad_worker_status"})
+                    continue
+
+                # --- 연결 테스트 -----------------------------------------------
+                if mtype == "connection_test":
+                    hub.send_json(websocket, {
+                        "type": "connection_test_response",
+                        "message": "백엔드 연결 확인됨"
+                    })
+                    continue
+
+                # --- 그 외는 브로드캐스트 --------------------------------------
+                # (추가) 자막 이벤트 타입을 caption으로 강제 통일 → 바뀐 경우에만 다시 직렬화
+                if mtype == "subtitle":
+                    data["type"] = "caption"
+                    hub.broadcast_json(room_id, data, exclude=websocket, droppable=True)
+                else:
+                    hub.broadcast(room_id, message, exclude=websocket)  # 수정할 게 없으면 원문 그대로
+            finally:
+                ws_message_latency.labels(type_label(mtype)).observe(time.perf_counter() - started)
 
 
     except (WebSocketDisconnect, asyncio.TimeoutError):
         pass
     finally:
+        ws_active_connections.dec()
         await hub.remove(websocket)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from .config import WINDOW_STRIDE
+
+
+class FrameWindow:
+    """
+    연결별 슬라이딩 윈도우: 미리 할당한 (size,21,2) 링버퍼에 단일 프레임을 쌓고
+    stride 프레임마다 최근 size 프레임(시간순)으로 추론하도록 알려줌
+    """
+
+    def __init__(self, size: int = 10, stride: int = WINDOW_STRIDE) -> None:
+        self.size = size
+        self.stride = max(1, int(stride))
+        self._buf = np.zeros((size, 21, 2), dtype=np.float32)
+        self._head = 0      # 다음에 쓸 위치
+        self.count = 0      # 지금까지 받은 프레임 수
+        self._since = 0     # 마지막 추론 이후 받은 프레임 수
+
+    def push(self, frame_21x2) -> bool:
+        """프레임 하나 추가, 이번에 추론해야 하면 True"""
+        self._buf[self._head] = frame_21x2
+        self._head = (self._head + 1) % self.size
+        self.count += 1
+        self._since += 1
+        if self._since >= self.stride:
+            self._since = 0
+            return True
+        return False
+
+    def snapshot(self) -> np.ndarray:
+        """
+        현재 윈도우 (size,21,2) 복사본 (오래된 프레임 → 최근 프레임)
+        아직 size 프레임이 안 찼으면 _ensure_10_frames_np 처럼 마지막 프레임을 반복
+        """
+        if self.count >= self.size:
+            return np.concatenate([self._buf[self._head:], self._buf[:self._head]], axis=0)
+        filled = self._buf[:self.count]
+        return np.concatenate([filled, np.repeat(filled[-1:], self.size - self.count, axis=0)], axis=0)
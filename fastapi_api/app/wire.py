@@ -0,0 +1,101 @@
+import math
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# ---- /ai 바이너리 랜드마크 프레임 -------------------------------------------
+# [헤더 14B|22B][room utf-8][0 패딩 → 4바이트 정렬][float32 LE (T,hands,21,dims)]
+#
+#   magic      2s  b"SL"
+#   version    u8  1 | 2
+#   type       u8  1=hand_landmarks, 2=hand_landmarks_sequence
+#   T          u16 프레임 수
+#   hands      u8  프레임당 손 개수
+#   dims       u8  2(x,y) | 3(x,y,z)
+#   corr_id    u32 클라이언트 상관관계 ID (0 = 없음)
+#   room_len   u16 room 문자열 바이트 수 (0 = 연결의 room 사용)
+#   capture_ts f64 (v2 만) 마지막 프레임 촬영 시각, epoch ms (NaN = 없음)
+HEADER = struct.Struct("<2sBBHBBIH")      # v1
+HEADER_V2 = struct.Struct("<2sBBHBBIHd")  # v2 = v1 + capture_ts
+MAGIC = b"SL"
+VERSION = 2  # 서버가 읽을 수 있는 최신 버전 (v1 도 계속 받음)
+_HEADERS = {1: HEADER, 2: HEADER_V2}
+
+MSG_TYPES = {1: "hand_landmarks", 2: "hand_landmarks_sequence"}
+MSG_CODES = {v: k for k, v in MSG_TYPES.items()}
+
+MAX_FRAMES = 300  # 10초 @30fps
+MAX_HANDS = 4
+
+
+class WireError(ValueError):
+    """형식이 잘못된 바이너리 프레임"""
+
+
+@dataclass
+class LandmarkFrame:
+    type: str
+    corr_id: int
+    room: str
+    landmarks: np.ndarray  # (T,hands,21,dims) float32, 수신 버퍼를 그대로 참조 (읽기 전용)
+    capture_ts: Optional[float] = None  # 촬영 시각 epoch ms (v2)
+
+
+def _payload_offset(header_size: int, room_len: int) -> int:
+    return (header_size + room_len + 3) & ~3
+
+
+def decode(buf: bytes) -> LandmarkFrame:
+    """바이너리 프레임 → LandmarkFrame (좌표는 np.frombuffer 로 복사 없이 매핑)"""
+    if len(buf) < HEADER.size:
+        raise WireError("frame too short")
+    magic, version, code, t, hands, dims, corr_id, room_len = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise WireError("bad magic")
+    header = _HEADERS.get(version)
+    if header is None:
+        raise WireError(f"unsupported version {version}")
+    capture_ts = None
+    if version >= 2:
+        if len(buf) < header.size:
+            raise WireError("frame too short")
+        capture_ts = header.unpack_from(buf)[8]
+        if math.isnan(capture_ts):
+            capture_ts = None
+    if code not in MSG_TYPES:
+        raise WireError(f"unknown message type {code}")
+    if dims not in (2, 3) or not (0 < t <= MAX_FRAMES) or not (0 <= hands <= MAX_HANDS):
+        raise WireError(f"bad shape T={t} hands={hands} dims={dims}")
+
+    try:
+        room = bytes(buf[header.size:header.size + room_len]).decode("utf-8")
+    except UnicodeDecodeError:
+        raise WireError("room is not utf-8")
+    offset = _payload_offset(header.size, room_len)
+    count = t * hands * 21 * dims
+    if len(buf) != offset + count * 4:
+        raise WireError(f"payload size mismatch: got={len(buf) - offset} expected={count * 4}")
+
+    arr = np.frombuffer(buf, dtype="<f4", count=count, offset=offset).reshape(t, hands, 21, dims)
+    return LandmarkFrame(type=MSG_TYPES[code], corr_id=corr_id, room=room, landmarks=arr, capture_ts=capture_ts)
+
+
+def encode(mtype: str, landmarks: np.ndarray, *, corr_id: int = 0, room: str = "",
+           capture_ts: Optional[float] = None) -> bytes:
+    """
+    (T,hands,21,dims) 좌표 → 바이너리 프레임 (클라이언트/부하 테스트용)
+    capture_ts 가 있으면 v2, 없으면 v1 헤더 (v1 만 아는 서버와도 호환)
+    """
+    arr = np.ascontiguousarray(landmarks, dtype="<f4")
+    if arr.ndim != 4 or arr.shape[2] != 21 or arr.shape[3] not in (2, 3):
+        raise WireError(f"landmarks must be (T,hands,21,2|3), got {arr.shape}")
+    room_b = room.encode("utf-8")
+    t, hands, _, dims = arr.shape
+    if capture_ts is None:
+        header = HEADER.pack(MAGIC, 1, MSG_CODES[mtype], t, hands, dims, corr_id, len(room_b))
+    else:
+        header = HEADER_V2.pack(MAGIC, 2, MSG_CODES[mtype], t, hands, dims, corr_id, len(room_b), capture_ts)
+    pad = b"\0" * (_payload_offset(len(header), len(room_b)) - len(header) - len(room_b))
+    return header + room_b + pad + arr.tobytes()
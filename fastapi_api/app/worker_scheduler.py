@@ -0,0 +1,118 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Generic, Hashable, List, Optional, Set, TypeVar
+
+from .config import AI_WORKER_MAX_ROOMS
+
+W = TypeVar("W", bound=Hashable)
+
+# 부하 점수 가중치: 방 점유율(0~1)이 기본, 진행 중 추론 수와 최근 p95 지연으로 보정
+INFLIGHT_WEIGHT = 0.05   # 진행 중 추론 1건
+LATENCY_WEIGHT = 1.0     # p95 1초
+
+
+@dataclass
+class WorkerLoad:
+    """AI 워커 하나가 광고한 용량과 현재 부하"""
+    max_rooms: int = AI_WORKER_MAX_ROOMS
+    inflight: int = 0
+    p95_ms: float = 0.0
+    rooms: Set[str] = field(default_factory=set)
+
+    @property
+    def has_capacity(self) -> bool:
+        return len(self.rooms) < self.max_rooms
+
+    @property
+    def score(self) -> float:
+        """낮을수록 한가한 워커"""
+        util = len(self.rooms) / max(1, self.max_rooms)
+        return util + INFLIGHT_WEIGHT * self.inflight + LATENCY_WEIGHT * self.p95_ms / 1000.0
+
+
+class WorkerScheduler(Generic[W]):
+    """
+    AI 워커 ↔ 방 배정 (기존 ai_pool set.pop() 대체)
+    - 워커는 max_rooms / inflight / p95_ms 를 광고하고, 한 워커가 여러 방을 맡을 수 있음
+    - 새 방은 여유가 있는 워커 중 부하 점수가 가장 낮은 워커에 배정
+    - 배정할 워커가 없으면 대기열에 두었다가 용량이 생기면 순서대로 배정
+    """
+
+    def __init__(self) -> None:
+        self.workers: Dict[W, WorkerLoad] = {}
+        self.room_worker: Dict[str, W] = {}
+        self.waiting: "OrderedDict[str, None]" = OrderedDict()  # 워커를 기다리는 방 (FIFO)
+
+    # ---- 워커 등록/상태 -------------------------------------------------------
+    def register(self, worker: W, *, max_rooms: Optional[int] = None) -> WorkerLoad:
+        load = self.workers.get(worker)
+        if load is None:
+            load = self.workers[worker] = WorkerLoad()
+        if max_rooms:
+            load.max_rooms = max(1, int(max_rooms))
+        return load
+
+    def update(self, worker: W, *, max_rooms: Optional[int] = None, inflight: Optional[int] = None,
+               p95_ms: Optional[float] = None) -> Optional[WorkerLoad]:
+        load = self.workers.get(worker)
+        if load is None:
+            return None
+        if max_rooms is not None:
+            load.max_rooms = max(1, int(max_rooms))
+        if inflight is not None:
+            load.inflight = max(0, int(inflight))
+        if p95_ms is not None:
+            load.p95_ms = max(0.0, float(p95_ms))
+        return load
+
+    def unregister(self, worker: W) -> List[str]:
+        """워커 제거 → 그 워커가 맡던 방 목록 (재배정 대상)"""
+        load = self.workers.pop(worker, None)
+        if load is None:
+            return []
+        for room in load.rooms:
+            self.room_worker.pop(room, None)
+        return sorted(load.rooms)
+
+    # ---- 방 배정 -----------------------------------------------------------
+    def worker_of(self, room: str) -> Optional[W]:
+        return self.room_worker.get(room)
+
+    def rooms_of(self, worker: W) -> Set[str]:
+        load = self.workers.get(worker)
+        return set(load.rooms) if load is not None else set()
+
+    def pick(self) -> Optional[W]:
+        candidates = [(load.score, i, w) for i, (w, load) in enumerate(self.workers.items()) if load.has_capacity]
+        return min(candidates)[2] if candidates else None
+
+    def assign(self, room: str, worker: Optional[W] = None) -> Optional[W]:
+        """room 에 워커 배정 (이미 있으면 그대로), 없으면 대기열에 넣고 None"""
+        current = self.room_worker.get(room)
+        if current is not None:
+            return current
+        worker = worker if worker is not None else self.pick()
+        if worker is None or worker not in self.workers:
+            self.waiting[room] = None
+            return None
+        self.workers[worker].rooms.add(room)
+        self.room_worker[room] = worker
+        self.waiting.pop(room, None)
+        return worker
+
+    def release(self, room: str) -> Optional[W]:
+        """room 종료 → 맡고 있던 워커 반환"""
+        self.waiting.pop(room, None)
+        worker = self.room_worker.pop(room, None)
+        if worker is not None:
+            self.workers[worker].rooms.discard(room)
+        return worker
+
+    def drain_waiting(self) -> List[str]:
+        """용량이 생긴 만큼 대기 중인 방을 꺼냄 (배정은 호출한 쪽에서)"""
+        rooms = []
+        free = sum(max(0, load.max_rooms - len(load.rooms)) for load in self.workers.values())
+        while self.waiting and len(rooms) < free:
+            room, _ = self.waiting.popitem(last=False)
+            rooms.append(room)
+        return rooms
@@ -0,0 +1,19 @@
+import json
+
+
+class FakeWebSocket:
+    """send_text 로 받은 메시지를 모아두는 테스트용 WebSocket"""
+
+    def __init__(self, name):
+        self.name = name
+        self.sent = []
+        self.close_code = None
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.close_code = code
@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from app import codec
+from app.codec import Caption, Coords, HandLandmarks, HandLandmarksSequence, parse_message
+
+
+def _hand(x0, dims=3):
+    """21개 점, x 는 x0 부터 증가"""
+    return [[x0 + i * 0.01, 0.5 + i * 0.01, 0.0][:dims] for i in range(21)]
+
+
+class CodecTest(unittest.TestCase):
+    def test_backends_round_trip_same_text(self):
+        obj = {"type": "caption", "text": "안녕하세요", "confidence": 0.75, "corr_id": "c1"}
+        std = codec.StdlibCodec.dumps(obj)
+        self.assertEqual(codec.StdlibCodec.loads(std), obj)
+        if codec.orjson is not None:
+            fast = codec.OrjsonCodec.dumps(obj)
+            self.assertIsInstance(fast, str)  # 텍스트 프레임으로 나가야 함
+            self.assertIn("안녕하세요", fast)
+            self.assertEqual(codec.OrjsonCodec.loads(fast), obj)
+            self.assertEqual(codec.OrjsonCodec.dumps({"c": np.float32(0.5)}), '{"c":0.5}')
+
+    def test_landmark_formats_parse_to_same_array(self):
+        hand = _hand(0.2)
+        as_dicts = [{"x": p[0], "y": p[1], "z": p[2]} for p in hand]
+        a = parse_message({"type": "hand_landmarks", "landmarks": hand, "corr_id": "k"})
+        b = parse_message({"type": "hand_landmarks", "landmarks": as_dicts})
+        self.assertIsInstance(a, HandLandmarks)
+        self.assertEqual(a.frame.shape, (21, 2))
+        self.assertEqual(a.frame.dtype, np.float32)
+        np.testing.assert_array_equal(a.frame, b.frame)
+        self.assertEqual(a.corr_id, "k")
+
+        # 여러 손 → 평균 x 가 가장 작은 손, 모자란 점은 0 채움
+        two = parse_message({"type": "hand_landmarks", "landmarks": [_hand(0.6), _hand(0.1, dims=2)[:15]]})
+        np.testing.assert_allclose(two.frame[:15], np.asarray(_hand(0.1, dims=2)[:15], np.float32))
+        self.assertTrue(np.all(two.frame[15:] == 0))
+
+        empty = parse_message({"type": "hand_landmarks", "landmarks": []})
+        self.assertTrue(np.all(empty.frame == 0))
+
+    def test_mixed_point_types_are_rejected(self):
+        """{x,y} 객체와 [x,y]/숫자가 섞인 손은 ValueError (AttributeError 가 새어 나가지 않음)"""
+        point = {"x": 0.1, "y": 0.2}
+        for hand in ([point, [0.3, 0.4]], [point, 5], [[0.3, 0.4], point]):
+            with self.assertRaises(ValueError):
+                codec.hand_xy21(hand)
+            with self.assertRaises(ValueError):
+                parse_message({"type": "hand_landmarks_sequence", "frame_sequence": [hand]})
+
+    def test_sequence_coords_and_caption(self):
+        seq = parse_message({"type": "hand_landmarks_sequence", "frame_sequence": [_hand(0.1), [], _hand(0.3)]})
+        self.assertIsInstance(seq, HandLandmarksSequence)
+        self.assertEqual(seq.frames.shape, (3, 21, 2))
+        self.assertTrue(np.all(seq.frames[1] == 0))
+
+        coords = parse_message({"type": "coords", "hands": [_hand(0.1), _hand(0.2)], "corr_id": "c"})
+        self.assertEqual(coords, Coords(hands=2, count=42, corr_id="c"))
+        self.assertIsNone(parse_message({"type": "subtitle", "text": "x"}))
+
+        self.assertEqual(codec.loads(Caption("가", 0.5, corr_id="c").encode()),
+                         {"type": "caption", "text": "가", "confidence": 0.5, "corr_id": "c"})
+        self.assertEqual(Caption("x").to_dict(), {"type": "caption", "text": "x"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from app.features import FEATURE_DIM, frames_to_feats_55
+
+
+# ---- 기준값: 학습 코드(AI_Language Sign_Language_Translation/modules/utils.py) 원본 그대로 ----
+# AI_Language 는 이 저장소/CI 에 없으므로 비교 기준을 테스트에 복사해 둠 (수정하지 말 것)
+def Vector_Normalization(joint):
+    # Compute angles between joints
+    v1 = joint[[0,1,2,3,0,5,6,7,0,9,10,11,0,13,14,15,0,17,18,19], :2] # Parent joint
+    v2 = joint[[1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20], :2] # Child joint
+    v = v2 - v1 
+    # Normalize v
+    v = v / np.linalg.norm(v, axis=1)[:, np.newaxis]
+
+    # Get angle using arcos of dot product
+    angle = np.arccos(np.einsum('nt,nt->n',
+        v[[0,1,2,4,5,6,8,9,10,12,13,14,16,17,18],:], 
+        v[[1,2,3,5,6,7,9,10,11,13,14,15,17,18,19],:])) 
+
+    angle = np.degrees(angle) # Convert radian to degree
+
+    angle_label = np.array([angle], dtype=np.float32)
+
+    return v, angle_label
+# ------------------------------------------------------------------------------------------
+
+
+def _reference_feats(frames_10x21x2):
+    """main._frames_to_feats_55 와 동일한 프레임 루프 (학습 경로)"""
+    feats = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for f in range(frames_10x21x2.shape[0]):
+            joint = np.zeros((42, 2), dtype=np.float32)
+            joint[:21, :] = frames_10x21x2[f]
+            vector, angle_label = Vector_Normalization(joint)
+            feats.append(np.concatenate([vector.flatten(), angle_label.flatten()]).astype(np.float32))
+    return np.stack(feats, axis=0)
+
+
+class VectorNormalizationEquivalenceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+
+    def assertMatchesReference(self, frames_Nx10x21x2):
+        got = frames_to_feats_55(frames_Nx10x21x2)
+        self.assertEqual(got.shape, (*frames_Nx10x21x2.shape[:-2], FEATURE_DIM))
+        self.assertEqual(got.dtype, np.float32)
+        for n in range(frames_Nx10x21x2.shape[0]):
+            np.testing.assert_allclose(got[n], _reference_feats(frames_Nx10x21x2[n]),
+                                       rtol=0, atol=1e-6, equal_nan=True)
+
+    def test_batch_matches_training_path(self):
+        """(N,10,21,2) 벡터화 결과가 프레임별 Vector_Normalization 결과와 동일"""
+        self.assertMatchesReference(self.rng.random((8, 10, 21, 2), dtype=np.float32))
+
+    def test_mirrored_and_missing_hands(self):
+        """미러링 좌표와 손이 없는(0) 프레임도 동일하게 처리 (NaN 위치 포함)"""
+        frames = self.rng.random((1, 10, 21, 2), dtype=np.float32)
+        frames[..., 0] = 1.0 - frames[..., 0]
+        frames[0, 3:5] = 0.0
+        self.assertMatchesReference(frames)
+
+    def test_degenerate_hands(self):
+        """길이 0 인 뼈(겹친 관절), 모든 점이 같은 손, 일직선/접힌 손가락"""
+        frames = self.rng.random((4, 10, 21, 2), dtype=np.float32)
+        frames[0, :, 2] = frames[0, :, 1]               # 관절 1,2 겹침 → 뼈 하나 길이 0
+        frames[0, :, 8] = frames[0, :, 0]               # 손끝이 손목과 같은 점
+        frames[1] = frames[1, :, :1]                    # 21점이 모두 같은 점
+        frames[2, :, :, 1] = 0.5                        # 모든 점이 한 직선 위 (각도 0/180)
+        frames[3, :, 7] = frames[3, :, 5]                # 손가락이 앞뒤로 접힘 (반대 방향 뼈)
+        self.assertMatchesReference(frames)
+
+
+class FramesToFeatsShapeTestCase(unittest.TestCase):
+    def test_rejects_wrong_joint_count(self):
+        """21개 관절이 아니면 ValueError"""
+        with self.assertRaises(ValueError):
+            frames_to_feats_55(np.zeros((10, 20, 2), dtype=np.float32))
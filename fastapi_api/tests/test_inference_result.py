@@ -0,0 +1,24 @@
+import unittest
+
+import numpy as np
+
+from app.inference_result import InferenceResult
+
+
+class InferenceResultTestCase(unittest.TestCase):
+    def setUp(self):
+        probs = np.array([0.05, 0.6, 0.1, 0.2, 0.05], dtype=np.float32)
+        self.res = InferenceResult(probs=probs, index=1, score=0.6, label="b",
+                                   label_of=lambda i: "abcde"[i])
+
+    def test_topk_is_sorted_by_score(self):
+        self.assertEqual([i for i, _ in self.res.topk(3)], [1, 3, 2])
+        self.assertAlmostEqual(self.res.topk(1)[0][1], 0.6, places=6)
+
+    def test_top_labels_and_k_larger_than_classes(self):
+        labels = self.res.top_labels(10)
+        self.assertEqual(len(labels), 5)
+        self.assertEqual([t for t, _ in labels[:3]], ["b", "d", "c"])
+
+    def test_failed_result_has_no_candidates(self):
+        self.assertEqual(InferenceResult.failed().topk(3), [])
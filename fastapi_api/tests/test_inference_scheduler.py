@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from app.inference_scheduler import InferenceScheduler
+
+
+class StubPredict:
+    """predict_batch 대역: 호출마다 (variant, frames 목록) 기록, 결과는 (variant, frames)"""
+
+    def __init__(self, error=None, gate=None):
+        self.calls = []
+        self.error = error
+        self.gate = gate                 # threading.Event: set 될 때까지 워커 스레드에서 대기
+        self.started = threading.Event()
+
+    def __call__(self, frames_list, variant):
+        self.calls.append((variant, list(frames_list)))
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return [(variant, f) for f in frames_list]
+
+
+class InferenceSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    def make(self, predict, **kwargs):
+        sched = InferenceScheduler(predict, **{"max_batch": 8, "max_wait_ms": 30, "workers": 1, **kwargs})
+        self.addAsyncCleanup(sched.close)
+        return sched
+
+    async def test_flushes_when_max_batch_reached(self):
+        """max_batch 개가 모이면 max_wait 를 기다리지 않고 바로 배치 실행"""
+        predict = StubPredict()
+        sched = self.make(predict, max_batch=3, max_wait_ms=10_000)
+        results = await asyncio.wait_for(asyncio.gather(*(sched.submit(i) for i in range(3))), 2)
+        self.assertEqual(results, [(None, 0), (None, 1), (None, 2)])
+        self.assertEqual(predict.calls, [(None, [0, 1, 2])])
+
+    async def test_flushes_after_max_wait(self):
+        """max_batch 에 못 미쳐도 첫 요청 후 max_wait 가 지나면 모인 것만 실행"""
+        predict = StubPredict()
+        sched = self.make(predict, max_batch=100, max_wait_ms=50)
+        t0 = time.monotonic()
+        results = await asyncio.wait_for(asyncio.gather(sched.submit("a"), sched.submit("b")), 2)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+        self.assertEqual(results, [(None, "a"), (None, "b")])
+        self.assertEqual(predict.calls, [(None, ["a", "b"])])
+
+    async def test_batch_never_mixes_variants(self):
+        """서로 다른 모델 슬롯 요청은 각자의 배치로 (같은 슬롯 안에서는 순서 유지)"""
+        predict = StubPredict()
+        sched = self.make(predict)
+        subs = [("s1", None), ("c1", "candidate"), ("s2", None), ("c2", "candidate"), ("s3", None)]
+        results = await asyncio.wait_for(asyncio.gather(*(sched.submit(f, variant=v) for f, v in subs)), 2)
+        self.assertEqual(results, [(v, f) for f, v in subs])
+        self.assertCountEqual(predict.calls, [(None, ["s1", "s2", "s3"]), ("candidate", ["c1", "c2"])])
+
+    async def test_cancelled_request_is_skipped(self):
+        """배치가 모이는 중에 취소된 요청은 빼고 나머지만 추론"""
+        predict = StubPredict()
+        sched = self.make(predict, max_wait_ms=50)
+        tasks = [asyncio.create_task(sched.submit(f)) for f in ("a", "b", "c")]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 2)
+        self.assertEqual(results[0], (None, "a"))
+        self.assertIsInstance(results[1], asyncio.CancelledError)
+        self.assertEqual(results[2], (None, "c"))
+        self.assertEqual(predict.calls, [(None, ["a", "c"])])
+
+    async def test_predict_error_reaches_every_waiter(self):
+        """배치 추론 예외는 그 배치를 기다리던 모든 요청에 전달, 스케줄러는 계속 동작"""
+        error = RuntimeError("boom")
+        predict = StubPredict(error=error)
+        sched = self.make(predict)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(sched.submit(i) for i in range(3)), return_exceptions=True), 2)
+        self.assertEqual(results, [error] * 3)
+
+        predict.error = None
+        self.assertEqual(await asyncio.wait_for(sched.submit("next"), 2), (None, "next"))
+
+    async def test_close_finishes_running_batch_and_cancels_queued(self):
+        """close(): 실행 중인 배치는 결과를 받고, 아직 큐에 있는 요청은 취소 (무한 대기 없음)"""
+        gate = threading.Event()
+        predict = StubPredict(gate=gate)
+        sched = self.make(predict, max_wait_ms=0)
+        running = asyncio.create_task(sched.submit("running"))
+        await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(None, predict.started.wait, 2), 2)
+        queued = asyncio.create_task(sched.submit("queued"))  # 워커 1개가 바쁨 → 큐에 남음
+        await asyncio.sleep(0.01)
+
+        closing = asyncio.create_task(sched.close())
+        await asyncio.sleep(0.01)
+        self.assertFalse(closing.done())  # 실행 중인 배치를 기다리는 중
+        gate.set()
+        await asyncio.wait_for(closing, 2)
+
+        self.assertEqual(await running, (None, "running"))
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+        self.assertEqual(predict.calls, [(None, ["running"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import queue
+import unittest
+from unittest import mock
+
+import numpy as np
+from prometheus_client import REGISTRY
+
+from app.interpreter_pool import InterpreterPool, PooledInterpreter
+from tests import tiny_models
+from tests.tiny_models import NUM_CLASSES, reference_probs
+
+
+def _gauge(name, pool):
+    return REGISTRY.get_sample_value(name, {"pool": pool})
+
+
+@unittest.skipIf(tiny_models.tf is None, "tensorflow not installed (tiny model cannot be built)")
+class PooledInterpreterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(5)
+
+    def load(self, int8=False):
+        with open(tiny_models.tiny_model_path(int8), "rb") as f:
+            return PooledInterpreter(f.read(), 1)
+
+    def test_batch_resize_only_when_size_changes(self):
+        """배치 크기가 바뀔 때만 resize, 한 번의 invoke 로 (N,C)"""
+        item = self.load()
+        self.assertEqual(item.batch_size, 1)
+        with mock.patch.object(item.interpreter, "resize_tensor_input",
+                               wraps=item.interpreter.resize_tensor_input) as resize:
+            for n in (5, 5, 2):
+                x = self.rng.random((n, 10, 55), dtype=np.float32)
+                y = item.infer_batch(x)
+                self.assertEqual(y.shape, (n, NUM_CLASSES))
+                np.testing.assert_allclose(y, reference_probs(x), atol=1e-5)
+        self.assertEqual([c.args[1][0] for c in resize.call_args_list], [5, 2])
+        self.assertEqual(item.batch_size, 2)
+        self.assertTrue(item.batch_supported)
+
+    def test_falls_back_to_per_row_when_resize_fails(self):
+        """resize 를 못 하는 모델이면 행 단위로 나눠 추론하고 이후에는 resize 를 시도하지 않음"""
+        item = self.load()
+        x = self.rng.random((3, 10, 55), dtype=np.float32)
+        with mock.patch.object(item.interpreter, "resize_tensor_input", side_effect=ValueError("fixed batch")) as resize, \
+                mock.patch.object(item.interpreter, "invoke", wraps=item.interpreter.invoke) as invoke:
+            y = item.infer_batch(x)
+            np.testing.assert_allclose(y, reference_probs(x), atol=1e-5)
+            self.assertFalse(item.batch_supported)
+            self.assertEqual(invoke.call_count, 3)
+
+            item.infer_batch(x[:2])
+        self.assertEqual(resize.call_count, 1)
+        self.assertEqual(invoke.call_count, 5)
+
+    def test_int8_io_is_quantized(self):
+        """정수 입출력 모델: 입력은 scale/zero_point 로 양자화(범위 밖은 clip), 출력은 float 확률로 복원"""
+        item = self.load(int8=True)
+        det = item.in_det[0]
+        self.assertEqual(det["dtype"], np.int8)
+        scale, zero = det["quantization"]
+
+        x = self.rng.random((4, 10, 55), dtype=np.float32)
+        x[0, 0, :3] = [-1.0, 5.0, 1.0]  # 대표 입력 범위 [0,1) 밖의 값
+        with mock.patch.object(item.interpreter, "set_tensor", wraps=item.interpreter.set_tensor) as set_tensor:
+            y = item.infer_batch(x)
+        sent = set_tensor.call_args.args[1]
+        self.assertEqual(sent.dtype, np.int8)
+        np.testing.assert_array_equal(sent, np.clip(np.round(x / scale) + zero, -128, 127).astype(np.int8))
+        self.assertEqual(sent[0, 0, :2].tolist(), [-128, 127])
+
+        self.assertEqual(y.dtype, np.float32)
+        np.testing.assert_allclose(y, reference_probs(np.clip(x, 0.0, 1.0)), atol=0.02)
+
+
+@unittest.skipIf(tiny_models.tf is None, "tensorflow not installed (tiny model cannot be built)")
+class InterpreterPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pool = InterpreterPool(tiny_models.tiny_model_path(), size=2, num_threads=1, name="test_pool")
+        self.addCleanup(self.pool.close)
+
+    def test_checkout_and_return(self):
+        """size 개까지 서로 다른 Interpreter 를 빌려주고, 모두 빌려가면 반납될 때까지 대기 (최근 반납한 것부터)"""
+        self.assertEqual(_gauge("ai_interpreter_pool_size", "test_pool"), 2)
+        with self.pool.acquire() as a:
+            with self.pool.acquire() as b:
+                self.assertIsNot(a, b)
+                self.assertEqual(self.pool.in_use, 2)
+                self.assertEqual(_gauge("ai_interpreter_pool_in_use", "test_pool"), 2)
+                with self.assertRaises(queue.Empty):
+                    with self.pool.acquire(timeout=0.05):
+                        pass
+            with self.pool.acquire() as c:
+                self.assertIs(c, b)
+        self.assertEqual(self.pool.in_use, 0)
+        self.assertEqual(_gauge("ai_interpreter_pool_in_use", "test_pool"), 0)
+
+    def test_returned_even_when_inference_fails(self):
+        """추론 중 예외가 나도 Interpreter 는 풀로 반납"""
+        with self.assertRaises(ValueError):
+            self.pool.infer_batch(np.zeros((1, 10, 54), np.float32))
+        self.assertEqual(self.pool.in_use, 0)
+        y = self.pool.infer_batch(np.zeros((3, 10, 55), np.float32))
+        self.assertEqual(y.shape, (3, NUM_CLASSES))
+
+    def test_rename_and_close_move_gauges(self):
+        """rename 은 pool 라벨을 옮기고, close 는 이 풀의 몫을 뺌"""
+        self.pool.rename("test_pool_renamed")
+        self.assertEqual(_gauge("ai_interpreter_pool_size", "test_pool"), 0)
+        self.assertEqual(_gauge("ai_interpreter_pool_size", "test_pool_renamed"), 2)
+        self.pool.close()
+        self.pool.close()
+        self.assertEqual(_gauge("ai_interpreter_pool_size", "test_pool_renamed"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
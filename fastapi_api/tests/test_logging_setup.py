@@ -0,0 +1,41 @@
+import logging
+import unittest
+
+from app.logging_setup import PayloadSampler, RoomStats
+
+
+class LoggingSetupTest(unittest.TestCase):
+    def test_room_stats_aggregate_and_reset_on_flush(self):
+        stats = RoomStats(interval_s=0)
+        for _ in range(30):
+            stats.count("r1", "hand_landmarks")
+            stats.count("r1", "frames")
+        stats.count("r2", "frames", 14)
+        stats.count(None, "raw")
+        with self.assertLogs("app.stats", level="INFO") as cm:
+            flushed = stats.flush()
+        self.assertEqual(flushed, {"r1": {"hand_landmarks": 30, "frames": 30}, "r2": {"frames": 14}, "-": {"raw": 1}})
+        self.assertEqual(len(cm.records), 3)  # 방당 한 줄
+        self.assertEqual(stats.flush(), {})
+
+    def test_room_stats_accept_unhashable_client_values(self):
+        stats = RoomStats(interval_s=0)
+        stats.count(["r"], ["x"])  # 클라이언트가 보낸 {"type": ["x"], "room_id": ["r"]}
+        self.assertEqual(stats.flush(), {"['r']": {"['x']": 1}})
+
+    def test_payload_sampler_is_rate_limited_and_off_without_debug(self):
+        log = logging.getLogger("test.payload")
+        log.setLevel(logging.INFO)
+        sampler = PayloadSampler(sample=1.0, per_s=3, chars=5)
+        self.assertFalse(sampler.log(log, "client", "r", "x" * 100))
+
+        log.setLevel(logging.DEBUG)
+        with self.assertLogs("test.payload", level="DEBUG") as cm:
+            logged = [sampler.log(log, "client", "r", "abcdefgh") for _ in range(10)]
+        self.assertEqual(sum(logged), 3)  # 초당 상한
+        self.assertIn("'abcde'", cm.output[0])
+        self.assertEqual(sampler.suppressed, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app import main
+from app.model_registry import CANDIDATE, STABLE, registry
+
+
+def _variant(path, probs):
+    return types.SimpleNamespace(name=STABLE, path=path, infer_batch=lambda x: np.tile(probs, (len(x), 1)),
+                                 label_of=lambda i: f"L{i}")
+
+
+class ModelsApiTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.model_dir = os.path.realpath(self.tmp.name)
+        stable = _variant(os.path.join(self.model_dir, "v2.tflite"), np.array([0.05, 0.9, 0.05], np.float32))
+        for patcher in (mock.patch.dict(registry.slots, {STABLE: stable, CANDIDATE: None}),
+                        mock.patch.object(main, "MODEL_DIR", self.model_dir),
+                        mock.patch.object(main, "MODEL_ADMIN_TOKEN", "s3cret")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(main.app)  # with 없이 → lifespan(실제 모델 로딩) 실행 안 함
+
+    def test_infer_any_uses_stable_variant(self):
+        res = main.infer_any(np.zeros((1, 10, 55), np.float32))
+        self.assertEqual((res.index, res.variant, res.label_of(1)), (1, STABLE, "L1"))
+        self.assertAlmostEqual(res.score, 0.9, places=6)
+
+    def test_admin_routes_need_configured_token(self):
+        with mock.patch.object(main, "MODEL_ADMIN_TOKEN", ""):
+            r = self.client.put("/ai/models/candidate/percent", json={"percent": 50},
+                                headers={"X-Admin-Token": ""})
+            self.assertEqual(r.status_code, 403)
+        self.assertEqual(self.client.delete("/ai/models/candidate").status_code, 403)
+        r = self.client.post("/ai/models/candidate/promote", headers={"X-Admin-Token": "wrong"})
+        self.assertEqual(r.status_code, 403)
+
+    def test_model_path_must_stay_inside_model_dir(self):
+        headers = {"X-Admin-Token": "s3cret"}
+        for path in ("/etc/passwd", "../outside.tflite", os.path.join(self.model_dir, "..", "x.tflite")):
+            r = self.client.post("/ai/models/candidate", json={"path": path}, headers=headers)
+            self.assertEqual(r.status_code, 400, path)
+            self.assertIn("inside", r.json()["detail"])
+
+    def test_ready_reports_serving_model(self):
+        with mock.patch.object(main, "_ready", True):
+            body = self.client.get("/ai/ready").json()
+        self.assertEqual(body["model_path"], os.path.join(self.model_dir, "v2.tflite"))
+        self.assertIsNone(body["candidate_path"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from app.inference_result import InferenceResult
+from app.motion_gate import ABSENT, RUN, STILL, MotionGate
+
+
+def _window(seed=0):
+    rng = np.random.default_rng(seed)
+    return np.repeat(rng.uniform(0.3, 0.7, size=(1, 21, 2)).astype(np.float32), 10, axis=0)
+
+
+def _result():
+    return InferenceResult(probs=None, index=0, score=0.9, label="a")
+
+
+class MotionGateTest(unittest.TestCase):
+    def setUp(self):
+        self.gate = MotionGate(threshold=0.004, min_presence=0.5)
+
+    def test_first_window_runs_even_when_still(self):
+        self.assertEqual(self.gate.check(_window()), RUN)
+
+    def test_still_window_is_skipped_after_inference(self):
+        w = _window()
+        self.gate.remember(w, _result())
+        self.assertEqual(self.gate.check(w + np.float32(0.001)), STILL)
+        self.assertIsNotNone(self.gate.last_result)
+
+    def test_moving_window_runs(self):
+        w = _window()
+        self.gate.remember(w, _result())
+        moving = w + np.linspace(0, 0.2, 10, dtype=np.float32)[:, None, None]  # 프레임마다 이동
+        self.assertEqual(self.gate.check(moving), RUN)
+        self.assertEqual(self.gate.check(_window(1)), RUN)  # 마지막 추론 윈도우와 다른 손모양
+
+    def test_absent_window_is_skipped_and_next_hand_runs(self):
+        w = _window()
+        self.gate.remember(w, _result())
+        absent = w.copy()
+        absent[:6] = 0.0  # 10 프레임 중 6 프레임에 손 없음
+        self.assertEqual(self.gate.check(absent), ABSENT)
+        self.assertEqual(self.gate.check(w), RUN)  # 손이 다시 나타나면 정지여도 바로 추론
+
+    def test_hand_lost_only_on_transition(self):
+        """hand_lost 는 손이 있다가 없어진 check 에서만 True"""
+        w, empty = _window(), np.zeros((10, 21, 2), np.float32)
+        self.assertEqual(self.gate.check(empty), ABSENT)
+        self.assertFalse(self.gate.hand_lost)  # 처음부터 없음
+        self.gate.check(w)
+        self.assertFalse(self.gate.hand_lost)
+        self.gate.check(empty)
+        self.assertTrue(self.gate.hand_lost)
+        self.gate.check(empty)
+        self.assertFalse(self.gate.hand_lost)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import unittest
+
+from app.outbound import SLOW_CONSUMER_CLOSE_CODE, ClientSender
+from tests.fakes import FakeWebSocket
+
+
+def _msg(kind, n=0):
+    return json.dumps({"type": kind, "n": n})
+
+
+class ClientSenderTest(unittest.IsolatedAsyncioTestCase):
+    # writer 를 시작하지 않으면 큐가 비워지지 않음 = 멈춘 클라이언트
+
+    async def test_drop_oldest_evicts_only_captions(self):
+        ws = FakeWebSocket("slow")
+        sender = ClientSender(ws, maxsize=3, policy="drop_oldest")
+        self.assertTrue(sender.send_nowait(_msg("error")))
+        self.assertTrue(sender.send_nowait(_msg("caption", 1), droppable=True))
+        self.assertTrue(sender.send_nowait(_msg("coords_ack")))
+        self.assertTrue(sender.send_nowait(_msg("caption", 2), droppable=True))  # caption 1 을 버림
+        self.assertFalse(sender.closed)
+
+        sender.start()
+        await asyncio.sleep(0.01)
+        self.assertEqual([(m["type"], m["n"]) for m in ws.sent],
+                         [("error", 0), ("coords_ack", 0), ("caption", 2)])
+        sender.close()
+
+    async def test_drop_oldest_disconnects_when_nothing_droppable(self):
+        ws = FakeWebSocket("slow")
+        sender = ClientSender(ws, maxsize=2, policy="drop_oldest")
+        sender.send_nowait(_msg("error"))
+        sender.send_nowait(_msg("hello_ack"))
+        self.assertFalse(sender.send_nowait(_msg("caption"), droppable=True))
+        self.assertTrue(sender.closed)
+        self.assertEqual(sender.depth, 0)
+        await asyncio.sleep(0)
+        self.assertEqual(ws.close_code, SLOW_CONSUMER_CLOSE_CODE)
+
+    async def test_disconnect_policy_closes_slow_consumer(self):
+        ws = FakeWebSocket("slow")
+        sender = ClientSender(ws, maxsize=2, policy="disconnect")
+        sender.send_nowait(_msg("caption", 1), droppable=True)
+        sender.send_nowait(_msg("caption", 2), droppable=True)
+        self.assertFalse(sender.send_nowait(_msg("caption", 3), droppable=True))
+        self.assertTrue(sender.closed)
+        self.assertFalse(sender.send_nowait(_msg("caption", 4), droppable=True))  # 닫힌 뒤에는 버림
+        await asyncio.sleep(0)
+        self.assertEqual(ws.close_code, SLOW_CONSUMER_CLOSE_CODE)
+        self.assertEqual(ws.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from app import main
+from app.model_registry import ModelVariant
+from tests import tiny_models
+from tests.tiny_models import NUM_CLASSES, reference_probs
+
+
+@unittest.skipIf(tiny_models.tf is None, "tensorflow not installed (tiny model cannot be built)")
+class ComputePairProbsTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.variant = ModelVariant("stable", tiny_models.tiny_model_path(), backend="thread", precision="float32")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.variant.close()
+
+    def setUp(self):
+        self.rng = np.random.default_rng(3)
+
+    def test_one_invoke_for_originals_and_mirrors(self):
+        """N개 시퀀스의 원본/미러링을 (2N,10,55) 한 배치로 추론하고 (N,2,C) 로 돌려줌"""
+        frames_list = [self.rng.random((10, 21, 2), dtype=np.float32) for _ in range(3)]
+        frames = [main._as_frames_10x21x2(f) for f in frames_list]
+        with mock.patch.object(self.variant, "infer_batch", wraps=self.variant.infer_batch) as infer:
+            probs = main._compute_pair_probs(frames_list, frames, self.variant)
+
+        self.assertEqual(infer.call_count, 1)
+        self.assertEqual(infer.call_args.args[0].shape, (6, 10, 55))
+        self.assertEqual(probs.shape, (3, 2, NUM_CLASSES))
+        for k, f in enumerate(frames_list):
+            for j, g in enumerate((f, main._mirror_frames(f))):
+                np.testing.assert_allclose(probs[k, j], reference_probs(main._coerce_to_1x10x55(g))[0], atol=1e-5)
+
+    def test_feature_inputs_mixed_with_coordinates(self):
+        """이미 특징(1,10,55)인 입력이 섞여도 원본/미러링 순서가 유지됨"""
+        coords = self.rng.random((10, 21, 2), dtype=np.float32)
+        feats = main._coerce_to_1x10x55(self.rng.random((10, 21, 2), dtype=np.float32))
+        frames_list = [coords, feats]
+        frames = [main._as_frames_10x21x2(f) for f in frames_list]
+        self.assertIsNone(frames[1])
+
+        probs = main._compute_pair_probs(frames_list, frames, self.variant)
+
+        self.assertEqual(probs.shape, (2, 2, NUM_CLASSES))
+        mirrored = main._coerce_to_1x10x55(main._mirror_frames(coords))
+        np.testing.assert_allclose(probs[0, 1], reference_probs(mirrored)[0], atol=1e-5)
+        np.testing.assert_allclose(probs[1, 0], reference_probs(feats)[0], atol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from unittest import mock
+
+import numpy as np
+
+from app import process_backend
+from app.features import frames_to_feats_55
+from app.process_backend import ProcessInferenceBackend
+from tests import tiny_models
+from tests.tiny_models import NUM_CLASSES, reference_probs
+
+
+def _shm_exists(name):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    return True
+
+
+class _RecordShm:
+    """부모가 만든 공유 메모리 이름을 기록 (정리됐는지 확인용)"""
+
+    def __init__(self):
+        self.names = []
+        self._real = shared_memory.SharedMemory
+
+    def __call__(self, *args, **kwargs):
+        shm = self._real(*args, **kwargs)
+        if kwargs.get("create"):
+            self.names.append(shm.name)
+        return shm
+
+
+@unittest.skipIf(tiny_models.tf is None, "tensorflow not installed (tiny model cannot be built)")
+class ProcessInferenceBackendTestCase(unittest.TestCase):
+    def spawn(self, path, workers=1):
+        return ProcessInferenceBackend(path, workers=workers, num_threads=1, max_rows=4, xnnpack=False)
+
+    def test_infer_pairs_in_worker(self):
+        """워커 프로세스가 원본/미러링 특징 추출 + 추론 → (N,2,C), max_rows 보다 큰 배치는 나눠서"""
+        backend = self.spawn(tiny_models.tiny_model_path())
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.in_shape, (1, 10, 55))
+        self.assertEqual(backend.out_shape, (1, NUM_CLASSES))
+
+        frames = np.random.default_rng(9).random((6, 10, 21, 2), dtype=np.float32)
+        probs = backend.infer_pairs(frames)
+
+        mirrored = frames.copy()
+        mirrored[..., 0] = 1.0 - mirrored[..., 0]
+        self.assertEqual(probs.shape, (6, 2, NUM_CLASSES))
+        np.testing.assert_allclose(probs[:, 0], reference_probs(frames_to_feats_55(frames)), atol=1e-5)
+        np.testing.assert_allclose(probs[:, 1], reference_probs(frames_to_feats_55(mirrored)), atol=1e-5)
+
+    def test_bad_model_reports_cause_and_frees_shared_memory(self):
+        """모델을 못 읽으면 워커가 보낸 원인으로 RuntimeError, 공유 메모리는 unlink"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "broken.tflite")
+            with open(path, "wb") as f:
+                f.write(b"not a flatbuffer")
+            record = _RecordShm()
+            with mock.patch.object(process_backend.shared_memory, "SharedMemory", record):
+                with self.assertRaises(RuntimeError) as cm:
+                    self.spawn(path)
+                with self.assertRaises(RuntimeError) as missing:
+                    self.spawn(os.path.join(tmp, "missing.tflite"))
+
+        self.assertIn("failed to start", str(cm.exception))
+        self.assertIn("broken.tflite", str(cm.exception))
+        self.assertIn("FileNotFoundError", str(missing.exception))
+        self.assertEqual(len(record.names), 2)
+        self.assertFalse(any(_shm_exists(name) for name in record.names))
+
+    def test_fails_fast_when_no_worker_can_be_respawned(self):
+        """마지막 워커가 죽고 재시작도 실패하면 기다리던 호출까지 모두 바로 실패 (무한 대기 없음)"""
+        backend = self.spawn(tiny_models.tiny_model_path())
+        self.addCleanup(backend.close)
+        worker = backend._workers[0]
+        worker.proc.kill()
+        worker.proc.join(5)
+
+        frames = np.zeros((1, 10, 21, 2), np.float32)
+        with mock.patch.object(backend, "_spawn", side_effect=RuntimeError("respawn failed")), \
+                ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(backend.infer_pairs, frames) for _ in range(3)]
+            for fut in futures:
+                with self.assertRaises(RuntimeError):
+                    fut.result(timeout=10)
+        self.assertEqual(backend.size, 0)
+        with self.assertRaisesRegex(RuntimeError, "no inference workers"):
+            backend.infer_pairs(frames)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+    from fakeredis import aioredis as fake_aioredis
+except ImportError:  # requirements.dev.txt 미설치
+    fakeredis = None
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.redis_hub import ALIVE_KEY, ROOM_CLIENTS_KEY, WORKERS_KEY, RedisHub
+from tests.fakes import FakeWebSocket
+
+
+async def _settle(cond, timeout=2.0):
+    """백그라운드 publish/구독이 처리될 때까지 대기"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not cond():
+        if loop.time() > deadline:
+            raise AssertionError("timed out waiting for redis hub")
+        await asyncio.sleep(0.01)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis 미설치")
+class RedisHubTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = fakeredis.FakeServer()
+
+        async def factory():
+            return fake_aioredis.FakeRedis(server=self.server, decode_responses=True)
+
+        # 같은 Redis 를 공유하는 두 노드
+        self.node_a = RedisHub(factory, node_id="a")
+        self.node_b = RedisHub(factory, node_id="b")
+        await self.node_a.start()
+        await self.node_b.start()
+
+    async def asyncTearDown(self):
+        await self.node_a.close()
+        await self.node_b.close()
+
+    async def test_caption_reaches_clients_on_other_node(self):
+        """한 노드에서 broadcast 한 자막이 다른 노드의 같은 방 client 에게 전달"""
+        caller, callee, other = FakeWebSocket("caller"), FakeWebSocket("callee"), FakeWebSocket("other")
+        await self.node_a.add(caller, role="client", room="room1")
+        await self.node_b.add(callee, role="client", room="room1")
+        await self.node_b.add(other, role="client", room="room2")
+        await asyncio.sleep(0.1)  # 방 채널 구독 반영
+
+        self.node_a.broadcast_json("room1", {"type": "caption", "text": "안녕하세요"}, role="client")
+
+        await _settle(lambda: callee.sent)
+        self.assertEqual(callee.sent, [{"type": "caption", "text": "안녕하세요"}])
+        self.assertEqual(caller.sent, [{"type": "caption", "text": "안녕하세요"}])
+        self.assertEqual(other.sent, [])
+
+    async def test_ai_worker_on_other_node_is_bound(self):
+        """다른 노드의 여유 있는 AI 워커가 client 의 방에 bind 됨"""
+        worker = FakeWebSocket("ai")
+        await self.node_b.add(worker, role="ai", room="")
+        self.assertEqual(await self.node_a.redis.zcard(WORKERS_KEY), 1)
+
+        await self.node_a.add(FakeWebSocket("client"), role="client", room="room1")
+
+        await _settle(lambda: worker.sent)
+        self.assertEqual(worker.sent, [{"type": "bind", "room": "room1"}])
+        self.assertEqual(self.node_b.room_of(worker), "room1")
+        self.assertEqual(self.node_b.by_role_in_room("ai", "room1"), [worker])
+        self.assertEqual(await self.node_a.redis.zcard(WORKERS_KEY), 0)
+
+    async def test_removed_worker_leaves_shared_pool(self):
+        """끊긴 AI 워커는 공유 부하 목록에서 제거"""
+        worker = FakeWebSocket("ai")
+        await self.node_a.add(worker, role="ai", room="")
+        await self.node_a.remove(worker)
+        self.assertEqual(await self.node_a.redis.zcard(WORKERS_KEY), 0)
+
+    async def test_room_moves_to_other_node_when_worker_disconnects(self):
+        """워커가 끊기면 그 방을 다른 노드의 워커가 이어받음"""
+        first, second = FakeWebSocket("ai1"), FakeWebSocket("ai2")
+        await self.node_a.add(first, role="ai", room="")
+        await self.node_a.add(FakeWebSocket("client"), role="client", room="room1")
+        await _settle(lambda: first.sent)
+        self.assertEqual(first.sent, [{"type": "bind", "room": "room1"}])
+
+        await self.node_b.add(second, role="ai", room="")
+        await self.node_a.remove(first)
+
+        await _settle(lambda: second.sent)
+        self.assertEqual(second.sent, [{"type": "bind", "room": "room1"}])
+        self.assertEqual(self.node_b.workers.rooms_of(second), {"room1"})
+
+    async def test_room_of_crashed_node_is_released(self):
+        """client 가 있던 노드가 죽으면(alive 만료) 다른 노드의 워커가 그 방을 반납"""
+        worker = FakeWebSocket("ai")
+        await self.node_a.add(worker, role="ai", room="")
+        await self.node_b.add(FakeWebSocket("client"), role="client", room="room1")
+        await _settle(lambda: worker.sent)
+        self.assertEqual(self.node_a.workers.rooms_of(worker), {"room1"})
+
+        await self.node_a.redis.delete(ALIVE_KEY.format("b"))  # node b 가 remove 없이 죽음
+        await self.node_a._sweep_rooms()
+
+        await _settle(lambda: len(worker.sent) == 2)
+        self.assertEqual(worker.sent[-1], {"type": "unbind", "room": "room1"})
+        self.assertEqual(self.node_a.workers.rooms_of(worker), set())
+        self.assertFalse(await self.node_a.redis.exists(ROOM_CLIENTS_KEY.format("room1")))
+
+    async def test_redis_errors_do_not_escape_connection_lifecycle(self):
+        """허브 훅의 Redis 오류는 add/remove 밖으로 나가지 않고, 로컬 상태는 정리됨"""
+        client = FakeWebSocket("client")
+        failing = mock.AsyncMock(side_effect=RedisConnectionError("down"))
+        with mock.patch.object(self.node_a.redis, "hincrby", failing), \
+                self.assertLogs("app.redis_hub", "ERROR"):
+            await self.node_a.add(client, role="client", room="room1")
+            await self.node_a.remove(client)
+        self.assertNotIn(client, self.node_a.meta)
+        self.assertNotIn(client, self.node_a.senders)
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+from prometheus_client import REGISTRY
+
+from app.result_cache import ResultCache, window_keys
+
+
+def _entries(variant):
+    return REGISTRY.get_sample_value("ai_result_cache_entries", {"variant": variant})
+
+
+def _window(seed=0):
+    """손목(0번)이 원점 근처인 (10,21,2) 좌표 윈도우"""
+    rng = np.random.default_rng(seed)
+    return (0.5 + rng.uniform(-0.1, 0.1, size=(10, 21, 2))).astype(np.float32)
+
+
+class WindowKeysTest(unittest.TestCase):
+    def test_translated_or_scaled_window_has_same_key(self):
+        w = _window()
+        wrist = w[:, :1, :]
+        moved = w + np.float32([0.2, -0.15])
+        scaled = wrist + (w - wrist) * np.float32(1.7)  # 손목 기준으로 손을 크게
+        k, k_moved, k_scaled = window_keys([w, moved, scaled])
+        self.assertEqual(k, k_moved)
+        self.assertEqual(k, k_scaled)
+
+    def test_different_window_has_different_key(self):
+        a, b = window_keys([_window(0), _window(1)])
+        self.assertNotEqual(a, b)
+
+    def test_non_coordinate_input_has_no_key(self):
+        keys = window_keys([None, _window(), None])
+        self.assertIsNone(keys[0])
+        self.assertIsNotNone(keys[1])
+        self.assertIsNone(keys[2])
+
+
+class ResultCacheTest(unittest.TestCase):
+    def test_lru_eviction_at_maxsize(self):
+        cache = ResultCache(maxsize=2, ttl_s=60)
+        k1, k2, k3 = window_keys([_window(1), _window(2), _window(3)])
+        cache.put(k1, np.zeros((2, 3)))
+        cache.put(k2, np.ones((2, 3)))
+        self.assertIsNotNone(cache.get(k1))  # k1 을 최근에 사용 → k2 가 가장 오래됨
+        cache.put(k3, np.full((2, 3), 2.0))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(k2))
+        np.testing.assert_array_equal(cache.get(k1), np.zeros((2, 3)))
+        np.testing.assert_array_equal(cache.get(k3), np.full((2, 3), 2.0))
+
+    def test_expired_and_disabled(self):
+        cache = ResultCache(maxsize=4, ttl_s=-1)  # 넣자마자 만료
+        key = window_keys([_window()])[0]
+        cache.put(key, np.zeros((2, 3)))
+        self.assertIsNone(cache.get(key))
+
+        off = ResultCache(maxsize=0)
+        off.put(key, np.zeros((2, 3)))
+        self.assertFalse(off.enabled)
+        self.assertIsNone(off.get(key))
+
+    def test_entries_gauge_per_variant(self):
+        """캐시 크기 지표는 모델 슬롯(variant)별, 만료/rename/clear 도 반영"""
+        cache = ResultCache(maxsize=2, ttl_s=60, name="test_a")
+        other = ResultCache(maxsize=2, ttl_s=60, name="test_b")
+        k1, k2, k3 = window_keys([_window(1), _window(2), _window(3)])
+        for k in (k1, k2, k3):
+            cache.put(k, np.zeros((2, 3)))
+        other.put(k1, np.zeros((2, 3)))
+        self.assertEqual((_entries("test_a"), _entries("test_b")), (2, 1))
+
+        cache._data[k3] = (0.0, cache._data[k3][1])  # k3 만료
+        self.assertIsNone(cache.get(k3))
+        self.assertEqual(_entries("test_a"), 1)
+
+        cache.rename("test_c")
+        self.assertEqual((_entries("test_a"), _entries("test_c")), (0, 1))
+        cache.clear()
+        other.clear()
+        self.assertEqual((_entries("test_c"), _entries("test_b")), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from app.smoothing import CaptionSmoother, room_smoothing
+from app.state import Hub
+from tests.fakes import FakeWebSocket
+
+
+def _probs(idx, conf=0.9, classes=5):
+    p = np.full(classes, (1.0 - conf) / (classes - 1), dtype=np.float32)
+    p[idx] = conf
+    return p
+
+
+@mock.patch("app.smoothing._finalize", lambda idx, score, label_of=None: (f"L{idx}", score))
+class CaptionSmootherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.smoother = CaptionSmoother(alpha=0.5, margin=0.1, hold=3, reset_s=60)
+
+    def test_emits_once_per_stable_label(self):
+        """같은 라벨이 반복되면 처음 안정됐을 때 한 번만 내보냄"""
+        out = [self.smoother.update(_probs(1)) for _ in range(30)]
+        emitted = [o for o in out if o is not None]
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0][0], "L1")
+
+    def test_single_frame_flicker_is_ignored(self):
+        """한두 프레임 튀는 라벨은 자막을 바꾸지 않음"""
+        for _ in range(10):
+            self.smoother.update(_probs(1))
+        self.assertIsNone(self.smoother.update(_probs(3)))
+        self.assertIsNone(self.smoother.update(_probs(1)))
+        self.assertEqual(self.smoother.stable, 1)
+
+    def test_sustained_change_switches_label(self):
+        """새 라벨이 계속되면 히스테리시스를 넘은 뒤 전환"""
+        for _ in range(10):
+            self.smoother.update(_probs(1))
+        out = [self.smoother.update(_probs(2)) for _ in range(10)]
+        emitted = [o for o in out if o is not None]
+        self.assertEqual([e[0] for e in emitted], ["L2"])
+        self.assertEqual(self.smoother.stable, 2)
+
+
+@mock.patch("app.smoothing._finalize", lambda idx, score, label_of=None: (f"L{idx}", score))
+class RoomSmoothingTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_closed_room_starts_fresh(self):
+        """방의 마지막 연결이 빠지면 EMA 상태를 버림 → 같은 방 이름의 새 통화는 처음부터"""
+        hub = Hub()
+        ws = FakeWebSocket("c1")
+        await hub.add(ws, role="client", room="reused")
+        for _ in range(3):
+            room_smoothing.update("reused", _probs(1))
+        self.assertEqual(room_smoothing._rooms["reused"].stable, 1)
+        await hub.remove(ws)
+        self.assertNotIn("reused", room_smoothing._rooms)
+
+        await hub.add(ws, role="client", room="reused")
+        room_smoothing.update("reused", _probs(2))
+        self.assertIsNone(room_smoothing._rooms["reused"].stable)  # 이전 EMA/라벨을 물려받지 않음
+        await hub.remove(ws)
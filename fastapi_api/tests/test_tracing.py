@@ -0,0 +1,38 @@
+import unittest
+
+import numpy as np
+
+from app import wire
+from app.inference_result import InferenceResult
+from app.tracing import Trace, now_ms
+
+
+class TracingTest(unittest.TestCase):
+    def test_wire_v2_carries_capture_ts_and_v1_still_decodes(self):
+        lm = np.random.default_rng(0).random((3, 1, 21, 2), dtype=np.float32)
+        v2 = wire.decode(wire.encode("hand_landmarks_sequence", lm, corr_id=7, room="방", capture_ts=1.7e12 + 0.5))
+        self.assertEqual((v2.corr_id, v2.room, v2.capture_ts), (7, "방", 1.7e12 + 0.5))
+        np.testing.assert_array_equal(v2.landmarks, lm)
+
+        v1_buf = wire.encode("hand_landmarks", lm[:1], corr_id=3)
+        self.assertEqual(v1_buf[2], 1)
+        v1 = wire.decode(v1_buf)
+        self.assertIsNone(v1.capture_ts)
+        np.testing.assert_array_equal(v1.landmarks, lm[:1])
+
+    def test_trace_stamps_caption_only_when_requested(self):
+        t = now_ms()
+        res = InferenceResult(probs=None, index=0, score=0.9, label="a",
+                              infer_start=t / 1000 + 0.001, infer_end=t / 1000 + 0.004)
+        out = Trace(t, corr_id="c1", capture_ms=t - 50).finish("hand_landmarks", res)
+        self.assertEqual(list(out), ["recv_ts", "capture_ts", "infer_start_ts", "infer_end_ts", "send_ts"])
+        self.assertTrue(out["capture_ts"] <= out["recv_ts"] <= out["infer_start_ts"]
+                        <= out["infer_end_ts"] <= out["send_ts"] + 5)
+
+        reused = Trace(t, capture_ms=t).finish("hand_landmarks", None)  # 재사용 자막: 추론 시각 없음
+        self.assertNotIn("infer_start_ts", reused)
+        self.assertIsNone(Trace(t).finish("hand_landmarks", res))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import unittest
+from unittest import mock
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app import main, websocketServer
+from app.inference_result import InferenceResult
+from app.motion_gate import MotionGate
+from app.smoothing import RoomSmoothing
+from app.stage_metrics import type_label
+
+
+class WebSocketEndpointTestCase(unittest.TestCase):
+    def test_type_label_of_non_string_is_other(self):
+        self.assertEqual(type_label("hand_landmarks"), "hand_landmarks")
+        self.assertEqual(type_label("made_up"), "other")
+        self.assertEqual(type_label(["x"]), "other")
+        self.assertEqual(type_label({"a": 1}), "other")
+
+    def test_unhashable_type_and_room_keep_socket_open(self):
+        client = TestClient(main.app)  # with 없이 → lifespan(모델 로딩) 실행 안 함
+        with client.websocket_connect("/ai?role=client&room=r1") as ws:
+            ws.send_json({"type": ["x"], "room_id": ["r"]})
+            ws.send_json({"type": {"nested": 1}})
+            ws.send_json({"type": "connection_test"})
+            self.assertEqual(ws.receive_json()["type"], "connection_test_response")
+
+    def test_mixed_point_types_report_error_and_keep_socket_open(self):
+        client = TestClient(main.app)
+        with client.websocket_connect("/ai?role=client&room=r1") as ws:
+            ws.send_json({"type": "hand_landmarks", "landmarks": [{"x": 0.1, "y": 0.2}, [0.3, 0.4]]})
+            self.assertEqual(ws.receive_json(), {"type": "error", "message": "single_frame_inference_failed"})
+            ws.send_json({"type": "hand_landmarks", "landmarks": [{"x": 0.1, "y": 0.2}, 5]})
+            self.assertEqual(ws.receive_json()["message"], "single_frame_inference_failed")
+            ws.send_json({"type": "connection_test"})
+            self.assertEqual(ws.receive_json()["type"], "connection_test_response")
+
+
+class CaptionClearTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hub = mock.Mock()
+        self.smoothing = RoomSmoothing()
+        self.scheduler = mock.Mock()
+        self.scheduler.submit = mock.AsyncMock(return_value=InferenceResult(
+            probs=np.array([0.05, 0.9, 0.05], np.float32), index=1, score=0.9, label="a",
+            label_of=lambda i: "abc"[i]))
+        for patcher in (mock.patch.object(websocketServer, "hub", self.hub),
+                        mock.patch.object(websocketServer, "room_smoothing", self.smoothing),
+                        mock.patch.object(websocketServer, "scheduler", self.scheduler),
+                        mock.patch.object(websocketServer, "CAPTION_SMOOTHING", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.gate = MotionGate(threshold=0.004, min_presence=0.5)
+        self.hand = np.repeat(np.random.default_rng(0).uniform(0.3, 0.7, (1, 21, 2)).astype(np.float32), 10, axis=0)
+
+    def captions(self):
+        return [json.loads(c.args[1]) for c in self.hub.broadcast.call_args_list]
+
+    async def send(self, frames):
+        await websocketServer._caption_from_frames(object(), "r1", frames, gate=self.gate)
+
+    async def test_hand_leaving_clears_caption_once_and_resets_smoothing(self):
+        """손이 사라지면 빈 자막 한 번 + 방 스무딩 초기화, 계속 없으면 더 보내지 않음"""
+        await self.send(self.hand)
+        self.assertIn("r1", self.smoothing._rooms)
+
+        empty = np.zeros_like(self.hand)
+        await self.send(empty)
+        await self.send(empty)
+
+        self.assertNotIn("r1", self.smoothing._rooms)
+        cleared = [c for c in self.captions() if c["text"] == ""]
+        self.assertEqual(len(cleared), 1)
+        self.assertEqual(cleared[0]["type"], "caption")
+        self.assertFalse(self.hub.broadcast.call_args_list[-1].kwargs.get("droppable", False))
+        self.assertEqual(self.scheduler.submit.await_count, 1)
+
+    async def test_absent_from_start_sends_nothing(self):
+        """처음부터 손이 없으면 지울 자막도 없음"""
+        await self.send(np.zeros_like(self.hand))
+        self.hub.broadcast.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import struct
+import unittest
+
+import numpy as np
+
+from app import wire
+
+
+def _frame(t=2, hands=1, dims=2):
+    lm = np.random.default_rng(0).random((t, hands, 21, dims), dtype=np.float32)
+    return wire.encode("hand_landmarks_sequence", lm, corr_id=5, room="r1")
+
+
+class WireDecodeErrorTest(unittest.TestCase):
+    def assertWireError(self, buf, message):
+        with self.assertRaises(wire.WireError) as cm:
+            wire.decode(buf)
+        self.assertIn(message, str(cm.exception))
+
+    def test_truncated_header(self):
+        buf = _frame()
+        self.assertWireError(buf[:wire.HEADER.size - 1], "too short")
+        v2 = wire.encode("hand_landmarks", np.zeros((1, 1, 21, 2), np.float32), capture_ts=1.0)
+        self.assertWireError(v2[:wire.HEADER_V2.size - 1], "too short")  # v1 크기는 넘지만 v2 헤더가 잘림
+
+    def test_unknown_version(self):
+        buf = bytearray(_frame())
+        buf[2] = 9
+        self.assertWireError(bytes(buf), "unsupported version 9")
+
+    def test_payload_length_mismatch(self):
+        buf = _frame()
+        self.assertWireError(buf[:-4], "payload size mismatch")
+        self.assertWireError(buf + b"\0" * 4, "payload size mismatch")
+
+    def test_bad_dtype(self):
+        # float64 로 보낸 좌표: 헤더는 맞지만 payload 가 float32 두 배 크기
+        lm = np.zeros((2, 1, 21, 2), dtype="<f8")
+        room = b"r1"
+        header = wire.HEADER.pack(wire.MAGIC, 1, wire.MSG_CODES["hand_landmarks_sequence"], 2, 1, 2, 0, len(room))
+        pad = b"\0" * (wire._payload_offset(len(header), len(room)) - len(header) - len(room))
+        self.assertWireError(header + room + pad + lm.tobytes(), "payload size mismatch")
+
+        # 점당 값 개수(dims)가 2|3 이 아님
+        buf = bytearray(_frame())
+        struct.pack_into("<B", buf, 7, 4)
+        self.assertWireError(bytes(buf), "bad shape")
+        with self.assertRaises(wire.WireError):
+            wire.encode("hand_landmarks", np.zeros((1, 1, 21, 4), np.float32))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+
+from app.state import Hub
+from tests.fakes import FakeWebSocket
+
+
+class WorkerSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hub = Hub()
+
+    async def asyncTearDown(self):
+        for ws in list(self.hub.clients):
+            await self.hub.remove(ws)
+
+    async def test_rooms_go_to_least_loaded_worker(self):
+        """여러 방을 맡을 수 있는 워커들 사이에서 가장 한가한 워커에 배정"""
+        busy, idle = FakeWebSocket("busy"), FakeWebSocket("idle")
+        await self.hub.add(busy, role="ai", room="", capacity=4)
+        await self.hub.add(idle, role="ai", room="", capacity=4)
+        await self.hub.update_worker(busy, inflight=10, p95_ms=400)
+
+        for room in ("r1", "r2", "r3"):
+            await self.hub.add(FakeWebSocket(room), role="client", room=room)
+
+        self.assertEqual(self.hub.workers.rooms_of(idle), {"r1", "r2", "r3"})
+        self.assertEqual(self.hub.workers.rooms_of(busy), set())
+        self.assertEqual(self.hub.by_role_in_room("ai", "r2"), [idle])
+
+    async def test_second_client_does_not_take_another_worker(self):
+        """같은 방의 두 번째 client 는 이미 배정된 워커를 공유"""
+        w1, w2 = FakeWebSocket("w1"), FakeWebSocket("w2")
+        await self.hub.add(w1, role="ai", room="")
+        await self.hub.add(w2, role="ai", room="")
+        await self.hub.add(FakeWebSocket("c1"), role="client", room="room1")
+        await self.hub.add(FakeWebSocket("c2"), role="client", room="room1")
+        self.assertEqual(len(self.hub.by_role_in_room("ai", "room1")), 1)
+
+    async def test_waiting_room_is_assigned_when_capacity_appears(self):
+        """워커가 없을 때 들어온 방은 워커가 연결되면 배정"""
+        await self.hub.add(FakeWebSocket("c1"), role="client", room="room1")
+        worker = FakeWebSocket("ai")
+        await self.hub.add(worker, role="ai", room="")
+        await asyncio.sleep(0.01)  # 송신 writer task 가 큐를 비우도록
+        self.assertEqual(worker.sent, [{"type": "bind", "room": "room1"}])
+
+    async def test_rooms_are_rebalanced_on_disconnect(self):
+        """끊긴 워커의 방은 남은 워커로 재배정"""
+        w1, w2 = FakeWebSocket("w1"), FakeWebSocket("w2")
+        await self.hub.add(w1, role="ai", room="", capacity=2)
+        await self.hub.add(FakeWebSocket("c1"), role="client", room="r1")
+        await self.hub.add(FakeWebSocket("c2"), role="client", room="r2")
+        await self.hub.add(w2, role="ai", room="", capacity=2)
+        self.assertEqual(self.hub.workers.rooms_of(w1), {"r1", "r2"})
+
+        await self.hub.remove(w1)
+        self.assertEqual(self.hub.workers.rooms_of(w2), {"r1", "r2"})
+        self.assertEqual(self.hub.room_of(w2), "r1")
+
+    async def test_empty_room_releases_worker_slot(self):
+        """방의 client 가 모두 나가면 워커에 unbind 를 보내고 슬롯 반납"""
+        worker, client = FakeWebSocket("ai"), FakeWebSocket("c1")
+        await self.hub.add(worker, role="ai", room="")
+        await self.hub.add(client, role="client", room="room1")
+        await self.hub.remove(client)
+        self.assertEqual(self.hub.workers.rooms_of(worker), set())
+        self.assertEqual(self.hub.room_of(worker), "")
+        self.assertEqual(self.hub.rooms, {})
@@ -0,0 +1,56 @@
+import functools
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    import tensorflow as tf
+except ImportError:  # tflite_runtime 만 있는 환경 → 모델을 만들 수 없으므로 해당 테스트는 skip
+    tf = None
+
+NUM_CLASSES = 4
+_rng = np.random.default_rng(7)
+W = _rng.standard_normal((55, NUM_CLASSES)).astype(np.float32) * 0.1
+B = _rng.standard_normal(NUM_CLASSES).astype(np.float32) * 0.1
+
+
+def reference_probs(x_Nx10x55: np.ndarray) -> np.ndarray:
+    """tiny 모델과 같은 계산: softmax(mean_t(x) @ W + b)"""
+    logits = x_Nx10x55.mean(axis=1) @ W + B
+    e = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _convert(int8: bool) -> bytes:
+    @tf.function(input_signature=[tf.TensorSpec([1, 10, 55], tf.float32)])
+    def model(x):
+        return tf.nn.softmax(tf.matmul(tf.reduce_mean(x, axis=1), W) + B)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([model.get_concrete_function()], model)
+    if int8:
+        def representative():
+            rng = np.random.default_rng(0)
+            for _ in range(32):
+                yield [rng.random((1, 10, 55), dtype=np.float32)]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    return converter.convert()
+
+
+@functools.lru_cache(maxsize=None)
+def tiny_model_path(int8: bool = False) -> str:
+    """(1,10,55) → (1,4) 확률을 내는 작은 .tflite 를 임시 디렉터리에 만들어 경로 반환 (프로세스당 한 번)"""
+    path = os.path.join(_tmpdir().name, "tiny.int8.tflite" if int8 else "tiny.tflite")
+    with open(path, "wb") as f:
+        f.write(_convert(int8))
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def _tmpdir() -> tempfile.TemporaryDirectory:
+    return tempfile.TemporaryDirectory()
@@ -0,0 +1,360 @@
+"""
+/ai WebSocket 부하 생성기 (외부 서비스 없이 로컬에서 실행)
+
+    # 서버를 따로 띄운 경우
+    python -m tools.loadgen --url ws://127.0.0.1:8001/ai --clients 50 --fps 30 --duration 30
+
+    # 서버까지 로컬 subprocess 로 띄움 (HUB_BACKEND=memory, Redis 불필요)
+    python -m tools.loadgen --spawn --env TFLITE_PATH=models/model.tflite --clients 50 --wire binary
+
+- client N개 (방마다 --clients-per-room 개) + AI 워커 역할 연결 --ai-peers 개
+- client 는 랜드마크를 --fps 로 재생 (--data 로 녹화본, 없으면 합성 손 움직임)
+  --mode frame   : 프레임마다 hand_landmarks
+  --mode sequence: --seq-len 프레임마다 hand_landmarks_sequence
+  --wire json | binary (binary 는 v2 헤더로 capture_ts 포함)
+- 메시지마다 corr_id + capture_ts 를 실어 보내고, 같은 corr_id 의 caption 이 돌아오면 지연시간 기록
+  (슬라이딩 윈도우 stride/모션 게이트/스무딩 때문에 모든 메시지에 caption 이 오지는 않음
+   → 추론 경로 자체를 재려면 --env CAPTION_SMOOTHING=0 --env ALWAYS_EMIT_CAPTION=1)
+- 결과: 송신/수신 처리량, caption 지연 백분위 (클라이언트 기준 + trace 의 서버 내부 구간),
+  제때 못 보낸 프레임, 서버 error, 서버 송신 큐에서 버려진 메시지 (/metrics 차이),
+  --pending-timeout 초 안에 caption 이 안 와서 기다리기를 포기한 메시지 (unmatched)
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import wire  # noqa: E402
+
+
+# ---- 랜드마크 소스 ----
+def synthetic_stream(n_frames: int, seed: int) -> np.ndarray:
+    """손 모양(21점)을 기준으로 위치/크기/손가락을 천천히 움직이는 (T,21,2) 좌표 (모션 게이트/캐시에 걸리지 않도록)"""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(-0.9, 0.9, 5)
+    base = np.zeros((21, 2), dtype=np.float32)
+    for f, a in enumerate(angles):  # 손가락 5개 × 관절 4개, 손목은 원점
+        for j in range(4):
+            base[1 + f * 4 + j] = [np.sin(a) * (j + 1) * 0.04, -np.cos(a) * (j + 1) * 0.04]
+    t = np.arange(n_frames, dtype=np.float32)[:, None]                       # (T,1)
+    phase = rng.uniform(0, 2 * np.pi, size=3)
+    center = np.stack([0.5 + 0.15 * np.sin(t * 0.11 + phase[0]),
+                       0.5 + 0.1 * np.cos(t * 0.07 + phase[1])], axis=-1)        # (T,1,2)
+    curl = (1.0 - 0.3 * (1 + np.sin(t * 0.2 + phase[2])) / 2)[..., None]     # (T,1,1)
+    frames = center + base[None] * curl + rng.normal(0, 0.002, size=(n_frames, 21, 2))
+    return frames.astype(np.float32)
+
+
+def load_stream(path: str) -> np.ndarray:
+    """npz 의 frames ((N,T,21,2) 또는 (T,21,2)) → (T,21,2) 하나의 연속 스트림"""
+    frames = np.load(path)["frames"].astype(np.float32)
+    if frames.ndim == 4:
+        frames = frames.reshape(-1, 21, 2)
+    if frames.ndim != 3 or frames.shape[1:] != (21, 2):
+        raise SystemExit(f"{path}: expected frames of shape (N,T,21,2) or (T,21,2), got {frames.shape}")
+    return frames
+
+
+# ---- 메시지 인코딩 ----
+def encode_message(mode: str, fmt: str, frames: np.ndarray, corr_id: int, capture_ms: float):
+    """(T,21,2) → JSON 텍스트 또는 바이너리 프레임"""
+    mtype = "hand_landmarks" if mode == "frame" else "hand_landmarks_sequence"
+    if fmt == "binary":
+        return wire.encode(mtype, frames[:, None], corr_id=corr_id, capture_ts=capture_ms)
+    pts = [[{"x": float(x), "y": float(y)} for x, y in f] for f in frames] if fmt == "json-dict" else frames.tolist()
+    msg = {"type": mtype, "corr_id": corr_id, "capture_ts": capture_ms}
+    if mode == "frame":
+        msg["landmarks"] = pts[-1]
+    else:
+        msg["frame_sequence"] = pts
+    return json.dumps(msg)
+
+
+# ---- 집계 ----
+@dataclass
+class Stats:
+    sent: int = 0
+    sent_bytes: int = 0
+    late: int = 0                    # 일정보다 한 주기 넘게 늦어 건너뛴 프레임
+    captions: int = 0                # 받은 caption 전체 (같은 방 다른 client 것 포함)
+    matched: int = 0                 # 내가 보낸 corr_id 의 caption
+    unmatched: int = 0               # pending_timeout 안에 caption 이 안 와서 정리한 corr_id
+    errors: int = 0
+    ai_messages: int = 0
+    connect_failures: int = 0
+    latency_ms: List[float] = field(default_factory=list)   # 송신 → caption 수신 (클라이언트 시계)
+    server_ms: List[float] = field(default_factory=list)    # trace: 서버 수신 → 송신
+    infer_ms: List[float] = field(default_factory=list)     # trace: 배치 추론 시작 → 끝
+
+
+def _percentiles(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    p = np.percentile(np.asarray(values), [50, 90, 95, 99])
+    return {"p50": round(float(p[0]), 2), "p90": round(float(p[1]), 2), "p95": round(float(p[2]), 2),
+            "p99": round(float(p[3]), 2), "max": round(float(max(values)), 2)}
+
+
+def _scrape_dropped(metrics_url: Optional[str]) -> Optional[float]:
+    """서버 /metrics 의 ws_outbound_dropped_total 합계 (읽을 수 없으면 None)"""
+    if not metrics_url:
+        return None
+    try:
+        with urllib.request.urlopen(metrics_url, timeout=2) as r:
+            text = r.read().decode("utf-8")
+    except OSError:
+        return None
+    return sum(float(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+               if line.startswith("ws_outbound_dropped_total"))
+
+
+def _expire_pending(pending: Dict[int, float], now: float, timeout: float) -> int:
+    """
+    timeout 초 넘게 caption 이 안 온 corr_id 를 정리하고 개수 반환
+    (caption 이 안 오는 메시지가 많아도 pending 이 계속 커지지 않도록, dict 순서 = 송신 순서라 앞에서부터)
+    """
+    expired = 0
+    while pending:
+        corr_id, sent_at = next(iter(pending.items()))
+        if now - sent_at < timeout:
+            break
+        del pending[corr_id]
+        expired += 1
+    return expired
+
+
+# ---- 연결 ----
+async def run_client(idx: int, url: str, room: str, stream: np.ndarray, args, stats: Stats, stop_at: float) -> None:
+    loop = asyncio.get_running_loop()
+    fmt = "binary" if args.wire == "binary" else args.json_points
+    query = f"?role=client&room={room}" + ("&wire=binary" if args.wire == "binary" else "")
+    try:
+        ws = await websockets.connect(url + query, max_size=None, open_timeout=10)
+    except (OSError, websockets.InvalidHandshake, asyncio.TimeoutError):
+        stats.connect_failures += 1
+        return
+
+    pending: Dict[int, float] = {}
+    prefix = (idx + 1) << 20  # corr_id = client 번호 | 순번 (u32, 방 안의 다른 client 것과 구분)
+
+    async def receive() -> None:
+        async for raw in ws:
+            if isinstance(raw, bytes):
+                continue
+            msg = json.loads(raw)
+            if msg.get("type") == "error":
+                stats.errors += 1
+                continue
+            if msg.get("type") != "caption":
+                continue
+            stats.captions += 1
+            sent_at = pending.pop(msg.get("corr_id"), None)
+            if sent_at is None:
+                continue
+            stats.matched += 1
+            stats.latency_ms.append((time.perf_counter() - sent_at) * 1000)
+            trace = msg.get("trace") or {}
+            if "send_ts" in trace:
+                stats.server_ms.append(trace["send_ts"] - trace["recv_ts"])
+            if "infer_start_ts" in trace:
+                stats.infer_ms.append(trace["infer_end_ts"] - trace["infer_start_ts"])
+
+    receiver = loop.create_task(receive())
+    period = 1.0 / args.fps
+    pos = (idx * 97) % len(stream)   # client 마다 다른 위치부터 재생
+    seq, window = 0, []
+    next_at = loop.time()
+    try:
+        while loop.time() < stop_at:
+            frame = stream[pos % len(stream)]
+            pos += 1
+            window.append(frame)
+            if args.mode == "frame" or len(window) >= args.seq_len:
+                seq = (seq + 1) & 0xFFFFF
+                corr_id = prefix | seq
+                payload = encode_message(args.mode, fmt, np.stack(window[-args.seq_len:]), corr_id, time.time() * 1000)
+                window = []
+                now = time.perf_counter()
+                stats.unmatched += _expire_pending(pending, now, args.pending_timeout)
+                pending[corr_id] = now
+                await ws.send(payload)
+                stats.sent += 1
+                stats.sent_bytes += len(payload)
+
+            next_at += period
+            delay = next_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -period:  # 한 주기 넘게 밀렸으면 따라잡지 않고 건너뜀
+                skipped = int(-delay / period)
+                stats.late += skipped
+                next_at += skipped * period
+        await asyncio.sleep(args.drain)  # 마지막 caption 대기
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        receiver.cancel()
+        await ws.close()
+        stats.unmatched += _expire_pending(pending, time.perf_counter(), args.pending_timeout)
+
+
+async def run_ai_peer(url: str, capacity: int, stats: Stats, stop_at: float) -> None:
+    """AI 워커 역할 연결: 방 배정(bind/unbind) 알림만 받음"""
+    try:
+        async with websockets.connect(f"{url}?role=ai&capacity={capacity}", open_timeout=10) as ws:
+            while True:
+                remaining = stop_at - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(ws.recv(), remaining)
+                    stats.ai_messages += 1
+                except asyncio.TimeoutError:
+                    break
+    except (OSError, websockets.InvalidHandshake, websockets.ConnectionClosed, asyncio.TimeoutError):
+        stats.connect_failures += 1
+
+
+async def run(args, stream: np.ndarray, metrics_url: Optional[str]) -> dict:
+    stats = Stats()
+    loop = asyncio.get_running_loop()
+    dropped_before = _scrape_dropped(metrics_url)
+    stop_at = loop.time() + args.ramp + args.duration
+
+    ai_tasks = [loop.create_task(run_ai_peer(args.url, args.ai_capacity, stats, stop_at + args.drain))
+                for _ in range(args.ai_peers)]
+    await asyncio.sleep(0.2)  # 워커가 먼저 등록되도록
+
+    started = time.perf_counter()
+    clients = []
+    for i in range(args.clients):
+        room = f"{args.room_prefix}{i // args.clients_per_room}"
+        clients.append(loop.create_task(run_client(i, args.url, room, stream, args, stats, stop_at)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.clients)
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - started - args.drain
+    await asyncio.gather(*ai_tasks)
+
+    dropped_after = _scrape_dropped(metrics_url)
+    return {
+        "config": {k: getattr(args, k) for k in ("clients", "clients_per_room", "ai_peers", "fps", "mode",
+                                                 "seq_len", "wire", "json_points", "duration",
+                                                 "pending_timeout")},
+        "elapsed_s": round(elapsed, 2),
+        "sent": stats.sent,
+        "sent_per_s": round(stats.sent / elapsed, 1) if elapsed > 0 else None,
+        "sent_mb": round(stats.sent_bytes / 1e6, 2),
+        "captions_received": stats.captions,
+        "captions_per_s": round(stats.captions / elapsed, 1) if elapsed > 0 else None,
+        "captions_matched": stats.matched,
+        "no_caption": stats.sent - stats.matched,
+        "unmatched": stats.unmatched,
+        "late_frames": stats.late,
+        "server_errors": stats.errors,
+        "server_outbound_dropped": (dropped_after - dropped_before
+                                    if dropped_before is not None and dropped_after is not None else None),
+        "connect_failures": stats.connect_failures,
+        "ai_messages": stats.ai_messages,
+        "latency_ms": _percentiles(stats.latency_ms),
+        "server_recv_to_send_ms": _percentiles(stats.server_ms),
+        "batch_infer_ms": _percentiles(stats.infer_ms),
+    }
+
+
+# ---- 로컬 서버 ----
+def spawn_server(host: str, port: int, env_pairs: List[str], timeout: float) -> subprocess.Popen:
+    """uvicorn 으로 app.main 을 subprocess 로 실행하고 /ai/ready 가 200 이 될 때까지 대기"""
+    env = {"LOG_LEVEL": "WARNING", **os.environ, "HUB_BACKEND": "memory"}  # --env 로 덮어쓸 수 있음
+    env.update(pair.split("=", 1) for pair in env_pairs)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host, "--port", str(port),
+         "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    ready_url = f"http://{host}:{port}/ai/ready"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(ready_url, timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except urllib.error.HTTPError as e:
+            body = json.loads(e.read() or b"{}")
+            if body.get("status") == "failed":
+                proc.terminate()
+                raise SystemExit(f"model load failed: {body.get('error')}")
+        except OSError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit(f"server not ready after {timeout}s")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Replay landmarks against the /ai WebSocket and report caption latency")
+    ap.add_argument("--url", default="ws://127.0.0.1:8001/ai")
+    ap.add_argument("--spawn", action="store_true", help="start the FastAPI app locally (uvicorn subprocess)")
+    ap.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                    help="environment for the spawned server (repeatable)")
+    ap.add_argument("--clients", type=int, default=10)
+    ap.add_argument("--clients-per-room", type=int, default=1)
+    ap.add_argument("--room-prefix", default="load-")
+    ap.add_argument("--ai-peers", type=int, default=1)
+    ap.add_argument("--ai-capacity", type=int, default=0, help="rooms per AI peer (0 = server default)")
+    ap.add_argument("--fps", type=float, default=30.0)
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds of replay per client")
+    ap.add_argument("--ramp", type=float, default=1.0, help="seconds over which clients connect")
+    ap.add_argument("--drain", type=float, default=1.0, help="seconds to wait for trailing captions")
+    ap.add_argument("--pending-timeout", type=float, default=5.0,
+                    help="seconds to wait for a caption before counting a message as unmatched")
+    ap.add_argument("--mode", choices=("frame", "sequence"), default="frame")
+    ap.add_argument("--seq-len", type=int, default=10)
+    ap.add_argument("--wire", choices=("json", "binary"), default="json")
+    ap.add_argument("--json-points", choices=("json-dict", "json-list"), default="json-dict",
+                    help="JSON point format: {x,y} objects or [x,y] lists")
+    ap.add_argument("--data", help="npz with recorded frames (N,T,21,2) or (T,21,2); synthetic if omitted")
+    ap.add_argument("--report", help="write the report as JSON")
+    args = ap.parse_args(argv)
+    args.clients_per_room = max(1, args.clients_per_room)
+    if args.mode == "frame":
+        args.seq_len = 1
+
+    stream = load_stream(args.data) if args.data else synthetic_stream(3000, seed=0)
+    parts = urlsplit(args.url)
+    http = "https" if parts.scheme == "wss" else "http"
+    metrics_url = f"{http}://{parts.netloc}/metrics"
+
+    proc = spawn_server(parts.hostname, parts.port or 80, args.env, timeout=120) if args.spawn else None
+    try:
+        report = asyncio.run(run(args, stream, metrics_url))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+수어 인식 모델 양자화 + 비교 리포트
+
+    python -m tools.quantize_model model.h5 --out models/model.tflite --data calib.npz [--report report.json]
+
+- 입력: Keras 모델(.h5/.keras) 또는 SavedModel 디렉터리 (이미 변환된 float .tflite 는 다시 양자화할 수 없음)
+- 출력: <out>, <out 이름>.float16.tflite, <out 이름>.int8.tflite
+  → 서버는 MODEL_PRECISION=float16|int8 이면 TFLITE_PATH 옆의 파일을 읽음
+- --data: npz (x: (N,10,55) 특징 또는 frames: (N,10,21,2) 좌표, 선택 y: (N,) 정답 인덱스)
+  앞의 --calib 개는 int8 보정(representative dataset)에만 쓰고 평가에서는 제외
+- 리포트: 정밀도별 정확도, float 대비 top-1 일치율/평균 확률 차이, 파일 크기, XNNPACK on/off 지연시간
+  (지연시간은 서버와 같은 Interpreter 로 측정 → 어느 런타임(tflite_runtime | tensorflow.lite)인지 runtime 에 기록)
+- Flex(SELECT_TF_OPS) 연산이 필요한 모델은 tflite_runtime 으로 실행할 수 없으므로 오류로 종료
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.features import frames_to_feats_55  # noqa: E402
+from app.interpreter_pool import RUNTIME, PooledInterpreter  # noqa: E402
+
+
+# ---- 데이터 ----
+def load_dataset(path: Optional[str], n_random: int = 256):
+    """npz → (x (N,10,55) float32, y (N,) 또는 None). 경로가 없으면 합성 좌표 (정확도는 보고하지 않음)"""
+    if path is None:
+        frames = np.random.default_rng(0).random((n_random, 10, 21, 2), dtype=np.float32)
+        return frames_to_feats_55(frames).astype(np.float32), None
+    data = np.load(path)
+    if "x" in data:
+        x = data["x"].astype(np.float32)
+    elif "frames" in data:
+        x = frames_to_feats_55(data["frames"].astype(np.float32)).astype(np.float32)
+    else:
+        raise SystemExit(f"{path}: expected 'x' (N,10,55) or 'frames' (N,10,21,2)")
+    y = data["y"].astype(np.int64) if "y" in data else None
+    return x, y
+
+
+# ---- 변환 ----
+def _converter(source: str):
+    import tensorflow as tf
+
+    if os.path.isdir(source):
+        return tf.lite.TFLiteConverter.from_saved_model(source)
+    model = tf.keras.models.load_model(source, compile=False)
+    return tf.lite.TFLiteConverter.from_keras_model(model)
+
+
+def convert(source: str, precision: str, calib: np.ndarray) -> bytes:
+    import tensorflow as tf
+
+    conv = _converter(source)
+    if precision == "float16":
+        conv.optimizations = [tf.lite.Optimize.DEFAULT]
+        conv.target_spec.supported_types = [tf.float16]
+    elif precision == "int8":
+        # 가중치/활성값 int8, 입출력은 float 유지 → 서버 쪽 전처리/후처리 그대로
+        conv.optimizations = [tf.lite.Optimize.DEFAULT]
+        conv.representative_dataset = lambda: ([calib[i:i + 1]] for i in range(len(calib)))
+        conv.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+            tf.lite.OpsSet.TFLITE_BUILTINS,  # int8 커널이 없는 연산은 float 내장 커널로 (SELECT_TF_OPS 는 tflite_runtime 에 없음)
+        ]
+    content = conv.convert()
+    flex = flex_ops(content)
+    if flex:
+        raise SystemExit(f"{precision} model needs Flex ops {flex} → cannot run on tflite_runtime")
+    return content
+
+
+def flex_ops(content: bytes) -> List[str]:
+    """.tflite 가 쓰는 Flex(SELECT_TF_OPS) 연산 이름 목록"""
+    from tensorflow.lite.python import schema_py_generated as schema
+
+    model = schema.Model.GetRootAs(content, 0)
+    codes = (model.OperatorCodes(i).CustomCode() for i in range(model.OperatorCodesLength()))
+    return sorted({c.decode() for c in codes if c and c.startswith(b"Flex")})
+
+
+# ---- 평가 ----
+def _predict(content: bytes, x: np.ndarray, *, xnnpack: bool, num_threads: int, batch: int = 32) -> np.ndarray:
+    interp = PooledInterpreter(content, num_threads, xnnpack=xnnpack)
+    return np.concatenate([interp.infer_batch(x[i:i + batch]) for i in range(0, len(x), batch)], axis=0)
+
+
+def _latency_ms(content: bytes, x: np.ndarray, *, xnnpack: bool, num_threads: int, runs: int) -> Dict[str, float]:
+    """배치 1 invoke 지연시간 (첫 호출 제외)"""
+    interp = PooledInterpreter(content, num_threads, xnnpack=xnnpack)
+    interp.infer_batch(x[:1])
+    times = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        interp.infer_batch(x[i % len(x):i % len(x) + 1])
+        times.append((time.perf_counter() - t0) * 1000)
+    return {"mean_ms": round(float(np.mean(times)), 4), "p95_ms": round(float(np.percentile(times, 95)), 4)}
+
+
+def evaluate(content: bytes, x: np.ndarray, y, ref: Optional[np.ndarray], args) -> Tuple[dict, np.ndarray]:
+    """모델 하나의 정확도/float 대비 차이/크기/지연시간 → (결과, 확률)"""
+    probs = _predict(content, x, xnnpack=True, num_threads=args.threads)
+    out = {"size_bytes": len(content)}
+    if y is not None:
+        out["accuracy"] = round(float((probs.argmax(-1) == y).mean()), 4)
+    if ref is not None:
+        out["top1_agreement"] = round(float((probs.argmax(-1) == ref.argmax(-1)).mean()), 4)
+        out["mean_abs_prob_diff"] = round(float(np.abs(probs - ref).mean()), 6)
+    out["latency"] = {
+        "xnnpack": _latency_ms(content, x, xnnpack=True, num_threads=args.threads, runs=args.runs),
+        "builtin": _latency_ms(content, x, xnnpack=False, num_threads=args.threads, runs=args.runs),
+    }
+    return out, probs
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Quantize the sign-language model and compare precisions")
+    ap.add_argument("source", help="Keras model (.h5/.keras) or SavedModel directory")
+    ap.add_argument("--out", required=True, help="float .tflite output path (quantized files are written next to it)")
+    ap.add_argument("--data", help="npz with x (N,10,55) or frames (N,10,21,2), optional y (N,)")
+    ap.add_argument("--calib", type=int, default=200, help="samples used only for int8 calibration")
+    ap.add_argument("--precisions", default="float32,float16,int8")
+    ap.add_argument("--threads", type=int, default=1)
+    ap.add_argument("--runs", type=int, default=200, help="invocations per latency measurement")
+    ap.add_argument("--report", help="write the comparison report as JSON")
+    args = ap.parse_args(argv)
+
+    x, y = load_dataset(args.data)
+    n_calib = min(args.calib, len(x) // 2)
+    calib, x_eval = x[:n_calib], x[n_calib:]
+    y_eval = y[n_calib:] if y is not None else None
+
+    stem, ext = os.path.splitext(args.out)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    report = {"source": args.source, "runtime": RUNTIME, "eval_samples": len(x_eval), "calib_samples": n_calib,
+              "models": {}}
+    print(f"runtime  {RUNTIME} (latency measured with this interpreter)")
+    ref = None
+    for precision in ["float32"] + [p for p in args.precisions.split(",") if p and p != "float32"]:
+        content = convert(args.source, precision, calib)
+        path = args.out if precision == "float32" else f"{stem}.{precision}{ext}"
+        with open(path, "wb") as f:
+            f.write(content)
+        result, probs = evaluate(content, x_eval, y_eval, ref, args)
+        if ref is None:
+            ref = probs
+        report["models"][precision] = {"path": path, **result}
+        print(f"{precision:8s} {json.dumps(result, ensure_ascii=False)}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())